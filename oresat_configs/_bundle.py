@@ -0,0 +1,102 @@
+"""Precompiled mission bundles shipped with the package.
+
+A bundle is the same compiled result the on-disk cache stores (see _cache) but built once before
+packaging and installed alongside each mission's config files. Loading a mission from its bundle
+skips YAML parsing entirely, which matters on ARM systems where pyyaml often lacks the libyaml C
+bindings and pure Python parsing of every config takes several seconds.
+
+Bundles are only trusted while they're up to date. If any source file is newer than the bundle, as
+happens when editing configs in a development checkout, the content hash of the sources is checked
+against the one recorded in the bundle and on a mismatch the bundle is ignored. Bundles compiled
+against a different version of oresat-configs or canopen are always ignored.
+
+Bundles are built from a source checkout (installed with pip install -e) before building the
+package with `oresat-configs bundles`.
+"""
+
+import pickle
+import zlib
+from importlib import abc, resources
+from pathlib import Path
+from typing import Any
+
+from . import _cache
+from .constants import Mission
+
+BUNDLE_NAME = "bundle.pickle.z"
+"""Name of the bundle file in each mission's config directory."""
+
+
+def bundle_path(mission: Mission) -> abc.Traversable:
+    """Return the location of the bundle for a mission."""
+    return resources.files("oresat_configs") / mission.filename() / BUNDLE_NAME
+
+
+def _sources_newer(bundle: abc.Traversable, mission: Mission) -> bool:
+    """Check if any source of the mission was modified after the bundle was built.
+
+    Resources that aren't plain files (e.g. in a zip) have no usable mtime, so are assumed newer.
+    """
+    if not isinstance(bundle, Path):
+        return True
+    built = bundle.stat().st_mtime
+    for source in _cache.mission_sources(mission):
+        if not isinstance(source, Path) or source.stat().st_mtime > built:
+            return True
+    return False
+
+
+def load(mission: Mission, path: abc.Traversable | None = None) -> dict[str, Any] | None:
+    """Load the compiled configs of a mission from its bundle, returning None if it can't be used.
+
+    Parameters
+    ----------
+    mission
+        The mission to load.
+    path
+        (optional) The bundle to load, by default the one installed with the package.
+    """
+    if path is None:
+        path = bundle_path(mission)
+    try:
+        data = pickle.loads(zlib.decompress(path.read_bytes()))  # noqa: S301 - built by us
+    except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(data, dict) or data.get("versions") != _cache.versions():
+        return None
+    if _sources_newer(path, mission) and data.get("key") != _cache.cache_key(mission):
+        return None
+    return data
+
+
+def build(mission: Mission, path: Path | None = None) -> Path:
+    """Compile a mission from its source files and write its bundle.
+
+    Parameters
+    ----------
+    mission
+        The mission to build.
+    path
+        (optional) Where to write the bundle, by default next to the mission's config files.
+
+    Returns
+    -------
+    Path
+        The bundle that was written.
+    """
+    from . import OreSatConfig  # noqa: PLC0415 - circular import
+
+    if path is None:
+        bundle = bundle_path(mission)
+        assert isinstance(bundle, Path), "bundles can only be built in an unpacked source tree"
+        path = bundle
+
+    config = OreSatConfig(mission, bundle=False)
+    data = {
+        **config._compiled(),  # noqa: SLF001
+        "key": _cache.cache_key(mission),
+        "versions": _cache.versions(),
+    }
+    path.write_bytes(zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 9))
+    return path
@@ -0,0 +1,123 @@
+"""On-disk cache of compiled mission configs.
+
+Loading an OreSatConfig means parsing every YAML and CSV file for the mission and building an
+ObjectDictionary for every card. The result only depends on those input files and on the code
+that turns them into ODs, so it can be pickled once and reused until any of them change.
+
+The cache is opt-in: pass cache_dir to OreSatConfig or set the ORESAT_CONFIGS_CACHE_DIR
+environment variable. Entries are content addressed, the file name contains a hash of every
+input, so editing a YAML file or upgrading oresat-configs or canopen simply results in a new
+entry instead of a stale hit.
+"""
+
+import hashlib
+import os
+import pickle
+from importlib import abc, resources
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any
+
+from . import base
+from .constants import Mission, __version__
+
+CACHE_DIR_ENV = "ORESAT_CONFIGS_CACHE_DIR"
+"""Environment variable used to enable the cache when no explicit cache_dir is given."""
+
+_COMPILER_MODULES = (
+    "_schema.py",
+    "_yaml_to_od.py",
+    "beacon_config.py",
+    "card_config.py",
+    "card_info.py",
+    "odtypes.py",
+)
+"""Modules that take part in turning the config files into ODs.
+
+Editable installs don't bump __version__ on every change so these are hashed along with the
+config files.
+"""
+
+
+def cache_dir_from_env() -> Path | None:
+    """Return the cache directory set by the environment, or None if caching is disabled."""
+    path = os.environ.get(CACHE_DIR_ENV)
+    return Path(path) if path else None
+
+
+def mission_sources(mission: Mission) -> list[abc.Traversable]:
+    """List every resource file that the compiled configs for a mission depend on."""
+    package = resources.files("oresat_configs")
+    sources = [mission.cards, mission.beacon, *mission.overlays.values()]
+    sources.append(package / "standard_objects.yaml")
+    sources.extend(
+        sorted(
+            (f for f in resources.files(base).iterdir() if f.name.endswith(".yaml")),
+            key=lambda f: f.name,
+        )
+    )
+    sources.extend(package / name for name in _COMPILER_MODULES)
+    return sources
+
+
+def versions() -> str:
+    """Return the versions of the code that compiled configs depend on."""
+    try:
+        canopen_version = version("canopen")
+    except PackageNotFoundError:
+        canopen_version = "unknown"
+    return f"{__version__} {canopen_version}"
+
+
+def cache_key(mission: Mission) -> str:
+    """Compute the content hash that identifies the compiled configs of a mission.
+
+    The key covers the contents of every file from mission_sources() as well as the versions of
+    oresat-configs and canopen, since the cached ODs are canopen objects.
+    """
+    h = hashlib.sha256()
+    h.update(f"{versions()}\0{mission.name}\0".encode())
+    for source in mission_sources(mission):
+        h.update(source.name.encode() + b"\0")
+        h.update(source.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir: Path, mission: Mission, key: str) -> Path:
+    return cache_dir / f"{mission.filename()}-{key[:32]}.pickle"
+
+
+def load(cache_dir: Path, mission: Mission, key: str) -> dict[str, Any] | None:
+    """Load a cache entry, returning None on a miss.
+
+    An unreadable or corrupt entry is treated as a miss; it will be overwritten by the next store.
+    """
+    path = _entry_path(cache_dir, mission, key)
+    try:
+        with path.open("rb") as f:
+            data = pickle.load(f)  # noqa: S301 - only ever reads entries we wrote
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data
+
+
+def store(cache_dir: Path, mission: Mission, key: str, data: dict[str, Any]) -> None:
+    """Store a cache entry.
+
+    The entry is written to a temporary file and moved into place so concurrent readers never see
+    a partially written file. Older entries for the same mission are removed.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(cache_dir, mission, key)
+    with NamedTemporaryFile("wb", dir=cache_dir, prefix=path.name, delete=False) as f:
+        pickle.dump({**data, "key": key}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    Path(f.name).replace(path)
+
+    for old in cache_dir.glob(f"{mission.filename()}-*.pickle"):
+        if old != path:
+            old.unlink(missing_ok=True)
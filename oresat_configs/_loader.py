@@ -0,0 +1,13 @@
+"""The YAML loader used for all config files.
+
+The libyaml C bindings are much faster than pyyaml's pure Python loader, but pyyaml is built
+without them by default on ARM. The pure Python loader still works, it's just slow, and the
+precompiled bundles (see _bundle) mean it's normally only used in development checkouts.
+"""
+
+try:
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader  # type: ignore[assignment]
+
+__all__ = ["Loader"]
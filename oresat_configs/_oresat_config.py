@@ -0,0 +1,243 @@
+"""Loading all the configs of a mission, see OreSatConfig."""
+
+from collections.abc import Mapping
+from functools import cached_property
+from importlib.resources import as_file
+from pathlib import Path
+from typing import Any, ClassVar
+
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODVariable
+
+from . import _bundle, _cache
+from ._yaml_to_od import (
+    _gen_c3_beacon_defs,
+    _gen_c3_fram_defs,
+    _gen_fw_base_od,
+    _gen_od_db,
+    _load_configs,
+    _SharedConfigs,
+)
+from .beacon_codec import BeaconCodec
+from .beacon_config import BeaconConfig
+from .can_decoder import CanDecoder
+from .card_config import CardConfig
+from .card_info import cards_from_csv
+from .constants import Mission
+from .pdo_codec import PdoTable
+
+
+class OreSatConfig:
+    """All the configs for an OreSat mission.
+
+    Card configs and ODs are built lazily; configs and od_db are mappings that only load a card
+    the first time it's looked up. Looking up the C3 builds every other card's config too, since
+    the C3 maps every other card's TPDOs.
+    """
+
+    configs: Mapping[str, CardConfig]
+    od_db: Mapping[str, ObjectDictionary]
+
+    _registry: ClassVar[dict[str, "OreSatConfig"]] = {}
+    """Configs returned by get(), by mission name. Missions themselves aren't hashable."""
+    _shared_configs: ClassVar[_SharedConfigs] = _SharedConfigs()
+    """Parsed files and card configs shared by every OreSatConfig created with shared=True."""
+
+    def __init__(
+        self,
+        mission: Mission | str | None = None,
+        cache_dir: Path | None = None,
+        *,
+        bundle: bool = True,
+        shared: bool = False,
+    ) -> None:
+        """Load all the associated configs from their various files.
+
+        Parameters
+        ----------
+        mission:
+         - A string, either short or long mission name ('0', 'OreSat0.5', ...)
+         - A Mission (ORESAT0, ...)
+         - Omitted or None, in which case Mission.default() is chosen
+        cache_dir:
+            (optional) Directory for the on-disk cache of compiled configs. If omitted the
+            ORESAT_CONFIGS_CACHE_DIR environment variable is used, and if that isn't set either
+            no cache is used. Cache entries are keyed on the contents of every input file so they
+            never need to be cleared by hand.
+        bundle:
+            (optional) If True (the default) load the precompiled bundle installed with the
+            package when it's up to date with the config files, skipping YAML parsing entirely.
+            If False always compile the configs from their source files.
+        shared:
+            (optional) If True, config files are parsed at most once between every OreSatConfig
+            created with shared=True, and cards that compile to identical configs in different
+            missions share the same CardConfig. Shared configs must not be modified. Prefer get(),
+            which uses this.
+        """
+        self.mission = self._to_mission(mission)
+        self._shared = shared
+
+        compiled = _bundle.load(self.mission) if bundle else None
+        if compiled is not None:
+            self._restore(compiled)
+            return
+
+        if cache_dir is None:
+            cache_dir = _cache.cache_dir_from_env()
+        if cache_dir is None:
+            self._load()
+            return
+
+        key = _cache.cache_key(self.mission)
+        cached = _cache.load(cache_dir, self.mission, key)
+        if cached is not None:
+            self._restore(cached)
+            return
+
+        self._load()
+        _cache.store(cache_dir, self.mission, key, self._compiled())
+
+    @classmethod
+    def get(cls, mission: Mission | str | None = None) -> "OreSatConfig":
+        """Get the configs for a mission, loading them only on the first call for each mission.
+
+        Intended for tools that work with the configs of several missions at once. The returned
+        OreSatConfig is shared by every caller in the process so it, and its configs and ODs, must
+        be treated as read-only. Configs loaded through get() share parsed config files and
+        identical card configs between missions. Construct an OreSatConfig directly to get a
+        private copy that can be modified.
+
+        Parameters
+        ----------
+        mission
+            Same as for OreSatConfig().
+        """
+        mission = cls._to_mission(mission)
+        if mission.name not in cls._registry:
+            cls._registry[mission.name] = cls(mission, shared=True)
+        return cls._registry[mission.name]
+
+    @staticmethod
+    def _to_mission(mission: Mission | str | None) -> Mission:
+        if mission is None:
+            return Mission.default()
+        if isinstance(mission, str):
+            return Mission.from_string(mission)
+        if isinstance(mission, Mission):
+            return mission
+        raise TypeError(f"Unsupported mission type: '{type(mission)}'")
+
+    def _load(self) -> None:
+        """Load and compile all the configs from the YAML and CSV files."""
+        with as_file(self.mission.beacon) as path:
+            self._beacon_config = BeaconConfig.from_yaml(path)
+        with as_file(self.mission.cards) as path:
+            self.cards = cards_from_csv(path)
+        shared = self._shared_configs if self._shared else None
+        self.configs = _load_configs(self.cards, self.mission.overlays, shared)
+        self.od_db = _gen_od_db(self.mission, self.cards, self._beacon_config, self.configs)
+
+    def _compiled(self) -> dict[str, Any]:
+        """Collect everything built by _load(), forcing lazy parts, for the cache or a bundle."""
+        return {
+            "cards": self.cards,
+            "configs": dict(self.configs),
+            "od_db": dict(self.od_db),
+            "beacon_def": self.beacon_def,
+            "fram_def": self.fram_def,
+            "fw_base_od": self.fw_base_od,
+        }
+
+    def _restore(self, compiled: dict[str, Any]) -> None:
+        """Set everything built by _load() from the output of _compiled()."""
+        self.cards = compiled["cards"]
+        self.configs = compiled["configs"]
+        self.od_db = compiled["od_db"]
+        # Assigning to the instance takes precedence over the cached_property
+        self.beacon_def = compiled["beacon_def"]
+        self.fram_def = compiled["fram_def"]
+        self.fw_base_od = compiled["fw_base_od"]
+
+    @cached_property
+    def beacon_def(self) -> list[ODVariable]:
+        """The objects from the C3's OD that make up the beacon, in order."""
+        return _gen_c3_beacon_defs(self.od_db["c3"], self._beacon_config)
+
+    @cached_property
+    def beacon_codec(self) -> BeaconCodec:
+        """Codec for the mission's beacon frames, built from beacon_def."""
+        return BeaconCodec.from_config(self)
+
+    @cached_property
+    def pdo_table(self) -> PdoTable:
+        """Decoders of the TPDOs of every card, by COB-ID."""
+        return PdoTable.from_config(self)
+
+    @cached_property
+    def can_decoder(self) -> CanDecoder:
+        """Decoder of the TPDOs, EMCYs, heartbeats and SYNC of every card, by COB-ID."""
+        return CanDecoder.from_config(self)
+
+    @cached_property
+    def fram_def(self) -> list[ODVariable]:
+        """The objects from the C3's OD that are saved to F-RAM."""
+        return _gen_c3_fram_defs(self.od_db["c3"], self.configs["c3"])
+
+    @cached_property
+    def fw_base_od(self) -> ObjectDictionary:
+        """The OD common to all firmware cards."""
+        return _gen_fw_base_od(self.mission)
+
+    def name_from_alias(self, card: str, number: int = 1) -> str:
+        """Find the canonical card name from a given alias.
+
+        Intended for the --card option in scripts, this will take a wide array of names and return
+        the corresponding key that will find that card's config in od_db. For cards with number
+        suffixes if the name is given without a number it defaults to the first card of that type,
+        with the _1 suffix. For example:
+        - battery -> battey_1
+        - st -> star_tracker_1
+        - solar_1 -> solar_1
+        - gps -> gps
+
+        Parameters
+        ----------
+        card
+            The name or alias of a card to find in the od_db.
+        num
+            (optional) For cards with multiple copies this spefifies which one. Ignored if given as
+            part of the card argument.
+
+        Returns
+        -------
+            A name suitable as a key in od_db.
+
+        Raises
+        ------
+        KeyError
+            If no suitable name is found for the given alias.
+        """
+        card_aliases = {name: name for name in self.cards}
+        # FIXME: should be part of yaml. It's a big change to wire that up though
+        # FIXME: should only include cards from current mission. This isn't technically bad
+        #        since it'll KeyError anyway. Moving this to yaml will fix it.
+        for name, aliases in {
+            "battery": ["bat", "batt"],
+            "solar": ["sol", "solar_module"],
+            "adcs": ["imu"],
+            "rw": ["reaction_wheel"],
+            "diode_test": ["diode", "dtc"],
+            "cfc_processor": ["cfc"],
+            "star_tracker": ["st", "star_track"],
+        }.items():
+            canonical_name = name
+            if name not in self.cards and f'{name}_{number}' in self.cards:
+                canonical_name = f'{name}_{number}'
+            card_aliases[name] = canonical_name
+            for alias in aliases:
+                card_aliases[alias] = canonical_name
+
+        name = card_aliases[card.lower().replace("-", "_")]
+        if name in self.cards:
+            return name
+        raise KeyError(f"No alias for '{name}' found")
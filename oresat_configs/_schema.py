@@ -0,0 +1,230 @@
+"""Decoders that turn parsed YAML into the config dataclasses.
+
+This does the same job as dacite.from_dict with Config(strict=True), and raises the same dacite
+exceptions with the same messages, but all the type introspection is done once per dataclass when
+its decoder is compiled instead of for every value of every object being loaded. Only the subset
+of typing used by the config dataclasses is supported: dataclasses, builtin scalars, Literal,
+unions/optionals, list and dict/Mapping.
+"""
+
+import dataclasses
+import types
+import typing
+from collections.abc import Callable, Mapping
+from typing import Any, Literal, TypeVar
+
+from dacite import (
+    DaciteFieldError,
+    MissingValueError,
+    UnexpectedDataError,
+    UnionMatchError,
+    WrongTypeError,
+)
+
+T = TypeVar("T")
+
+Builder = Callable[[object], object]
+"""Builds a value for a type from its parsed YAML. Leaves values it can't build as is."""
+Checker = Callable[[object], bool]
+"""Checks that a built value matches a type."""
+
+_MISSING = dataclasses.MISSING
+
+_DECODERS: dict[tuple[type, bool], Callable[[Mapping[str, Any]], Any]] = {}
+"""Compiled decoders by dataclass and strictness."""
+
+
+@dataclasses.dataclass(frozen=True)
+class _Field:
+    name: str
+    type_: Any
+    build: Builder
+    check: Checker
+    default: Any
+    default_factory: Any
+    optional: bool
+
+
+def _identity(data: object) -> object:
+    return data
+
+
+def _compile_type(type_: object, *, strict: bool) -> tuple[Builder, Checker]:
+    """Create the builder and checker functions for a type annotation."""
+    if type_ is Any:
+        return _identity, lambda _: True
+
+    if dataclasses.is_dataclass(type_):
+        assert isinstance(type_, type)
+        dataclass_type = type_
+
+        def build_dataclass(data: object) -> object:
+            if isinstance(data, Mapping):
+                return compile_decoder(dataclass_type, strict=strict)(data)
+            return data
+
+        return build_dataclass, lambda value: isinstance(value, dataclass_type)
+
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+
+    if origin is Literal:
+        return _identity, lambda value: value in args
+
+    if origin in (typing.Union, types.UnionType):
+        return _compile_union(type_, args, strict=strict)
+
+    if origin in (list, dict, Mapping):
+        return _compile_collection(origin, args, strict=strict)
+
+    return _compile_scalar(type_)
+
+
+def _compile_scalar(type_: object) -> tuple[Builder, Checker]:
+    if type_ is float:
+        # As described in PEP 484 - section: "The numeric tower"
+        return _identity, lambda value: isinstance(value, (int, float))
+
+    if isinstance(type_, type):
+        scalar_type = type_
+        return _identity, lambda value: isinstance(value, scalar_type)
+
+    raise TypeError(f"Unsupported config type {type_}")
+
+
+def _compile_collection(
+    origin: type, args: tuple[object, ...], *, strict: bool
+) -> tuple[Builder, Checker]:
+    if origin is list:
+        (item_type,) = args
+        build_item, check_item = _compile_type(item_type, strict=strict)
+
+        def build_list(data: object) -> object:
+            if isinstance(data, list):
+                return [build_item(item) for item in data]
+            return data
+
+        def check_list(value: object) -> bool:
+            return isinstance(value, list) and all(check_item(item) for item in value)
+
+        return build_list, check_list
+
+    _, check_key = _compile_type(args[0], strict=strict)
+    build_value, check_value = _compile_type(args[1], strict=strict)
+
+    def build_mapping(data: object) -> object:
+        if isinstance(data, Mapping):
+            return {k: build_value(v) for k, v in data.items()}
+        return data
+
+    def check_mapping(value: object) -> bool:
+        return isinstance(value, Mapping) and all(
+            check_key(k) and check_value(v) for k, v in value.items()
+        )
+
+    return build_mapping, check_mapping
+
+
+def _compile_union(
+    union: Any,  # noqa: ANN401 - a typing special form, not a type
+    args: tuple[object, ...],
+    *,
+    strict: bool,
+) -> tuple[Builder, Checker]:
+    optional = type(None) in args
+    inner = [_compile_type(arg, strict=strict) for arg in args]
+
+    def check_union(value: object) -> bool:
+        return any(check(value) for _, check in inner)
+
+    if optional and len(args) == 2:
+        build_inner = inner[0][0] if args[1] is type(None) else inner[1][0]
+
+        def build_optional(data: object) -> object:
+            return None if data is None else build_inner(data)
+
+        return build_optional, check_union
+
+    def build_union(data: object) -> object:
+        if optional and data is None:
+            return None
+        for build, check in inner:
+            try:
+                value = build(data)
+            except Exception:  # noqa: BLE001, S112 - same as dacite, try the next type
+                continue
+            if check(value):
+                return value
+        raise UnionMatchError(field_type=union, value=data)
+
+    return build_union, check_union
+
+
+def compile_decoder(
+    data_class: type[T], *, strict: bool = True
+) -> Callable[[Mapping[str, Any]], T]:
+    """Compile a decoder for a dataclass.
+
+    The returned function takes the parsed YAML for one instance of data_class (a dict) and returns
+    the instance. Nested dataclasses get their own decoders, compiled the first time they're needed.
+    Decoders are cached so this is cheap to call repeatedly.
+
+    Parameters
+    ----------
+    data_class
+        The dataclass to decode.
+    strict
+        If True, keys in the data that don't match any field raise UnexpectedDataError, like
+        dacite's Config(strict=True).
+    """
+    if (data_class, strict) in _DECODERS:
+        return _DECODERS[data_class, strict]
+
+    hints = typing.get_type_hints(data_class)
+    fields = []
+    for f in dataclasses.fields(data_class):  # type: ignore[arg-type]
+        if not f.init:
+            continue
+        type_ = hints[f.name]
+        build, check = _compile_type(type_, strict=strict)
+        optional = type(None) in typing.get_args(type_)
+        fields.append(_Field(f.name, type_, build, check, f.default, f.default_factory, optional))
+    names = {f.name for f in dataclasses.fields(data_class)}  # type: ignore[arg-type]
+
+    def decode(data: Mapping[str, Any]) -> T:
+        if strict:
+            extra_fields = set(data.keys()) - names
+            if extra_fields:
+                raise UnexpectedDataError(keys=extra_fields)
+
+        values = {}
+        for f in fields:
+            if f.name in data:
+                try:
+                    value = f.build(data[f.name])
+                except DaciteFieldError as error:
+                    error.update_path(f.name)
+                    raise
+                if not f.check(value):
+                    raise WrongTypeError(field_path=f.name, field_type=f.type_, value=value)
+            elif f.default is not _MISSING:
+                value = f.default
+            elif f.default_factory is not _MISSING:
+                value = f.default_factory()
+            elif f.optional:
+                value = None
+            else:
+                raise MissingValueError(f.name)
+            values[f.name] = value
+        return data_class(**values)
+
+    _DECODERS[data_class, strict] = decode
+    return decode
+
+
+def decode(data_class: type[T], data: Mapping[str, Any], *, strict: bool = True) -> T:
+    """Create an instance of a dataclass from parsed YAML.
+
+    A drop in replacement for dacite.from_dict(data_class, data, Config(strict=strict)).
+    """
+    return compile_decoder(data_class, strict=strict)(data)
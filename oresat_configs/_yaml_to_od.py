@@ -1,13 +1,16 @@
 """Convert OreSat configs to ODs."""
 
 import dataclasses
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from copy import deepcopy
 from importlib import abc, resources
+from typing import TypeVar
 
 from canopen.objectdictionary import ObjectDictionary, ODArray, ODRecord, ODVariable
-from yaml import CLoader, load
+from yaml import load
 
 from . import base
+from ._loader import Loader
 from .beacon_config import BeaconConfig
 from .card_config import CardConfig, IndexObject, Rpdo, SubindexObject
 from .card_info import Card
@@ -15,16 +18,25 @@ from .constants import Mission, __version__
 
 STD_OBJS_FILE_NAME = resources.files("oresat_configs") / "standard_objects.yaml"
 
+V = TypeVar("V")
+
 
 def overlay_configs(card_config: CardConfig, overlay_config: CardConfig) -> None:
-    """Deal with overlays."""
+    """Deal with overlays.
+
+    Objects and PDOs of card_config that get modified are replaced with copies first, so anything
+    card_config shares with other configs (e.g. objects from a common config) is left untouched.
+    """
     # overlay object
     for obj in overlay_config.objects:
-        overlayed = False
-        for obj2 in card_config.objects:
-            if obj.index != obj2.index:
-                continue
+        obj2 = card_config.get_object(obj.index)
+        if obj2 is None:  # add it
+            card_config.add_object(deepcopy(obj))
+            continue
 
+        old_obj2, obj2 = obj2, deepcopy(obj2)
+        card_config.replace_object(old_obj2, obj2)
+        with card_config.modifying(obj2):
             obj2.name = obj.name
             if obj.object_type == "variable":
                 obj2.data_type = obj.data_type
@@ -33,234 +45,375 @@ def overlay_configs(card_config: CardConfig, overlay_config: CardConfig) -> None
                 obj2.low_limit = obj.low_limit
                 obj2.default = obj.default
             else:
+                sub_objs2 = {sub_obj2.subindex: sub_obj2 for sub_obj2 in obj2.subindexes}
                 for sub_obj in obj.subindexes:
-                    sub_overlayed = False
-                    for sub_obj2 in obj2.subindexes:
-                        if sub_obj.subindex == sub_obj2.subindex:
-                            sub_obj2.name = sub_obj.name
-                            sub_obj2.data_type = sub_obj.data_type
-                            sub_obj2.access_type = sub_obj.access_type
-                            sub_obj2.high_limit = sub_obj.high_limit
-                            sub_obj2.low_limit = sub_obj.low_limit
-                            sub_obj2.default = sub_obj.default
-                            overlayed = True
-                            sub_overlayed = True
-                            break  # obj was found, search for next one
-                    if not sub_overlayed:  # add it
+                    sub_obj2 = sub_objs2.get(sub_obj.subindex)
+                    if sub_obj2 is None:  # add it
                         obj2.subindexes.append(deepcopy(sub_obj))
-            overlayed = True
-            break  # obj was found, search for next one
-        if not overlayed:  # add it
-            card_config.objects.append(deepcopy(obj))
+                        continue
+                    sub_obj2.name = sub_obj.name
+                    sub_obj2.data_type = sub_obj.data_type
+                    sub_obj2.access_type = sub_obj.access_type
+                    sub_obj2.high_limit = sub_obj.high_limit
+                    sub_obj2.low_limit = sub_obj.low_limit
+                    sub_obj2.default = sub_obj.default
 
     # overlay tpdos
     for overlay_tpdo in overlay_config.tpdos:
-        overlayed = False
-        for card_tpdo in card_config.tpdos:
-            if card_tpdo.num == overlay_tpdo.num:
-                card_tpdo.fields = overlay_tpdo.fields
-                card_tpdo.event_timer_ms = overlay_tpdo.event_timer_ms
-                card_tpdo.inhibit_time_ms = overlay_tpdo.inhibit_time_ms
-                card_tpdo.sync = overlay_tpdo.sync
-                overlayed = True
-                break
-        if not overlayed:  # add it
-            card_config.tpdos.append(deepcopy(overlay_tpdo))
+        card_tpdo = card_config.get_tpdo(overlay_tpdo.num)
+        if card_tpdo is None:  # add it
+            card_config.add_tpdo(deepcopy(overlay_tpdo))
+            continue
+        card_config.replace_tpdo(
+            card_tpdo,
+            dataclasses.replace(
+                card_tpdo,
+                fields=overlay_tpdo.fields,
+                event_timer_ms=overlay_tpdo.event_timer_ms,
+                inhibit_time_ms=overlay_tpdo.inhibit_time_ms,
+                sync=overlay_tpdo.sync,
+            ),
+        )
 
     # overlay rpdos
     for overlay_rpdo in overlay_config.rpdos:
-        overlayed = False
-        for card_rpdo in card_config.rpdos:
-            if card_rpdo.num == overlay_rpdo.num:
-                card_rpdo.card = overlay_rpdo.card
-                card_rpdo.tpdo_num = overlay_rpdo.tpdo_num
-                overlayed = True
-                break
-        if not overlayed:  # add it
-            card_config.rpdos.append(deepcopy(overlay_rpdo))
+        card_rpdo = card_config.get_rpdo(overlay_rpdo.num)
+        if card_rpdo is None:  # add it
+            card_config.add_rpdo(deepcopy(overlay_rpdo))
+            continue
+        card_config.replace_rpdo(
+            card_rpdo,
+            dataclasses.replace(card_rpdo, card=overlay_rpdo.card, tpdo_num=overlay_rpdo.tpdo_num),
+        )
 
 
-def _load_configs(
-    cards: dict[str, Card],
-    overlays: dict[str, abc.Traversable],
-) -> dict[str, CardConfig]:
-    """Generate all ODs for a OreSat mission."""
-    standard_objects = {}
-    with resources.as_file(STD_OBJS_FILE_NAME) as path, path.open() as f:
-        for raw in load(f, Loader=CLoader):
-            obj = IndexObject.from_dict(raw)
-            standard_objects[obj.name] = obj
+class LazyMapping(Mapping[str, V]):
+    """A read-only mapping whose values are built the first time they're accessed.
+
+    The set of keys is fixed up front so iteration, ``in`` and ``len()`` never build anything, only
+    indexing does. Once built a value is kept, every later lookup returns the same object.
+    """
+
+    def __init__(self, keys: Iterable[str], factory: Callable[[str], V]) -> None:
+        self._keys = list(keys)
+        self._key_set = set(self._keys)
+        self._factory = factory
+        self._values: dict[str, V] = {}
+
+    def __getitem__(self, key: str) -> V:
+        try:
+            return self._values[key]
+        except KeyError:
+            if key not in self._key_set:
+                raise
+        value = self._factory(key)
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._keys!r}, built={self.built()!r})"
+
+    def built(self) -> list[str]:
+        """List the keys whose values have been built so far."""
+        return list(self._values)
+
+
+_TemplateKey = tuple[str, abc.Traversable | None, abc.Traversable | None, abc.Traversable | None]
+"""A card's base name, config file, common config file and overlay file."""
+
+
+class _SharedConfigs:
+    """Parsed config files, card templates and card configs that can be shared between loads.
+
+    Each load of a mission's configs gets its own _SharedConfigs by default. Passing the same one to
+    several loads, even of different missions, means every config file is parsed once between
+    them, and cards that end up with identical configs (same base config, common config, overlay
+    and node id) share the same CardConfig. Shared configs must not be modified.
+    """
+
+    def __init__(self) -> None:
+        self.standard_objects: dict[str, IndexObject] | None = None
+        self.files: dict[abc.Traversable, CardConfig] = {}
+        self.templates: dict[_TemplateKey, CardConfig] = {}
+        self.instances: dict[tuple[_TemplateKey, int, tuple[tuple[str, int], ...]], CardConfig] = {}
+
+    def standard_object(self, name: str) -> IndexObject:
+        """Get a standard object by name."""
+        if self.standard_objects is None:
+            self.standard_objects = {}
+            with resources.as_file(STD_OBJS_FILE_NAME) as path, path.open() as f:
+                for raw in load(f, Loader=Loader):
+                    obj = IndexObject.from_dict(raw)
+                    self.standard_objects[obj.name] = obj
+        return self.standard_objects[name]
+
+    def file(self, file: abc.Traversable | None) -> CardConfig:
+        """Get the parsed contents of a config file, or an empty config for None."""
+        if file is None:
+            return CardConfig()
+        if file not in self.files:
+            with resources.as_file(file) as path:
+                self.files[file] = CardConfig.from_yaml(path)
+        return self.files[file]
+
+
+class _ConfigLoader:
+    """Loads card configs on demand.
+
+    Every distinct file (standard objects, common configs, card configs and overlays) is parsed
+    once, the first time any card needs it. Cards of the same base type, like the six solar cards,
+    are then copied from a shared template instead of each parsing solar.yaml again.
+    """
+
+    def __init__(
+        self,
+        cards: dict[str, Card],
+        overlays: dict[str, abc.Traversable],
+        shared: _SharedConfigs | None = None,
+    ) -> None:
+        self.cards = cards
+        self.overlays = overlays
+        self.node_ids = {name: card.node_id for name, card in cards.items()}
+        self.shared = _SharedConfigs() if shared is None else shared
+        names = [name for name, card in cards.items() if card.config is not None]  # skip OPD only
+        self.configs = LazyMapping(names, self._load)
+
+    def _template_key(self, card: Card) -> _TemplateKey:
+        return (card.base, card.config, card.common, self.overlays.get(card.base))
+
+    def _template(self, card: Card) -> CardConfig:
+        """Get the config shared by every card of the same base type.
+
+        The template has the base config, common config, overlay and standard objects combined but
+        nothing that depends on a specific card's node id. It must not be modified; use
+        _instantiate() to get a card's own copy.
+        """
+        key = self._template_key(card)
+        if key in self.shared.templates:
+            return self.shared.templates[key]
+
+        # The parsed base config may be shared, build the template from a copy
+        conf = deepcopy(self.shared.file(card.config))
+
+        common = self.shared.file(card.common)
+        conf.std_objects = list(set(common.std_objects + conf.std_objects))
+        for obj in common.objects:
+            conf.add_object(obj)
+        if card.base != "c3":
+            for tpdo in common.tpdos:
+                conf.add_tpdo(tpdo)
+            for rpdo in common.rpdos:
+                conf.add_rpdo(rpdo)
+
+        overlay = self.overlays.get(card.base)
+        if overlay is not None:
+            overlay_configs(conf, self.shared.file(overlay))
 
-    common_configs: dict[abc.Traversable | None, CardConfig] = {None: CardConfig()}
-    for file in {card.common for card in cards.values() if card.common is not None}:
-        with resources.as_file(file) as path:
-            common_configs[file] = CardConfig.from_yaml(path)
+        for std in conf.std_objects:
+            conf.add_object(self.shared.standard_object(std))
+
+        self.shared.templates[key] = conf
+        return conf
+
+    def _instantiate(self, template: CardConfig, card: Card) -> CardConfig:
+        """Stamp out a card's own config from its template, filling in node id dependent values."""
+        conf = deepcopy(template)
+        if "cob_id_emergency_message" in conf.std_objects:
+            obj = conf.find_object(["cob_id_emergency_message"])
+            assert isinstance(obj, IndexObject)
+            conf.replace_object(obj, dataclasses.replace(obj, default=0x80 + card.node_id))
+        conf.expand_subindexes(self.node_ids)
+        return conf
+
+    def _load(self, name: str) -> CardConfig:
+        card = self.cards[name]
+        if name == "c3":
+            # The C3 depends on every other card so is never shared
+            conf = self._instantiate(self._template(card), card)
+            self._add_c3_rpdos(conf)
+            return conf
+
+        template = self._template(card)
+        uses_node_ids = any(
+            obj.generate_subindexes is not None and obj.generate_subindexes.subindexes == "node_ids"
+            for obj in template.objects
+        )
+        node_ids = tuple(sorted(self.node_ids.items())) if uses_node_ids else ()
+        key = (self._template_key(card), card.node_id, node_ids)
+        if key not in self.shared.instances:
+            self.shared.instances[key] = self._instantiate(template, card)
+        return self.shared.instances[key]
+
+    def _add_c3_rpdos(self, c3: CardConfig) -> None:
+        """Create the RPDOs for the C3, which serves as the consumer of all TPDOs.
+
+        This is the only place a card depends on other cards so it's what makes loading the C3 load
+        every other config as well.
+        """
+        for name in self.configs:
+            if name == 'c3':
+                continue
+            conf = self.configs[name]
+
+            mapped_card = IndexObject(
+                name=name,
+                description=f'{name} tpdo mapped data',
+                index=0x5000 + self.node_ids[name],
+                object_type='record',
+            )
+            # sorted ostensibly doesn't matter but it keeps the OD generation the same as past
+            # versions
+            for tpdo in sorted(conf.tpdos, key=lambda x: x.num):
+                rpdo = Rpdo(len(c3.rpdos) + 1, name, tpdo.num)
+                for field in tpdo.fields:
+                    rpdo.fields.append([name, '_'.join(field)])
+                    entry = conf.find_object(field)
+                    mapped_card.subindexes.append(
+                        SubindexObject(
+                            name='_'.join(field),
+                            data_type=entry.data_type,
+                            length=1,
+                            access_type='rw',
+                            default=entry.default,
+                            description=entry.description,
+                            value_descriptions=deepcopy(entry.value_descriptions),
+                            bit_definitions=deepcopy(entry.bit_definitions),
+                            unit=entry.unit,
+                            scale_factor=entry.scale_factor,
+                            low_limit=entry.low_limit,
+                            high_limit=entry.high_limit,
+                            subindex=len(mapped_card.subindexes) + 1,
+                        )
+                    )
+                c3.add_rpdo(rpdo)
+            c3.add_object(mapped_card)
 
-    node_ids = {name: card.node_id for name, card in cards.items()}
 
-    configs: dict[str, CardConfig] = {}
-    for name, card in cards.items():
-        if card.config is None:  # some cards are OPD only
-            continue
+def _load_configs(
+    cards: dict[str, Card],
+    overlays: dict[str, abc.Traversable],
+    shared: _SharedConfigs | None = None,
+) -> LazyMapping[CardConfig]:
+    """Load all card configs for a OreSat mission.
 
-        with resources.as_file(card.config) as path:
-            conf = CardConfig.from_yaml(path)
+    Each config is only parsed when first accessed. Accessing the C3 config loads all the others.
+    If shared is given, parsed files and configs are reused from and added to it.
+    """
+    return _ConfigLoader(cards, overlays, shared).configs
 
-        common = common_configs[card.common]
-        conf.std_objects = list(set(common.std_objects + conf.std_objects))
-        conf.objects.extend(common.objects)
-        if name != "c3":
-            conf.tpdos.extend(common.tpdos)
-            conf.rpdos.extend(common.rpdos)
 
-        if card.base in overlays:
-            with resources.as_file(overlays[card.base]) as path:
-                overlay_config = CardConfig.from_yaml(path)
-            overlay_configs(conf, overlay_config)
+def _gen_od(
+    mission: Mission,
+    card: Card,
+    beacon_def: BeaconConfig,
+    config: CardConfig,
+    node_ids: dict[str, int],
+) -> ObjectDictionary:
+    """Generate the OD for a single card from its config."""
+    od = ObjectDictionary()
+    od.bitrate = 1_000_000  # bps
+    od.node_id = card.node_id
+    od.device_information.allowed_baudrates = {1000}
+    od.device_information.vendor_name = "PSAS"
+    od.device_information.vendor_number = 0
+    od.device_information.product_name = card.nice_name
+    od.device_information.product_number = 0
+    od.device_information.revision_number = 0
+    od.device_information.order_code = None
+    od.device_information.simple_boot_up_master = False
+    od.device_information.simple_boot_up_slave = False
+    od.device_information.granularity = 8
+    od.device_information.dynamic_channels_supported = False
+    od.device_information.group_messaging = False
+    od.device_information.nr_of_RXPDO = 0  # type: ignore[assignment]
+    od.device_information.nr_of_TXPDO = 0  # type: ignore[assignment]
+    od.device_information.LSS_supported = False
 
-        for std in conf.std_objects:
-            obj = standard_objects[std]
-            if std == "cob_id_emergency_message":
-                obj = dataclasses.replace(obj, default=0x80 + card.node_id)
-            conf.objects.append(obj)
+    # add card objects
+    for obj in config.objects:
+        if obj.index in od.indices:
+            raise ValueError(f"index 0x{obj.index:X} already in OD")
+        od.add_object(obj.to_entry())
 
-        for obj in conf.objects:
-            obj.expand_subindexes(node_ids)
+    # add PPDSs
+    # FIXME: canopen is still working on improving their type annotations. nr_of_TXPDOs is
+    #        marked as a bool which is clearly wrong. Remove the ignore when upstream fixes
+    #        their types
+    od.device_information.nr_of_TXPDO += len(config.tpdos)  # type: ignore[operator,assignment]
+    for tpdo in config.tpdos:
+        od.add_object(tpdo.to_mapping_parameter(od))
+        od.add_object(tpdo.to_communication_parameter(od.node_id))
 
-        configs[name] = conf
+    od.device_information.nr_of_RXPDO += len(config.rpdos)  # type: ignore[operator,assignment]
+    for rpdo in config.rpdos:
+        od.add_object(rpdo.to_mapping_parameter(od))
+        od.add_object(rpdo.to_communication_parameter(node_ids[rpdo.card]))
 
-    # The C3, serving as the consumer of all TPDOs, needs corresponding RPDOs created.
-    c3 = configs['c3']
-    for name, conf in configs.items():
-        if name == 'c3':
-            continue
+    # set specific obj defaults
+    versions = od["versions"]
+    assert isinstance(versions, ODRecord)
+    # FIXME: canopen is still working out their type annotations, default should be of type
+    #        Union[int, str, bytes, None] but is Optional[int]. Remove ignore when upstream
+    #        fixes it.
+    versions["configs_version"].default = __version__  # type: ignore[assignment]
+    satellite_id = od["satellite_id"]
+    assert isinstance(satellite_id, ODVariable)
+    satellite_id.default = mission.id
+    for sat in Mission:
+        satellite_id.value_descriptions[sat.id] = sat.name.lower()
+    if card.base == "c3":
+        beacon = od["beacon"]
+        assert isinstance(beacon, ODRecord)
+        beacon["revision"].default = beacon_def.revision
+        beacon["dest_callsign"].default = beacon_def.ax25.dest_callsign  # type: ignore[assignment]
+        beacon["dest_ssid"].default = beacon_def.ax25.dest_ssid
+        beacon["src_callsign"].default = beacon_def.ax25.src_callsign  # type: ignore[assignment]
+        beacon["src_ssid"].default = beacon_def.ax25.src_ssid
+        beacon["control"].default = beacon_def.ax25.control
+        beacon["command"].default = beacon_def.ax25.command
+        beacon["response"].default = beacon_def.ax25.response
+        beacon["pid"].default = beacon_def.ax25.pid
+        flight_mode = od["flight_mode"]
+        assert isinstance(flight_mode, ODVariable)
+        flight_mode.access_type = "ro"
 
-        mapped_card = IndexObject(
-            name=name,
-            description=f'{name} tpdo mapped data',
-            index=0x5000 + node_ids[name],
-            object_type='record',
-        )
-        # sorted ostensibly doesn't matter but it keeps the OD generation the same as past versions
-        for tpdo in sorted(conf.tpdos, key=lambda x: x.num):
-            rpdo = Rpdo(len(c3.rpdos) + 1, name, tpdo.num)
-            for field in tpdo.fields:
-                rpdo.fields.append([name, '_'.join(field)])
-                entry = conf.find_object(field)
-                mapped_card.subindexes.append(
-                    SubindexObject(
-                        name='_'.join(field),
-                        data_type=entry.data_type,
-                        length=1,
-                        access_type='rw',
-                        default=entry.default,
-                        description=entry.description,
-                        value_descriptions=deepcopy(entry.value_descriptions),
-                        bit_definitions=deepcopy(entry.bit_definitions),
-                        unit=entry.unit,
-                        scale_factor=entry.scale_factor,
-                        low_limit=entry.low_limit,
-                        high_limit=entry.high_limit,
-                        subindex=len(mapped_card.subindexes) + 1,
-                    )
-                )
-            c3.rpdos.append(rpdo)
-        c3.objects.append(mapped_card)
+    # set all object values to its default value
+    for entry in od.values():
+        if not isinstance(entry, ODVariable):
+            for subentry in entry.values():
+                subentry.value = subentry.default
+        else:
+            entry.value = entry.default
 
-    return configs
+    return od
 
 
 def _gen_od_db(
     mission: Mission,
     cards: dict[str, Card],
     beacon_def: BeaconConfig,
-    configs: dict[str, CardConfig],
-) -> dict[str, ObjectDictionary]:
-    od_db = {}
+    configs: Mapping[str, CardConfig],
+) -> LazyMapping[ObjectDictionary]:
+    """Generate all ODs for a OreSat mission.
+
+    Each OD is only generated when first accessed.
+    """
     node_ids = {name: cards[name].node_id for name in configs}
     node_ids["c3"] = 0x1
 
-    # make od with common and card objects and tpdos
-    for name, config in configs.items():
-        od = ObjectDictionary()
-        od.bitrate = 1_000_000  # bps
-        od.node_id = cards[name].node_id
-        od.device_information.allowed_baudrates = {1000}
-        od.device_information.vendor_name = "PSAS"
-        od.device_information.vendor_number = 0
-        od.device_information.product_name = cards[name].nice_name
-        od.device_information.product_number = 0
-        od.device_information.revision_number = 0
-        od.device_information.order_code = None
-        od.device_information.simple_boot_up_master = False
-        od.device_information.simple_boot_up_slave = False
-        od.device_information.granularity = 8
-        od.device_information.dynamic_channels_supported = False
-        od.device_information.group_messaging = False
-        od.device_information.nr_of_RXPDO = 0  # type: ignore[assignment]
-        od.device_information.nr_of_TXPDO = 0  # type: ignore[assignment]
-        od.device_information.LSS_supported = False
-
-        # add card objects
-        for obj in config.objects:
-            if obj.index in od.indices:
-                raise ValueError(f"index 0x{obj.index:X} already in OD")
-            od.add_object(obj.to_entry())
-
-        # add PPDSs
-        # FIXME: canopen is still working on improving their type annotations. nr_of_TXPDOs is
-        #        marked as a bool which is clearly wrong. Remove the ignore when upstream fixes
-        #        their types
-        od.device_information.nr_of_TXPDO += len(config.tpdos)  # type: ignore[operator,assignment]
-        for tpdo in config.tpdos:
-            od.add_object(tpdo.to_mapping_parameter(od))
-            od.add_object(tpdo.to_communication_parameter(od.node_id))
-
-        od.device_information.nr_of_RXPDO += len(config.rpdos)  # type: ignore[operator,assignment]
-        for rpdo in config.rpdos:
-            od.add_object(rpdo.to_mapping_parameter(od))
-            od.add_object(rpdo.to_communication_parameter(node_ids[rpdo.card]))
-
-        # set specific obj defaults
-        versions = od["versions"]
-        assert isinstance(versions, ODRecord)
-        # FIXME: canopen is still working out their type annotations, default should be of type
-        #        Union[int, str, bytes, None] but is Optional[int]. Remove ignore when upstream
-        #        fixes it.
-        versions["configs_version"].default = __version__  # type: ignore[assignment]
-        satellite_id = od["satellite_id"]
-        assert isinstance(satellite_id, ODVariable)
-        satellite_id.default = mission.id
-        for sat in Mission:
-            satellite_id.value_descriptions[sat.id] = sat.name.lower()
-        if name == "c3":
-            beacon = od["beacon"]
-            assert isinstance(beacon, ODRecord)
-            beacon["revision"].default = beacon_def.revision
-            beacon["dest_callsign"].default = beacon_def.ax25.dest_callsign  # type: ignore[assignment]
-            beacon["dest_ssid"].default = beacon_def.ax25.dest_ssid
-            beacon["src_callsign"].default = beacon_def.ax25.src_callsign  # type: ignore[assignment]
-            beacon["src_ssid"].default = beacon_def.ax25.src_ssid
-            beacon["control"].default = beacon_def.ax25.control
-            beacon["command"].default = beacon_def.ax25.command
-            beacon["response"].default = beacon_def.ax25.response
-            beacon["pid"].default = beacon_def.ax25.pid
-            flight_mode = od["flight_mode"]
-            assert isinstance(flight_mode, ODVariable)
-            flight_mode.access_type = "ro"
-
-        od_db[name] = od
-
-    # set all object values to its default value
-    for od in od_db.values():
-        for entry in od.values():
-            if not isinstance(entry, ODVariable):
-                for subentry in entry.values():
-                    subentry.value = subentry.default
-            else:
-                entry.value = entry.default
+    def gen(name: str) -> ObjectDictionary:
+        return _gen_od(mission, cards[name], beacon_def, configs[name], node_ids)
 
-    return od_db
+    return LazyMapping(configs, gen)
 
 
 def _gen_c3_fram_defs(c3_od: ObjectDictionary, config: CardConfig) -> list[ODVariable]:
@@ -332,7 +485,7 @@ def _gen_fw_base_od(mission: Mission) -> ObjectDictionary:
 
     # add any standard objects
     with resources.as_file(STD_OBJS_FILE_NAME) as path, path.open() as f:
-        for raw in load(f, Loader=CLoader):
+        for raw in load(f, Loader=Loader):
             if raw['name'] in config.std_objects:
                 obj = IndexObject.from_dict(raw)
                 if obj.name == "cob_id_emergency_message":
@@ -0,0 +1,320 @@
+"""Decode and encode beacon frames natively, without going through the Kaitai or XTCE definitions.
+
+A beacon frame is an AX.25 UI frame: a 16 byte header with the destination and source addresses,
+control and PID fields, followed by the beacon_def objects packed little endian back to back, and
+a trailing little endian CRC-32 of everything before it.
+
+BeaconCodec handles the frames of one beacon definition, BeaconRegistry picks the codec for
+frames from any mission.
+"""
+
+import struct
+import zlib
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from canopen.objectdictionary import ODArray, ODRecord, ODVariable, datatypes
+
+from .constants import Mission
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+AX25_HEADER_LEN = 16
+"""Length of the AX.25 header: two 7 byte addresses, control and PID."""
+CRC_LEN = 4
+
+STRUCT_FORMATS = {
+    datatypes.BOOLEAN: "?",
+    datatypes.INTEGER8: "b",
+    datatypes.INTEGER16: "h",
+    datatypes.INTEGER32: "i",
+    datatypes.INTEGER64: "q",
+    datatypes.UNSIGNED8: "B",
+    datatypes.UNSIGNED16: "H",
+    datatypes.UNSIGNED32: "I",
+    datatypes.UNSIGNED64: "Q",
+    datatypes.REAL32: "f",
+    datatypes.REAL64: "d",
+}
+"""struct format characters of the fixed size beacon data types."""
+
+
+def ax25_address(callsign: str, ssid: int, *, c_bit: bool, last: bool) -> bytes:
+    """Encode an AX.25 address field.
+
+    Parameters
+    ----------
+    callsign
+        Up to 6 characters, padded with spaces.
+    ssid
+        0-15.
+    c_bit
+        The command/response bit.
+    last
+        Set the extension bit, marking the last address of the header.
+    """
+    if len(callsign) > 6:
+        raise ValueError(f"callsign {callsign!r} is longer than 6 characters")
+    if not 0 <= ssid <= 0xF:
+        raise ValueError(f"invalid ssid {ssid}")
+    chars = bytes(c << 1 for c in callsign.ljust(6).encode("ascii"))
+    # bits 5 and 6 are reserved and set to 1
+    return chars + bytes([c_bit << 7 | 0b0110_0000 | ssid << 1 | last])
+
+
+def ax25_header(beacon: ODRecord) -> bytes:
+    """Build the AX.25 header of beacon frames from the C3's beacon record."""
+
+    def setting(name: str) -> int:
+        return cast(int, beacon[name].default)
+
+    return (
+        ax25_address(
+            cast(str, beacon["dest_callsign"].default),
+            setting("dest_ssid"),
+            c_bit=bool(setting("command")),
+            last=False,
+        )
+        + ax25_address(
+            cast(str, beacon["src_callsign"].default),
+            setting("src_ssid"),
+            c_bit=bool(setting("response")),
+            last=True,
+        )
+        + bytes([setting("control"), setting("pid")])
+    )
+
+
+def field_name(obj: ODVariable) -> str:
+    """Name of a beacon field, the same as the Kaitai spec uses."""
+    if isinstance(obj.parent, (ODRecord, ODArray)):
+        return f"{obj.parent.name}_{obj.name}"
+    return obj.name
+
+
+@dataclass(frozen=True)
+class BeaconField:
+    """A field of the beacon payload."""
+
+    name: str
+    """Name of the field, see field_name()."""
+    obj: ODVariable
+    """The C3 OD object the field is a copy of."""
+    offset: int
+    """Offset of the field from the start of the frame, in bytes."""
+    size: int
+    """Size of the field in bytes."""
+    fmt: str
+    """struct format of the field, little endian."""
+
+
+class BeaconCodec:
+    """Decode and encode the beacon frames of a mission.
+
+    The whole frame layout is compiled once into a single struct.Struct so decoding or encoding a
+    frame is one unpack or pack call. Build one with OreSatConfig.beacon_codec.
+    """
+
+    def __init__(self, beacon_def: Sequence[ODVariable], header: bytes) -> None:
+        """Compile the frame layout.
+
+        Parameters
+        ----------
+        beacon_def
+            The objects making up the beacon payload, in order. See OreSatConfig.beacon_def.
+        header
+            The AX.25 header every frame starts with, see ax25_header().
+        """
+        if len(header) != AX25_HEADER_LEN:
+            raise ValueError(f"AX.25 header must be {AX25_HEADER_LEN} bytes, not {len(header)}")
+        self.header = header
+
+        formats = [f"{AX25_HEADER_LEN}s"]
+        fields: list[BeaconField] = []
+        strings: list[int] = []
+        offset = AX25_HEADER_LEN
+        for obj in beacon_def:
+            if obj.data_type == datatypes.VISIBLE_STRING:
+                # Only constant strings have a known length
+                if obj.access_type != "const":
+                    raise ValueError(f"beacon string {obj.name} must be const")
+                size = len(cast(str, obj.default))
+                fmt = f"{size}s"
+                strings.append(len(fields))
+            elif obj.data_type in STRUCT_FORMATS:
+                fmt = STRUCT_FORMATS[obj.data_type]
+                size = struct.calcsize("<" + fmt)
+            else:
+                raise ValueError(f"unsupported beacon data type {obj.data_type} of {obj.name}")
+            formats.append(fmt)
+            fields.append(BeaconField(field_name(obj), obj, offset, size, fmt))
+            offset += size
+        formats.append("I")
+
+        self.fields: tuple[BeaconField, ...] = tuple(fields)
+        self.names: tuple[str, ...] = tuple(f.name for f in fields)
+        self._strings = tuple(strings)
+        self.format = "<" + "".join(formats)
+        self._struct = struct.Struct(self.format)
+        self._crc = struct.Struct("<I")
+        self._defaults = {f.name: f.obj.default for f in fields}
+
+    @classmethod
+    def from_config(cls, config: "OreSatConfig") -> "BeaconCodec":
+        """Build the codec for a mission's beacon."""
+        beacon = config.od_db["c3"]["beacon"]
+        assert isinstance(beacon, ODRecord)
+        return cls(config.beacon_def, ax25_header(beacon))
+
+    @property
+    def size(self) -> int:
+        """Size of a whole frame, in bytes."""
+        return self._struct.size
+
+    def unpack(self, frame: bytes | bytearray | memoryview, *, verify: bool = True) -> list[object]:
+        """Decode the payload of a frame into a list of values, in the order of fields.
+
+        Strings are decoded to str. Cheaper than decode() when the field names aren't needed.
+
+        Parameters
+        ----------
+        frame
+            A whole frame, AX.25 header through CRC.
+        verify
+            Check the AX.25 header and CRC, raising ValueError if they don't match.
+        """
+        if len(frame) != self._struct.size:
+            raise ValueError(f"beacon frame is {len(frame)} bytes, expected {self._struct.size}")
+        header, *values, crc = self._struct.unpack(frame)
+        if verify:
+            if header != self.header:
+                raise ValueError(f"unexpected AX.25 header {header.hex()}")
+            if zlib.crc32(memoryview(frame)[:-CRC_LEN]) != crc:
+                raise ValueError("beacon frame CRC mismatch")
+        for i in self._strings:
+            values[i] = values[i].decode("ascii")
+        return values
+
+    def decode(
+        self, frame: bytes | bytearray | memoryview, *, verify: bool = True
+    ) -> dict[str, object]:
+        """Decode a frame into a dict of field name to value.
+
+        See unpack() for the parameters.
+        """
+        return dict(zip(self.names, self.unpack(frame, verify=verify), strict=True))
+
+    def encode(self, values: Mapping[str, object] | None = None) -> bytes:
+        """Encode a frame, computing its CRC.
+
+        Parameters
+        ----------
+        values
+            Field name to value. Fields left out get the default value of their object.
+        """
+        merged = self._defaults if values is None else {**self._defaults, **values}
+        if len(merged) != len(self._defaults):
+            raise ValueError(f"unknown beacon fields {sorted(set(merged) - set(self._defaults))}")
+        payload = [merged[name] for name in self.names]
+        for i in self._strings:
+            payload[i] = cast(str, payload[i]).encode("ascii")
+
+        frame = bytearray(self._struct.size)
+        self._struct.pack_into(frame, 0, self.header, *payload, 0)
+        self._crc.pack_into(frame, len(frame) - CRC_LEN, zlib.crc32(frame[:-CRC_LEN]))
+        return bytes(frame)
+
+
+KEY_FIELDS = ("satellite_id", "beacon_revision")
+"""Fields at the start of every beacon that identify its mission and revision."""
+
+
+class BeaconRegistry:
+    """Decode beacons from any mission and beacon revision.
+
+    Every mission's beacon starts with the same prefix, start_chars, satellite_id and revision, but
+    the fields after it differ. The registry holds a codec for every (satellite id, revision) and
+    picks the one for a frame from that prefix with a single dict lookup, so mixed traffic from
+    several missions can be decoded by one process.
+    """
+
+    def __init__(self, codecs: Iterable[BeaconCodec] = ()) -> None:
+        """Create a registry.
+
+        Parameters
+        ----------
+        codecs
+            The codecs to register, see add().
+        """
+        self._codecs: dict[tuple[int, ...], BeaconCodec] = {}
+        self._key: list[tuple[int, struct.Struct]] = []
+        for codec in codecs:
+            self.add(codec)
+
+    @classmethod
+    def from_missions(cls, missions: Iterable[Mission] | None = None) -> "BeaconRegistry":
+        """Create a registry with the current beacon of each mission.
+
+        The missions are loaded with OreSatConfig.get() so they're shared with other users.
+
+        Parameters
+        ----------
+        missions
+            (optional) The missions to register, by default every mission.
+        """
+        from ._oresat_config import OreSatConfig  # noqa: PLC0415 - circular import
+
+        return cls(
+            OreSatConfig.get(m).beacon_codec for m in (Mission if missions is None else missions)
+        )
+
+    def add(self, codec: BeaconCodec) -> None:
+        """Register a codec, e.g. one built from the configs of an older beacon revision.
+
+        The codec's frames are identified by the default values of its KEY_FIELDS, which must be at
+        the same offsets as in every other codec of the registry.
+        """
+        fields = {f.name: f for f in codec.fields}
+        if not all(name in fields for name in KEY_FIELDS):
+            raise ValueError(f"beacon is missing one of {KEY_FIELDS}")
+        key_fields = [fields[name] for name in KEY_FIELDS]
+
+        layout = [(f.offset, struct.Struct("<" + f.fmt)) for f in key_fields]
+        if not self._key:
+            self._key = layout
+        elif [(o, s.format) for o, s in layout] != [(o, s.format) for o, s in self._key]:
+            raise ValueError("beacon doesn't share the prefix of the other registered beacons")
+
+        key = tuple(cast(int, f.obj.default) for f in key_fields)
+        if key in self._codecs:
+            raise ValueError(f"a beacon with satellite id and revision {key} is already registered")
+        self._codecs[key] = codec
+
+    def key(self, frame: bytes | bytearray | memoryview) -> tuple[int, ...]:
+        """Peek at the satellite id and revision of a frame."""
+        try:
+            return tuple(s.unpack_from(frame, offset)[0] for offset, s in self._key)
+        except struct.error:
+            raise ValueError(f"beacon frame is too short, {len(frame)} bytes") from None
+
+    def codec(self, frame: bytes | bytearray | memoryview) -> BeaconCodec:
+        """Find the codec of a frame, raising ValueError if it's from an unregistered beacon."""
+        key = self.key(frame)
+        try:
+            return self._codecs[key]
+        except KeyError:
+            raise ValueError(f"no beacon with satellite id and revision {key}") from None
+
+    def decode(
+        self, frame: bytes | bytearray | memoryview, *, verify: bool = True
+    ) -> dict[str, object]:
+        """Decode a frame with the codec of its beacon, see BeaconCodec.decode()."""
+        return self.codec(frame).decode(frame, verify=verify)
+
+    def __len__(self) -> int:
+        return len(self._codecs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._codecs
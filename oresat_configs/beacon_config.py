@@ -4,8 +4,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Self
 
-from dacite import from_dict
-from yaml import CLoader, load
+from yaml import load
+
+from ._loader import Loader
+from ._schema import decode
 
 
 @dataclass
@@ -83,5 +85,5 @@ class BeaconConfig:
     def from_yaml(cls, config_path: Path) -> Self:
         """Load a beacon YAML config file."""
         with config_path.open() as f:
-            config_raw = load(f, Loader=CLoader)
-        return from_dict(data_class=cls, data=config_raw)
+            config_raw = load(f, Loader=Loader)
+        return decode(cls, config_raw, strict=False)
@@ -0,0 +1,171 @@
+"""Decode the CANopen traffic of a mission's cards.
+
+CanDecoder routes each frame by its COB-ID, all derived from od_db: the TPDOs of every card are
+decoded with the precompiled layouts from pdo_codec and the EMCYs, heartbeats and SYNC with the
+fixed layouts from CiA 301. Decoding a frame is one dict lookup and one unpack.
+"""
+
+import struct
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING
+
+from canopen import ObjectDictionary
+
+from .pdo_codec import PdoTable
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+SYNC_COB_ID = 0x80
+EMCY_COB_ID_START = 0x80
+"""EMCY COB-IDs are this plus the node ID."""
+HEARTBEAT_COB_ID_START = 0x700
+"""Heartbeat COB-IDs are this plus the node ID."""
+
+HB_STATES = {
+    0x00: "boot_up",
+    0x04: "stopped",
+    0x05: "operational",
+    0x7F: "pre_operational",
+}
+
+EMCY_ERROR_CODES = {
+    0x0000: "no_error",
+    0x1000: "generic_error",
+    0x2000: "current_error",
+    0x2100: "current_device_input_error",
+    0x2200: "current_inside_device_error",
+    0x2300: "current_device output_error",
+    0x3000: "voltage_error",
+    0x3100: "mains_voltage_error",
+    0x3200: "voltage_inside_device_error",
+    0x3300: "output_voltage_error",
+    0x4000: "temperature_error",
+    0x4100: "ambient_temperature_error",
+    0x4200: "device_temperature_error",
+    0x5000: "device_hardware_error",
+    0x6000: "device_software_error",
+    0x6100: "internal_software_error",
+    0x6200: "user_software_error",
+    0x6300: "data_set_error",
+    0x7000: "additional_modules_error",
+    0x8000: "monitoring_error",
+    0x8100: "communication_error",
+    0x8110: "can_overrun_error",
+    0x8120: "passive_mode_error",
+    0x8130: "heartbeat_error",
+    0x8140: "recovered_bus_error",
+    0x8150: "can_id_collision_error",
+    0x8200: "protocol_error",
+    0x8210: "pdo_not_processed_due_to_length_error",
+    0x8220: "pdo_length_exceeded_error",
+    0x8230: "mpdo_not_processed_error",
+    0x8240: "sync_data_length_error",
+    0x8250: "rpdo_timeout_error",
+    0x9000: "external_error",
+    0xF000: "additional_function_error",
+    0xFF00: "device_specific_error",
+}
+
+_EMCY = struct.Struct("<HB5s")
+
+Decode = Callable[[bytes | bytearray | memoryview], dict[str, object]]
+"""Decodes the data of a frame into a dict of signal name to value."""
+
+
+def decode_sync(data: bytes | bytearray | memoryview) -> dict[str, object]:
+    """Decode a SYNC, which only has data if it has the optional counter."""
+    return {"counter": data[0]} if data else {}
+
+
+def decode_emcy(data: bytes | bytearray | memoryview) -> dict[str, object]:
+    """Decode an EMCY: error code, error register and manufacturer specific data."""
+    if len(data) < _EMCY.size:
+        raise ValueError(f"EMCY data is {len(data)} bytes, expected {_EMCY.size}")
+    code, register, extra = _EMCY.unpack_from(data)
+    return {
+        "error_code": code,
+        "error": EMCY_ERROR_CODES.get(code, "unknown"),
+        "error_register": register,
+        "data": extra.hex(),
+    }
+
+
+def decode_heartbeat(data: bytes | bytearray | memoryview) -> dict[str, object]:
+    """Decode a heartbeat, the node's NMT state. Bit 7 is reserved."""
+    if not data:
+        raise ValueError("heartbeat has no data")
+    state = data[0] & 0x7F
+    return {"state": HB_STATES.get(state, f"unknown_0x{state:02X}")}
+
+
+class CanDecoder:
+    """Decode the TPDOs, EMCYs, heartbeats and SYNC of a mission by COB-ID."""
+
+    def __init__(
+        self, od_db: Mapping[str, ObjectDictionary], pdo_table: PdoTable, *, sync: bool = True
+    ) -> None:
+        """Build the routes.
+
+        Parameters
+        ----------
+        od_db
+            The ODs of the cards, by card name. Every OD must have a node ID.
+        pdo_table
+            The TPDOs of the cards.
+        sync
+            Decode SYNC too. With no ODs and sync False, only TPDOs are decoded.
+        """
+        # Card, message name and decoder of each COB-ID
+        self.routes: dict[int, tuple[str, str, Decode]] = {}
+        if sync:
+            self.routes[SYNC_COB_ID] = ("", "sync", decode_sync)
+        for card, od in od_db.items():
+            if od.node_id is None:
+                raise ValueError(f"{card} OD has no node ID")
+            self.routes[EMCY_COB_ID_START + od.node_id] = (card, "emcy", decode_emcy)
+            self.routes[HEARTBEAT_COB_ID_START + od.node_id] = (card, "heartbeat", decode_heartbeat)
+        for cob_id, layout in pdo_table.layouts.items():
+            if cob_id in self.routes:
+                raise ValueError(f"TPDO COB-ID 0x{cob_id:03X} of {layout.card} is already used")
+            self.routes[cob_id] = (layout.card, f"tpdo{layout.num}", layout.decode)
+
+    @classmethod
+    def from_config(cls, config: "OreSatConfig") -> "CanDecoder":
+        """Build the decoder for every card of a mission."""
+        return cls(config.od_db, config.pdo_table)
+
+    def decode(
+        self, cob_id: int, data: bytes | bytearray | memoryview
+    ) -> tuple[str, str, dict[str, object]] | None:
+        """Decode a frame.
+
+        Parameters
+        ----------
+        cob_id
+            The frame's 11 bit CAN ID.
+        data
+            The frame's data.
+
+        Returns
+        -------
+        tuple[str, str, dict[str, object]] | None
+            The card that sent the frame (empty for SYNC), the message name (e.g. 'tpdo3' or
+            'heartbeat') and the decoded signals, or None if the COB-ID isn't known.
+
+        Raises
+        ------
+        ValueError
+            The frame is too short for its message.
+        """
+        route = self.routes.get(cob_id)
+        if route is None:
+            return None
+        card, message, decode = route
+        return card, message, decode(data)
+
+    def __contains__(self, cob_id: object) -> bool:
+        return cob_id in self.routes
+
+    def __len__(self) -> int:
+        return len(self.routes)
@@ -0,0 +1,134 @@
+"""SocketCAN acceptance filters for the traffic of a set of cards.
+
+A process that only cares about a few cards can have the kernel drop every other frame, before it
+costs any Python time, by giving python-can a list of filters when opening the bus. Each filter is
+a (can_id, can_mask) pair matching the frames with received_id & can_mask == can_id & can_mask. The
+kernel has to check every filter for every frame, so the list is kept as short as possible while
+still matching exactly the COB-IDs wanted, with the Quine-McCluskey method.
+"""
+
+from collections.abc import Collection, Iterable
+from itertools import combinations
+from typing import TYPE_CHECKING
+
+from can.typechecking import CanFilter
+
+from .can_decoder import EMCY_COB_ID_START, HEARTBEAT_COB_ID_START
+from .pdo_codec import PdoTable
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+COB_ID_MASK = 0x7FF
+"""Mask of an 11 bit CAN ID."""
+MATCH_NOTHING: CanFilter = {"can_id": 0x800, "can_mask": 0x800, "extended": False}
+"""A filter no frame matches: the bit it needs set is outside of 11 bit IDs."""
+EXACT_COVER_LIMIT = 16
+"""Most candidate filters left after the essential ones for which the shortest list is searched for
+exhaustively, instead of picked greedily."""
+
+
+def card_cob_ids(
+    config: "OreSatConfig", cards: Collection[str], *, pdos: bool = True, nodes: bool = True
+) -> set[int]:
+    """Collect the COB-IDs of the frames sent by some cards.
+
+    Parameters
+    ----------
+    config
+        The mission's configs.
+    cards
+        Names of the cards, keys of od_db. Only their ODs are built.
+    pdos
+        Include the cards' TPDOs.
+    nodes
+        Include the cards' EMCYs and heartbeats.
+    """
+    cob_ids: set[int] = set()
+    if pdos:
+        cob_ids.update(PdoTable.from_config(config, cards).layouts)
+    if nodes:
+        for card in cards:
+            node_id = config.od_db[card].node_id
+            if node_id is None:
+                raise ValueError(f"{card} OD has no node ID")
+            cob_ids.update((EMCY_COB_ID_START + node_id, HEARTBEAT_COB_ID_START + node_id))
+    return cob_ids
+
+
+def _prime_implicants(cob_ids: set[int]) -> set[tuple[int, int]]:
+    """Find every largest (can_id, can_mask) pair that only matches COB-IDs in cob_ids."""
+    primes: set[tuple[int, int]] = set()
+    current = {(cob_id, COB_ID_MASK) for cob_id in cob_ids}
+    while current:
+        merged: set[tuple[int, int]] = set()
+        combined: set[tuple[int, int]] = set()
+        for value, mask in current:
+            bit = 1
+            while bit <= mask:
+                # Two pairs that only differ in one bit merge into one that ignores that bit
+                if mask & bit and not value & bit and (value | bit, mask) in current:
+                    merged.add((value, mask & ~bit))
+                    combined.update(((value, mask), (value | bit, mask)))
+                bit <<= 1
+        primes |= current - combined
+        current = merged
+    return primes
+
+
+def _covers(pair: tuple[int, int], cob_ids: set[int]) -> set[int]:
+    value, mask = pair
+    return {cob_id for cob_id in cob_ids if cob_id & mask == value}
+
+
+def _smallest_cover(
+    wanted: set[int], covers: dict[tuple[int, int], set[int]]
+) -> tuple[tuple[int, int], ...]:
+    """Find the fewest pairs whose covers together include every wanted COB-ID."""
+    for size in range(1, len(covers) + 1):
+        for pairs in combinations(covers, size):
+            if wanted <= set().union(*(covers[pair] for pair in pairs)):
+                return pairs
+    raise ValueError("the pairs don't cover every wanted COB-ID")
+
+
+def minimal_filters(cob_ids: Iterable[int]) -> list[tuple[int, int]]:
+    """Find a shortest list of (can_id, can_mask) pairs that match exactly the given COB-IDs.
+
+    The essential prime implicants are always used. Whatever they don't match is covered with the
+    fewest remaining ones if there are at most EXACT_COVER_LIMIT of them, or greedily otherwise,
+    which in practice is still the shortest or within a filter of it.
+    """
+    wanted = {cob_id & COB_ID_MASK for cob_id in cob_ids}
+    covers = {pair: _covers(pair, wanted) for pair in _prime_implicants(wanted)}
+
+    chosen: set[tuple[int, int]] = set()
+    for cob_id in wanted:
+        matching = [pair for pair, covered in covers.items() if cob_id in covered]
+        if len(matching) == 1:
+            chosen.add(matching[0])
+    left = wanted.difference(*(covers[pair] for pair in chosen))
+    candidates = sorted(pair for pair in covers if pair not in chosen and covers[pair] & left)
+
+    if left and len(candidates) <= EXACT_COVER_LIMIT:
+        chosen.update(_smallest_cover(left, {pair: covers[pair] for pair in candidates}))
+    else:
+        while left:
+            best = max(candidates, key=lambda pair: len(covers[pair] & left))
+            chosen.add(best)
+            left -= covers[best]
+    return sorted(chosen)
+
+
+def socketcan_filters(cob_ids: Iterable[int]) -> list[CanFilter]:
+    """Get the python-can can_filters matching exactly the given COB-IDs, see minimal_filters().
+
+    The filters only match 11 bit IDs, so extended frames are dropped too. With no COB-IDs, the
+    filter is MATCH_NOTHING, as python-can takes no filters at all to mean match everything.
+    """
+    filters = minimal_filters(cob_ids)
+    if not filters:
+        return [MATCH_NOTHING]
+    return [
+        {"can_id": can_id, "can_mask": can_mask, "extended": False} for can_id, can_mask in filters
+    ]
@@ -0,0 +1,106 @@
+"""Listen to a CAN bus with asyncio, decoding frames as they arrive.
+
+python-can's Notifier reads the bus in its own thread and hands each message to the event loop
+through an AsyncBufferedReader. CanListener decodes them with a CanDecoder and fans the decoded
+frames out to any number of async consumers, each with its own bounded queue, so a slow consumer
+never holds up the bus or the other consumers.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import NamedTuple
+
+import can
+
+from .can_decoder import CanDecoder
+
+QUEUE_SIZE = 1000
+"""Default number of decoded frames a consumer can fall behind by before frames are dropped."""
+
+
+class DecodedFrame(NamedTuple):
+    """A frame decoded by CanListener."""
+
+    timestamp: float
+    """Receive time of the frame, from python-can."""
+    cob_id: int
+    card: str
+    """Card that sent the frame, empty for SYNC."""
+    message: str
+    """Message name, e.g. 'tpdo3' or 'heartbeat', see CanDecoder.decode()."""
+    values: dict[str, object]
+    """The decoded signals."""
+
+
+class CanListener:
+    """Decode frames from a CAN bus and fan them out to async consumers.
+
+    Consumers either iterate over frames(), or get a queue from subscribe() and read it
+    themselves. Frames are only put in the queues of consumers subscribed when they arrive. If a
+    consumer's queue is full, frames for it are dropped and counted in dropped.
+    """
+
+    def __init__(self, bus: can.BusABC, decoder: CanDecoder) -> None:
+        """Create a listener, run() starts it.
+
+        Parameters
+        ----------
+        bus
+            The bus to listen to. It's not shut down by the listener.
+        decoder
+            Decodes the frames, frames it doesn't know are ignored.
+        """
+        self.bus = bus
+        self.decoder = decoder
+        self.dropped = 0
+        """Frames that didn't fit in a consumer's queue."""
+        self.errors = 0
+        """Frames that were too short for their message."""
+        self._queues: list[asyncio.Queue[DecodedFrame]] = []
+
+    def subscribe(self, maxsize: int = QUEUE_SIZE) -> asyncio.Queue[DecodedFrame]:
+        """Get a new queue that every decoded frame is put in."""
+        queue: asyncio.Queue[DecodedFrame] = asyncio.Queue(maxsize)
+        self._queues.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[DecodedFrame]) -> None:
+        """Stop putting decoded frames in a queue from subscribe()."""
+        self._queues.remove(queue)
+
+    async def frames(self, maxsize: int = QUEUE_SIZE) -> AsyncGenerator[DecodedFrame]:
+        """Iterate over decoded frames, from the first one received once iteration starts."""
+        queue = self.subscribe(maxsize)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(queue)
+
+    async def run(self) -> None:
+        """Receive, decode and fan out frames until cancelled."""
+        reader = can.AsyncBufferedReader()
+        notifier = can.Notifier(self.bus, [reader], loop=asyncio.get_running_loop())
+        routes = self.decoder.routes
+        queues = self._queues
+        try:
+            async for msg in reader:
+                if msg.is_extended_id or msg.is_remote_frame or msg.is_error_frame:
+                    continue
+                route = routes.get(msg.arbitration_id)
+                if route is None:
+                    continue
+                card, message, decode = route
+                try:
+                    values = decode(msg.data)
+                except ValueError:
+                    self.errors += 1
+                    continue
+                frame = DecodedFrame(msg.timestamp, msg.arbitration_id, card, message, values)
+                for queue in queues:
+                    try:
+                        queue.put_nowait(frame)
+                    except asyncio.QueueFull:
+                        self.dropped += 1
+        finally:
+            notifier.stop()
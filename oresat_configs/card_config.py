@@ -1,6 +1,7 @@
 """Load a card config file."""
 
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from itertools import chain
 from pathlib import Path
@@ -27,9 +28,10 @@ from canopen.objectdictionary import (
     ODRecord,
     ODVariable,
 )
-from dacite import Config, from_dict
-from yaml import CLoader, load
+from yaml import load
 
+from ._loader import Loader
+from ._schema import decode
 from .odtypes import (
     COBId,
     HighestSubindexSupported,
@@ -449,7 +451,7 @@ class IndexObject(ConfigObject):
 
     @classmethod
     def from_dict(cls, data: dict[str, float | str]) -> Self:
-        return from_dict(data_class=cls, data=data, config=Config(strict=True))
+        return decode(cls, data)
 
 
 @dataclass
@@ -595,20 +597,143 @@ class CardConfig:
     fram: list[list[str]] = field(default_factory=list)
     """C3 only. List of index and subindex for the c3 to save the values of to F-RAM."""
 
-    def find_object(self, field: list[str]) -> IndexObject | SubindexObject:
+    def __post_init__(self) -> None:
+        # Lookup tables. These are deliberately not dataclass fields so they don't take part in
+        # comparisons, repr() or YAML loading. They must be kept in sync with the lists above so
+        # modify objects through the methods below, or call reindex() after modifying directly.
+        self._objects_by_index: dict[int, IndexObject] = {}
+        self._objects_by_name: dict[str, IndexObject] = {}
+        self._subindexes_by_num: dict[tuple[int, int], SubindexObject] = {}
+        self._subindexes_by_name: dict[tuple[str, str], SubindexObject] = {}
+        self._tpdos_by_num: dict[int, Tpdo] = {}
+        self._rpdos_by_num: dict[int, Rpdo] = {}
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild all the lookup tables from objects, tpdos and rpdos."""
+        self._objects_by_index.clear()
+        self._objects_by_name.clear()
+        self._subindexes_by_num.clear()
+        self._subindexes_by_name.clear()
+        self._tpdos_by_num.clear()
+        self._rpdos_by_num.clear()
         for obj in self.objects:
-            if obj.name == field[0]:
-                if obj.object_type == 'variable':
-                    return obj
-                # else record or array
-                for sub in obj.subindexes:
-                    if sub.name == field[1]:
-                        return sub
+            self._index_object(obj)
+        for tpdo in self.tpdos:
+            self._tpdos_by_num.setdefault(tpdo.num, tpdo)
+        for rpdo in self.rpdos:
+            self._rpdos_by_num.setdefault(rpdo.num, rpdo)
+
+    def _index_object(self, obj: IndexObject) -> None:
+        # setdefault so that, like a linear search, the first of any duplicates wins
+        self._objects_by_index.setdefault(obj.index, obj)
+        self._objects_by_name.setdefault(obj.name, obj)
+        for sub in obj.subindexes:
+            self._subindexes_by_num.setdefault((obj.index, sub.subindex), sub)
+            self._subindexes_by_name.setdefault((obj.name, sub.name), sub)
+
+    def _unindex_object(self, obj: IndexObject) -> None:
+        if self._objects_by_index.get(obj.index) is obj:
+            del self._objects_by_index[obj.index]
+        if self._objects_by_name.get(obj.name) is obj:
+            del self._objects_by_name[obj.name]
+        for sub in obj.subindexes:
+            if self._subindexes_by_num.get((obj.index, sub.subindex)) is sub:
+                del self._subindexes_by_num[obj.index, sub.subindex]
+            if self._subindexes_by_name.get((obj.name, sub.name)) is sub:
+                del self._subindexes_by_name[obj.name, sub.name]
+
+    @contextmanager
+    def modifying(self, obj: IndexObject) -> Iterator[IndexObject]:
+        """Modify an object of this config in place while keeping the lookup tables in sync.
+
+        Use this for anything that changes how an object is looked up; renaming it or its
+        subindexes, adding subindexes, generating subindexes, ...
+
+        .. code-block:: python
+
+            with config.modifying(obj):
+                obj.name = "new_name"
+        """
+        self._unindex_object(obj)
+        try:
+            yield obj
+        finally:
+            self._index_object(obj)
+
+    def add_object(self, obj: IndexObject) -> None:
+        """Add an object to the config."""
+        self.objects.append(obj)
+        self._index_object(obj)
+
+    def replace_object(self, old: IndexObject, new: IndexObject) -> None:
+        """Replace an object of the config with another, keeping its position."""
+        self.objects[self.objects.index(old)] = new
+        self._unindex_object(old)
+        self._index_object(new)
+
+    def expand_subindexes(self, node_ids: dict[str, int]) -> None:
+        """Generate the subindexes of every object that uses generate_subindexes."""
+        for obj in self.objects:
+            if obj.generate_subindexes is not None:
+                with self.modifying(obj):
+                    obj.expand_subindexes(node_ids)
+
+    def add_tpdo(self, tpdo: Tpdo) -> None:
+        """Add a TPDO to the config."""
+        self.tpdos.append(tpdo)
+        self._tpdos_by_num.setdefault(tpdo.num, tpdo)
+
+    def add_rpdo(self, rpdo: Rpdo) -> None:
+        """Add a RPDO to the config."""
+        self.rpdos.append(rpdo)
+        self._rpdos_by_num.setdefault(rpdo.num, rpdo)
+
+    def replace_tpdo(self, old: Tpdo, new: Tpdo) -> None:
+        """Replace a TPDO of the config with another, keeping its position."""
+        self.tpdos[self.tpdos.index(old)] = new
+        if self._tpdos_by_num.get(old.num) is old:
+            del self._tpdos_by_num[old.num]
+        self._tpdos_by_num.setdefault(new.num, new)
+
+    def replace_rpdo(self, old: Rpdo, new: Rpdo) -> None:
+        """Replace a RPDO of the config with another, keeping its position."""
+        self.rpdos[self.rpdos.index(old)] = new
+        if self._rpdos_by_num.get(old.num) is old:
+            del self._rpdos_by_num[old.num]
+        self._rpdos_by_num.setdefault(new.num, new)
+
+    def get_object(self, index: int) -> IndexObject | None:
+        """Get the object at an index, or None if there isn't one."""
+        return self._objects_by_index.get(index)
+
+    def get_subindex(self, index: int, subindex: int) -> SubindexObject | None:
+        """Get the object at an index and subindex, or None if there isn't one."""
+        return self._subindexes_by_num.get((index, subindex))
+
+    def get_tpdo(self, num: int) -> Tpdo | None:
+        """Get a TPDO by number, or None if there isn't one."""
+        return self._tpdos_by_num.get(num)
+
+    def get_rpdo(self, num: int) -> Rpdo | None:
+        """Get a RPDO by number, or None if there isn't one."""
+        return self._rpdos_by_num.get(num)
+
+    def find_object(self, field: list[str]) -> IndexObject | SubindexObject:
+        """Find an object by name, as given in TPDO fields, beacon fields, ...
+
+        field is either [variable_name] or [record_or_array_name, subindex_name].
+        """
+        obj = self._objects_by_name.get(field[0])
+        if obj is not None and obj.object_type == 'variable':
+            return obj
+        if len(field) > 1 and (field[0], field[1]) in self._subindexes_by_name:
+            return self._subindexes_by_name[field[0], field[1]]
         raise ValueError(f'tpdo field {field} not found in config.objects')
 
     @classmethod
     def from_yaml(cls, config_path: Path) -> Self:
         """Load a card YAML config file."""
         with config_path.open() as f:
-            config_raw = load(f, Loader=CLoader)
-        return from_dict(data_class=cls, data=config_raw, config=Config(strict=True))
+            config_raw = load(f, Loader=Loader)
+        return decode(cls, config_raw)
@@ -0,0 +1,174 @@
+"""A live mirror of the latest values of every card's PDO mappable objects.
+
+The mirror is updated from the TPDO stream, e.g. a candump log or a live bus, and answers "what's
+the latest value of X" without scanning anything. The values are stored in rows, one per TPDO
+holding its signals in mapping order, so an update is a single row replacement no matter how many
+objects are mirrored. The (card, index, subindex) of every mirrored object is resolved to its row
+and column once, when the mirror is built.
+
+Snapshots are copy on write: taking one is O(1), and the first update after it copies the list of
+rows, not the values, so the snapshot keeps seeing the rows as they were.
+"""
+
+import math
+import threading
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING
+
+import can
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODVariable
+
+from .pdo_codec import PdoTable
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+Key = tuple[str, int, int]
+"""The card, index and subindex of an object. The subindex of a plain variable is 0."""
+Slot = tuple[tuple[int, int], ...]
+"""Where an object's values are stored: (row, column) for each TPDO it's mapped in."""
+
+
+def _mappable(od: ObjectDictionary) -> Iterator[ODVariable]:
+    """Iterate over the PDO mappable variables of an OD."""
+    for entry in od.values():
+        variables = [entry] if isinstance(entry, ODVariable) else entry.values()
+        yield from (v for v in variables if v.pdo_mappable)
+
+
+class MirrorView:
+    """Read access to the values of an OdMirror."""
+
+    def __init__(
+        self, slots: Mapping[Key, Slot], rows: list[tuple[object, ...]], stamps: list[float]
+    ) -> None:
+        self._slots = slots
+        self._rows = rows
+        self._stamps = stamps
+
+    def get(self, card: str, index: int, subindex: int = 0) -> tuple[object, float]:
+        """Get the latest value of an object and the timestamp of the frame it came in.
+
+        The value is None and the timestamp NaN if the object hasn't been received yet.
+
+        Raises
+        ------
+        KeyError
+            The object isn't mirrored, it's not PDO mappable.
+        """
+        value: object = None
+        stamp = math.nan
+        for row, column in self._slots[card, index, subindex]:
+            # Objects mapped in several TPDOs take the value from the latest one
+            if self._stamps[row] > stamp or math.isnan(stamp):
+                value = self._rows[row][column] if self._rows[row] else None
+                stamp = self._stamps[row]
+        return value, stamp
+
+    def __getitem__(self, key: Key) -> object:
+        """Get the latest value of an object, see get()."""
+        return self.get(*key)[0]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class OdMirror(MirrorView):
+    """The latest values of every PDO mappable object of every card, updated from TPDOs.
+
+    Updates and snapshots are thread safe, so the mirror can be updated from e.g. python-can's
+    Notifier thread while being read from another. Reading the mirror itself gives the latest value
+    of each object, take a snapshot to read several objects as of the same moment.
+    """
+
+    def __init__(self, od_db: Mapping[str, ObjectDictionary], pdo_table: PdoTable) -> None:
+        """Build the mirror, with no values yet.
+
+        Parameters
+        ----------
+        od_db
+            The ODs of the cards, by card name. Every PDO mappable variable of every OD is
+            mirrored.
+        pdo_table
+            The TPDOs the values come from.
+        """
+        slots: dict[Key, list[tuple[int, int]]] = {
+            (card, v.index, v.subindex): [] for card, od in od_db.items() for v in _mappable(od)
+        }
+        # Row of each TPDO, by COB-ID, and how to unpack its data
+        self._routes = {}
+        for row, (cob_id, layout) in enumerate(pdo_table.layouts.items()):
+            self._routes[cob_id] = (row, layout.unpack)
+            for column, signal in enumerate(layout.signals):
+                key = (layout.card, signal.obj.index, signal.obj.subindex)
+                slots.setdefault(key, []).append((row, column))
+
+        rows: list[tuple[object, ...]] = [()] * len(self._routes)
+        super().__init__(
+            {key: tuple(slot) for key, slot in slots.items()}, rows, [math.nan] * len(rows)
+        )
+        self._shared = False
+        self._lock = threading.Lock()
+        self.errors = 0
+        """Frames on_message_received() ignored for being too short for their TPDO."""
+
+    @classmethod
+    def from_config(cls, config: "OreSatConfig") -> "OdMirror":
+        """Build the mirror for every card of a mission."""
+        return cls(config.od_db, config.pdo_table)
+
+    def update(self, cob_id: int, data: bytes | bytearray | memoryview, timestamp: float) -> bool:
+        """Update the mirror from a frame.
+
+        Parameters
+        ----------
+        cob_id
+            The frame's 11 bit CAN ID.
+        data
+            The frame's data.
+        timestamp
+            When the frame was received.
+
+        Returns
+        -------
+        bool
+            True if the frame was a TPDO and the mirror was updated, False if it was ignored.
+
+        Raises
+        ------
+        ValueError
+            The frame is too short for its TPDO.
+        """
+        route = self._routes.get(cob_id)
+        if route is None:
+            return False
+        row, unpack = route
+        values = unpack(data)
+        with self._lock:
+            if self._shared:
+                # A snapshot has the current lists, leave them to it
+                self._rows = self._rows.copy()
+                self._stamps = self._stamps.copy()
+                self._shared = False
+            self._rows[row] = values
+            self._stamps[row] = timestamp
+        return True
+
+    def on_message_received(self, msg: can.Message) -> None:
+        """Update the mirror from a python-can message, so the mirror can be given to a Notifier."""
+        if msg.is_extended_id or msg.is_remote_frame or msg.is_error_frame:
+            return
+        try:
+            self.update(msg.arbitration_id, msg.data, msg.timestamp)
+        except ValueError:
+            self.errors += 1
+
+    def snapshot(self) -> MirrorView:
+        """Get a consistent view of every value as of now, unaffected by later updates."""
+        with self._lock:
+            self._shared = True
+            return MirrorView(self._slots, self._rows, self._stamps)
@@ -0,0 +1,347 @@
+"""The latest values of every card's OD variables in shared memory, for other processes to read.
+
+One process decodes the bus and publishes into a multiprocessing.shared_memory block, and any
+number of other processes attach to the block by name and read the values straight out of it,
+instead of each of them decoding the bus.
+
+The block is laid out as a fixed table of regions, derived from the ODs' data types and TPDO
+mappings, so every process built from the same configs agrees on the offset of every value. Each
+TPDO gets a region holding its data exactly as it's sent, so publishing a frame is a single copy,
+and every variable also gets a region of its own, for values published some other way, e.g. read
+over SDO. Reads take the value from whichever of a variable's regions was written last. A region
+is::
+
+    sequence: u64 | timestamp: f64 | values, little endian, padded to 8 bytes
+
+The sequence is a seqlock. The publisher makes it odd while writing the region and even again
+after, and readers retry if it was odd or changed while they read. There's a single publisher per
+block. Python has no memory barriers, so this relies on the stores being seen in order, which x86
+guarantees and which the interpreter's own overhead between them makes all but certain elsewhere.
+"""
+
+import math
+import struct
+import sys
+import zlib
+from collections.abc import Iterator, Mapping
+from multiprocessing import resource_tracker, shared_memory
+from types import TracebackType
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+import can
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODVariable, datatypes
+
+from .beacon_codec import STRUCT_FORMATS
+from .pdo_codec import PdoTable
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+Key = tuple[str, int, int]
+"""The card, index and subindex of a variable. The subindex of a plain variable is 0."""
+
+HEADER = struct.Struct("<4sI")
+"""Header of the block: magic and CRC-32 of the layout."""
+MAGIC = b"ODSV"
+REGION_HEADER = struct.Struct("<Qd")
+"""Header of each region: seqlock sequence and receive time of its values."""
+SEQUENCE = struct.Struct("<Q")
+TIMESTAMP = struct.Struct("<d")
+READ_RETRIES = 10_000
+"""Times a read is retried while the region is being written before giving up."""
+
+
+class Slot(NamedTuple):
+    """Where a variable's value is in the block."""
+
+    region: int
+    """Offset of the region the value is in."""
+    offset: int
+    """Offset of the value."""
+    packer: struct.Struct
+    text: bool
+    """The value is a VISIBLE_STRING, decoded to str."""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _variables(od: ObjectDictionary) -> Iterator[ODVariable]:
+    """Iterate over every variable of an OD, including those in arrays and records."""
+    for entry in od.values():
+        yield from [entry] if isinstance(entry, ODVariable) else entry.values()
+
+
+def _format(obj: ODVariable) -> str | None:
+    """Get the struct format of a variable, or None if it has no fixed size.
+
+    Strings not mapped in a TPDO are sized by their default value.
+    """
+    if obj.data_type in STRUCT_FORMATS:
+        return STRUCT_FORMATS[obj.data_type]
+    if obj.data_type not in (datatypes.VISIBLE_STRING, datatypes.OCTET_STRING):
+        return None
+    default = obj.default.encode("ascii") if isinstance(obj.default, str) else obj.default
+    size = len(default) if isinstance(default, bytes) else 0
+    return f"{size}s" if size else None
+
+
+class SharedLayout:
+    """Where every variable's value is in the shared block.
+
+    Attributes
+    ----------
+    slots
+        Where each variable's value is, once for every region it's in: the regions of the TPDOs
+        it's mapped in, then its own region.
+    own
+        Where each variable's value is in its own region, which only SharedOdValues.set() writes.
+    tpdos
+        The offset of each TPDO's region and the size of its data, by COB-ID.
+    size
+        Size of the block, in bytes.
+    crc
+        CRC-32 of the layout, to tell whether two processes agree on it.
+    """
+
+    def __init__(self, od_db: Mapping[str, ObjectDictionary], pdo_table: PdoTable) -> None:
+        """Lay out the block.
+
+        Parameters
+        ----------
+        od_db
+            The ODs of the cards, by card name. Every variable with a fixed size is included;
+            DOMAINs and empty strings are left out.
+        pdo_table
+            The TPDOs whose data is published as is.
+        """
+        slots: dict[Key, list[Slot]] = {}
+        self.tpdos: dict[int, tuple[int, int]] = {}
+        offset = HEADER.size
+        for cob_id, layout in pdo_table.layouts.items():
+            self.tpdos[cob_id] = (offset, layout.size)
+            data = offset + REGION_HEADER.size
+            for signal in layout.signals:
+                key = (layout.card, signal.obj.index, signal.obj.subindex)
+                packer = struct.Struct("<" + signal.fmt)
+                text = signal.obj.data_type == datatypes.VISIBLE_STRING
+                slots.setdefault(key, []).append(Slot(offset, data + signal.offset, packer, text))
+            offset = _align(data + layout.size)
+
+        self.own: dict[Key, Slot] = {}
+        for card, od in od_db.items():
+            for obj in _variables(od):
+                key = (card, obj.index, obj.subindex)
+                if key in slots:
+                    # Same format as in the TPDOs, for strings that's the size they're mapped with
+                    packer, text = slots[key][0].packer, slots[key][0].text
+                else:
+                    fmt = _format(obj)
+                    if fmt is None:
+                        continue
+                    packer = struct.Struct("<" + fmt)
+                    text = obj.data_type == datatypes.VISIBLE_STRING
+                self.own[key] = Slot(offset, offset + REGION_HEADER.size, packer, text)
+                slots.setdefault(key, []).append(self.own[key])
+                offset = _align(offset + REGION_HEADER.size + packer.size)
+
+        self.slots = {key: tuple(slot) for key, slot in slots.items()}
+        self.size = offset
+        description = repr(
+            sorted((k, [(r, o, p.format, t) for r, o, p, t in s]) for k, s in self.slots.items())
+        )
+        self.crc = zlib.crc32(description.encode())
+
+    @classmethod
+    def from_config(cls, config: "OreSatConfig") -> "SharedLayout":
+        """Lay out the block for every card of a mission."""
+        return cls(config.od_db, config.pdo_table)
+
+
+class SharedOdValues:
+    """The latest values of every card's OD variables, in a shared memory block.
+
+    The publishing process creates the block with create() and updates it, everyone else attaches
+    to it with attach() and reads it. Both can be used as context managers, which close the block,
+    and unlink it too if it was created.
+    """
+
+    def __init__(
+        self, layout: SharedLayout, shm: shared_memory.SharedMemory, *, owner: bool = False
+    ) -> None:
+        """Wrap an already set up block, use create() or attach() instead."""
+        self.layout = layout
+        self.shm = shm
+        self.owner = owner
+        if shm.buf is None:
+            raise ValueError(f"shared memory {shm.name} is closed")
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, layout: SharedLayout, name: str | None = None) -> "SharedOdValues":
+        """Create a new block, with every value unknown, to publish into.
+
+        Parameters
+        ----------
+        layout
+            Layout of the block.
+        name
+            Name of the block for other processes to attach to, a random one if None.
+        """
+        shm = shared_memory.SharedMemory(name, create=True, size=layout.size)
+        values = cls(layout, shm, owner=True)
+        # New blocks are zeroed, only the timestamps need setting to unknown
+        for region in {item.region for slot in layout.slots.values() for item in slot}:
+            TIMESTAMP.pack_into(values._buf, region + SEQUENCE.size, math.nan)
+        HEADER.pack_into(values._buf, 0, MAGIC, layout.crc)
+        return values
+
+    @classmethod
+    def attach(cls, layout: SharedLayout, name: str) -> "SharedOdValues":
+        """Attach to a block created by another process, to read it.
+
+        Raises
+        ------
+        ValueError
+            The block wasn't created with the same layout, e.g. the configs are different.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name)
+            # Otherwise it's unlinked when this process exits, see python/cpython#82300
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined] # noqa: SLF001
+        values = cls(layout, shm)
+        if shm.size < layout.size or HEADER.unpack_from(values._buf) != (MAGIC, layout.crc):
+            shm.close()
+            raise ValueError(f"shared memory {name} doesn't have the expected layout")
+        return values
+
+    @property
+    def name(self) -> str:
+        """Name of the block, for attach()."""
+        return self.shm.name
+
+    def update(self, cob_id: int, data: bytes | bytearray | memoryview, timestamp: float) -> bool:
+        """Publish the values from a frame.
+
+        Parameters
+        ----------
+        cob_id
+            The frame's 11 bit CAN ID.
+        data
+            The frame's data.
+        timestamp
+            When the frame was received.
+
+        Returns
+        -------
+        bool
+            True if the frame was a TPDO and its values were published, False if it was ignored.
+
+        Raises
+        ------
+        ValueError
+            The frame is too short for its TPDO.
+        """
+        tpdo = self.layout.tpdos.get(cob_id)
+        if tpdo is None:
+            return False
+        region, size = tpdo
+        if len(data) < size:
+            raise ValueError(f"PDO 0x{cob_id:03X} data is {len(data)} bytes, expected {size}")
+        buf = self._buf
+        start = region + REGION_HEADER.size
+        sequence = SEQUENCE.unpack_from(buf, region)[0]
+        SEQUENCE.pack_into(buf, region, sequence + 1)
+        buf[start : start + size] = data[:size]
+        TIMESTAMP.pack_into(buf, region + SEQUENCE.size, timestamp)
+        SEQUENCE.pack_into(buf, region, sequence + 2)
+        return True
+
+    def set(self, card: str, index: int, subindex: int, value: object, timestamp: float) -> None:
+        """Publish the value of a variable, e.g. one read over SDO.
+
+        The value goes in the variable's own region, so the values and timestamps of the TPDOs it's
+        mapped in are left alone. It's the variable's value until a later TPDO replaces it.
+
+        Raises
+        ------
+        KeyError
+            The variable isn't in the block.
+        """
+        region, offset, packer, _ = self.layout.own[card, index, subindex]
+        raw = value.encode("ascii") if isinstance(value, str) else value
+        buf = self._buf
+        sequence = SEQUENCE.unpack_from(buf, region)[0]
+        SEQUENCE.pack_into(buf, region, sequence + 1)
+        packer.pack_into(buf, offset, raw)
+        TIMESTAMP.pack_into(buf, region + SEQUENCE.size, timestamp)
+        SEQUENCE.pack_into(buf, region, sequence + 2)
+
+    def on_message_received(self, msg: can.Message) -> None:
+        """Publish the values from a python-can message, so this can be given to a Notifier.
+
+        Frames too short for their TPDO are ignored.
+        """
+        if msg.is_extended_id or msg.is_remote_frame or msg.is_error_frame:
+            return
+        try:
+            self.update(msg.arbitration_id, msg.data, msg.timestamp)
+        except ValueError:
+            return
+
+    def get(self, card: str, index: int, subindex: int = 0) -> tuple[object, float]:
+        """Read the latest value of a variable and when it was received.
+
+        The value is None and the timestamp NaN if it hasn't been published yet.
+
+        Raises
+        ------
+        KeyError
+            The variable isn't in the block.
+        RuntimeError
+            The value was being written for too long, the publisher probably died mid-write.
+        """
+        value: object = None
+        stamp = math.nan
+        for slot in self.layout.slots[card, index, subindex]:
+            region_value, region_stamp = self._read(slot)
+            # Variables in several regions take the value from the one written last
+            if region_stamp > stamp or math.isnan(stamp):
+                value, stamp = region_value, region_stamp
+        return value, stamp
+
+    def _read(self, slot: Slot) -> tuple[object, float]:
+        """Read a value with the seqlock."""
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            sequence, stamp = REGION_HEADER.unpack_from(buf, slot.region)
+            if sequence & 1:
+                continue
+            value = slot.packer.unpack_from(buf, slot.offset)[0]
+            if SEQUENCE.unpack_from(buf, slot.region)[0] != sequence:
+                continue
+            if math.isnan(stamp):
+                return None, stamp
+            return (value.decode("ascii") if slot.text else value), stamp
+        raise RuntimeError(f"value at {slot.offset} of {self.name} was being written for too long")
+
+    def close(self) -> None:
+        """Stop using the block, and unlink it if it was created here."""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,111 @@
+"""Decode many CAN frames at once into one NumPy structured array per TPDO.
+
+Meant for analysing logs of the CAN bus, where decoding frames one at a time with PdoTable is the
+bottleneck. The frames are grouped by COB-ID and the data of each TPDO's frames is viewed as a
+structured dtype derived from its mapping parameters, so each signal is decoded for every frame at
+once.
+
+Requires numpy, install with `pip install oresat-configs[numpy]`.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from .pdo_codec import PdoLayout, PdoTable
+
+TIMESTAMP_FIELD = "timestamp"
+"""Name of the timestamp column of the decoded tables."""
+CAN_DATA_LEN = 8
+"""Bytes of data of a classic CAN frame."""
+
+
+def pdo_dtype(layout: PdoLayout) -> np.dtype:
+    """Derive the structured dtype of the data of one TPDO frame.
+
+    The itemsize is that of a whole CAN frame's data, so rows of frame data can be viewed as it
+    directly. Strings are raw bytes, numpy's S dtype, everything else has the numeric dtype
+    matching its struct format.
+    """
+    return np.dtype(
+        {
+            "names": list(layout.names),
+            "formats": [
+                f"S{s.size}" if s.fmt.endswith("s") else np.dtype("<" + s.fmt)
+                for s in layout.signals
+            ],
+            "offsets": [s.offset for s in layout.signals],
+            "itemsize": CAN_DATA_LEN,
+        }
+    )
+
+
+def table_dtype(layout: PdoLayout) -> np.dtype:
+    """Derive the dtype of a decoded table: the timestamp followed by the signals, packed."""
+    if TIMESTAMP_FIELD in layout.names:
+        raise ValueError(f"{layout.card} TPDO {layout.num} has a signal named {TIMESTAMP_FIELD}")
+    signals = pdo_dtype(layout)
+    assert signals.fields is not None
+    return np.dtype(
+        [(TIMESTAMP_FIELD, "<f8")] + [(name, signals.fields[name][0]) for name in layout.names]
+    )
+
+
+def decode_batch(
+    table: PdoTable,
+    timestamps: npt.ArrayLike,
+    can_ids: npt.ArrayLike,
+    dlcs: npt.ArrayLike,
+    data: npt.ArrayLike,
+) -> dict[int, np.ndarray]:
+    """Decode a batch of CAN frames, grouped by COB-ID.
+
+    Parameters
+    ----------
+    table
+        The TPDOs to decode, e.g. OreSatConfig.pdo_table.
+    timestamps
+        The timestamp of each frame.
+    can_ids
+        The CAN ID of each frame.
+    dlcs
+        The data length of each frame.
+    data
+        The data of each frame, a row of 8 bytes per frame (uint8 of shape (n, 8)). Bytes past a
+        frame's DLC are ignored.
+
+    Returns
+    -------
+    dict[int, np.ndarray]
+        A table for each TPDO with frames in the batch, by COB-ID. Each is a structured array with
+        table_dtype(), a row per frame in the order of the batch. Frames with a COB-ID that isn't a
+        TPDO, or with fewer bytes than their TPDO, are left out.
+    """
+    timestamps = np.asarray(timestamps, np.float64)
+    can_ids = np.asarray(can_ids)
+    dlcs = np.asarray(dlcs)
+    raw = np.ascontiguousarray(data, np.uint8).reshape(-1, CAN_DATA_LEN)
+    if not len(timestamps) == len(can_ids) == len(dlcs) == len(raw):
+        raise ValueError("timestamps, can_ids, dlcs and data must have one entry per frame")
+
+    if not len(raw):
+        return {}
+
+    # A stable sort keeps the frames of each COB-ID in the order of the batch
+    order = np.argsort(can_ids, kind="stable")
+    cob_ids, starts = np.unique(can_ids[order], return_index=True)
+    ends = [*starts[1:], len(order)]
+
+    tables = {}
+    for cob_id, start, end in zip(cob_ids.tolist(), starts, ends, strict=True):
+        layout = table.layouts.get(cob_id)
+        if layout is None:
+            continue
+        rows = order[start:end]
+        rows = rows[dlcs[rows] >= layout.size]
+        signals = raw[rows].view(pdo_dtype(layout)).reshape(-1)
+        out = np.empty(len(rows), table_dtype(layout))
+        out[TIMESTAMP_FIELD] = timestamps[rows]
+        for name in layout.names:
+            out[name] = signals[name]
+        tables[cob_id] = out
+    return tables
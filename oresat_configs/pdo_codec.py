@@ -0,0 +1,205 @@
+"""Decode TPDOs from every card of a mission with precompiled unpackers.
+
+The layout of each TPDO, the objects mapped into it by its mapping parameter record (0x1A00+), is
+compiled once into a struct.Struct. A PdoTable maps every TPDO's COB-ID to its layout so decoding a
+received frame is one dict lookup and one unpack call, without going through canopen's PDO Map
+machinery or a listener node per card.
+"""
+
+import struct
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, cast
+
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODVariable, datatypes
+
+from .beacon_codec import STRUCT_FORMATS, field_name
+
+if TYPE_CHECKING:
+    from ._oresat_config import OreSatConfig
+
+TPDO_COMM_START = 0x1800
+"""Index of the first TPDO communication parameter record."""
+TPDO_MAPPING_START = 0x1A00
+"""Index of the first TPDO mapping parameter record."""
+MAX_TPDOS = 512
+COB_ID_INVALID = 0x8000_0000
+"""COB-ID bit set when a PDO is disabled."""
+
+
+@dataclass(frozen=True)
+class PdoSignal:
+    """An object mapped into a PDO."""
+
+    name: str
+    """Name of the signal, the object's name prefixed by its record or array's if any."""
+    obj: ODVariable
+    """The mapped object, from the transmitting card's OD."""
+    offset: int
+    """Offset of the signal in the PDO's data, in bytes."""
+    size: int
+    """Size of the signal in bytes."""
+    fmt: str
+    """struct format of the signal, little endian."""
+
+
+@dataclass(frozen=True)
+class PdoLayout:
+    """The layout of one TPDO, compiled into an unpacker."""
+
+    cob_id: int
+    """The PDO's 11 bit CAN ID."""
+    card: str
+    """Name of the card transmitting the PDO."""
+    num: int
+    """TPDO number, starting at 1."""
+    signals: tuple[PdoSignal, ...]
+    """The mapped objects, in order."""
+    names: tuple[str, ...] = field(init=False)
+    """Names of the signals, in order."""
+    unpacker: struct.Struct = field(init=False, repr=False, compare=False)
+    """Unpacker of the PDO's data."""
+    _strings: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Frozen dataclass, so set derived fields through object.__setattr__
+        object.__setattr__(self, "names", tuple(s.name for s in self.signals))
+        object.__setattr__(
+            self, "unpacker", struct.Struct("<" + "".join(s.fmt for s in self.signals))
+        )
+        strings = tuple(i for i, s in enumerate(self.signals) if s.fmt.endswith("s"))
+        object.__setattr__(self, "_strings", strings)
+
+    @property
+    def size(self) -> int:
+        """Size of the PDO's data, in bytes."""
+        return self.unpacker.size
+
+    def unpack(self, data: bytes | bytearray | memoryview) -> tuple[object, ...]:
+        """Decode the PDO's data into a tuple of values, in the order of signals.
+
+        Data longer than the PDO is allowed, the extra bytes are ignored. Strings are decoded to
+        str.
+        """
+        try:
+            values = self.unpacker.unpack_from(data)
+        except struct.error:
+            raise ValueError(
+                f"PDO 0x{self.cob_id:03X} data is {len(data)} bytes, expected {self.size}"
+            ) from None
+        if self._strings:
+            decoded = list(values)
+            for i in self._strings:
+                decoded[i] = decoded[i].decode("ascii")
+            return tuple(decoded)
+        return values
+
+    def decode(self, data: bytes | bytearray | memoryview) -> dict[str, object]:
+        """Decode the PDO's data into a dict of signal name to value, see unpack()."""
+        return dict(zip(self.names, self.unpack(data), strict=True))
+
+
+def _signal(od: ObjectDictionary, mapping: int, offset: int) -> PdoSignal:
+    """Build a signal from a TPDO mapping entry: index << 16 | subindex << 8 | bit length."""
+    index, subindex, bits = mapping >> 16, (mapping >> 8) & 0xFF, mapping & 0xFF
+    entry = od[index]
+    obj = entry if isinstance(entry, ODVariable) else entry[subindex]
+    if bits % 8:
+        raise ValueError(f"{obj.name} is mapped with {bits} bits, only whole bytes are supported")
+    size = bits // 8
+    if obj.data_type == datatypes.VISIBLE_STRING:
+        fmt = f"{size}s"
+    elif obj.data_type in STRUCT_FORMATS:
+        fmt = STRUCT_FORMATS[obj.data_type]
+        if struct.calcsize("<" + fmt) != size:
+            raise ValueError(f"{obj.name} is mapped with {bits} bits, not the size of its type")
+    else:
+        raise ValueError(f"unsupported PDO data type {obj.data_type} of {obj.name}")
+    return PdoSignal(field_name(obj), obj, offset, size, fmt)
+
+
+def tpdo_layouts(card: str, od: ObjectDictionary) -> list[PdoLayout]:
+    """Compile the layouts of every enabled TPDO of a card."""
+    layouts = []
+    for num in range(MAX_TPDOS):
+        comm = od.get(TPDO_COMM_START + num)
+        mapping = od.get(TPDO_MAPPING_START + num)
+        if comm is None or mapping is None:
+            continue
+        cob_id = cast(int, comm["cob_id"].default)
+        if cob_id & COB_ID_INVALID:
+            continue
+
+        signals = []
+        offset = 0
+        for subindex in range(1, cast(int, mapping[0].default) + 1):
+            signal = _signal(od, cast(int, mapping[subindex].default), offset)
+            signals.append(signal)
+            offset += signal.size
+        layouts.append(PdoLayout(cob_id & 0x7FF, card, num + 1, tuple(signals)))
+    return layouts
+
+
+class PdoTable:
+    """Decode the TPDOs of every card of a mission by COB-ID."""
+
+    def __init__(self, layouts: Iterable[PdoLayout]) -> None:
+        """Create a table.
+
+        Parameters
+        ----------
+        layouts
+            The layouts to decode, their COB-IDs must be unique.
+        """
+        self.layouts: dict[int, PdoLayout] = {}
+        for layout in layouts:
+            if layout.cob_id in self.layouts:
+                other = self.layouts[layout.cob_id]
+                raise ValueError(
+                    f"COB-ID 0x{layout.cob_id:03X} used by both {other.card} TPDO {other.num} and"
+                    f" {layout.card} TPDO {layout.num}"
+                )
+            self.layouts[layout.cob_id] = layout
+
+    @classmethod
+    def from_od_db(cls, od_db: Mapping[str, ObjectDictionary]) -> "PdoTable":
+        """Build the table for the TPDOs of every OD."""
+        return cls(layout for card, od in od_db.items() for layout in tpdo_layouts(card, od))
+
+    @classmethod
+    def from_config(
+        cls, config: "OreSatConfig", cards: Collection[str] | None = None
+    ) -> "PdoTable":
+        """Build the table for the TPDOs of every card of a mission, or only of some cards.
+
+        With cards, only their ODs are built, which for any card but the C3 is much quicker than
+        building every OD.
+        """
+        if cards is None:
+            return cls.from_od_db(config.od_db)
+        return cls.from_od_db({card: config.od_db[card] for card in cards})
+
+    def select(self, cards: Collection[str]) -> "PdoTable":
+        """Get a table with only the TPDOs of the given cards."""
+        return PdoTable(layout for layout in self.layouts.values() if layout.card in cards)
+
+    def unpack(self, cob_id: int, data: bytes | bytearray | memoryview) -> tuple[object, ...]:
+        """Decode a PDO into a tuple of values, see PdoLayout.unpack().
+
+        Raises KeyError if the COB-ID isn't a known TPDO.
+        """
+        return self.layouts[cob_id].unpack(data)
+
+    def decode(self, cob_id: int, data: bytes | bytearray | memoryview) -> dict[str, object]:
+        """Decode a PDO into a dict of signal name to value, see PdoLayout.decode().
+
+        Raises KeyError if the COB-ID isn't a known TPDO.
+        """
+        return self.layouts[cob_id].decode(data)
+
+    def __contains__(self, cob_id: object) -> bool:
+        return cob_id in self.layouts
+
+    def __len__(self) -> int:
+        return len(self.layouts)
@@ -0,0 +1,122 @@
+"""Content-hash stamps so generators can skip artifacts that are already up to date.
+
+Each generated artifact gets a hidden stamp file next to it holding a fingerprint of everything
+that went into it: the resolved OD(s), the source of the generator module and the versions of
+oresat-configs and canopen. When the fingerprint matches the stamp, and the artifact's files still
+exist, generation is skipped and the files are left untouched, mtimes included, so downstream
+builds (e.g. firmware including OD.c/OD.h) don't rebuild for nothing.
+"""
+
+import hashlib
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODArray, ODRecord, ODVariable
+
+from .._cache import versions
+
+if TYPE_CHECKING:
+    from .. import OreSatConfig
+
+
+def _state(value: object) -> object:
+    """Turn a part of an OD into plain, comparable, data with a deterministic repr()."""
+    if isinstance(value, (ODVariable, ODRecord, ODArray)):
+        # parent is the OD itself and names duplicates subindices
+        return (
+            type(value).__name__,
+            tuple((k, _state(v)) for k, v in vars(value).items() if k not in ("parent", "names")),
+        )
+    if isinstance(value, dict):
+        return tuple((k, _state(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def od_fingerprint(od: ObjectDictionary) -> str:
+    """Hash everything about an OD that a generator could output."""
+    h = hashlib.sha256()
+    h.update(repr((od.node_id, od.bitrate, od.comments)).encode())
+    h.update(repr(_state(vars(od.device_information))).encode())
+    for entry in od.values():
+        h.update(repr(_state(entry)).encode())
+    return h.hexdigest()
+
+
+def config_fingerprint(config: "OreSatConfig") -> str:
+    """Hash everything about a mission's configs that the per mission generators could output."""
+    h = hashlib.sha256()
+    h.update(repr((config.mission.name, list(config.cards))).encode())
+    for name, od in config.od_db.items():
+        h.update(f"{name}:{od_fingerprint(od)}".encode())
+    for objs in (config.beacon_def, config.fram_def):
+        h.update(repr([(obj.index, obj.subindex) for obj in objs]).encode())
+    return h.hexdigest()
+
+
+def stamp(generator: str, *fingerprints: str) -> str:
+    """Combine fingerprints with the generator that turns them into an artifact.
+
+    Parameters
+    ----------
+    generator
+        Path to the generator module, usually __file__. Its contents are hashed so editing a
+        generator invalidates its artifacts even without a version bump.
+    fingerprints
+        Fingerprints of the inputs, from od_fingerprint() or config_fingerprint().
+    """
+    h = hashlib.sha256()
+    h.update(versions().encode())
+    h.update(Path(generator).read_bytes())
+    for fingerprint in fingerprints:
+        h.update(fingerprint.encode())
+    return h.hexdigest()
+
+
+def _stamp_path(outputs: list[Path]) -> Path:
+    return outputs[0].with_name(f".{outputs[0].name}.stamp")
+
+
+def generate_if_changed(
+    outputs: Iterable[Path],
+    new_stamp: str,
+    generate: Callable[[], object],
+    *,
+    force: bool = False,
+) -> bool:
+    """Generate an artifact unless it's already up to date.
+
+    Parameters
+    ----------
+    outputs
+        All the files generate() writes. The stamp is stored next to the first one.
+    new_stamp
+        The artifact's stamp, from stamp().
+    generate
+        Writes the artifact.
+    force
+        Generate even if up to date.
+
+    Returns
+    -------
+    bool
+        True if generate() was called, False if the artifact was up to date.
+    """
+    outputs = list(outputs)
+    path = _stamp_path(outputs)
+    if not force and all(p.is_file() for p in outputs):
+        try:
+            if path.read_text() == new_stamp:
+                return False
+        except OSError:
+            pass
+
+    # The stamp is only ever present while the artifact matches it, so an interrupted generate()
+    # can't leave a partially written artifact that's considered up to date
+    path.unlink(missing_ok=True)
+    generate()
+    path.write_text(new_stamp)
+    return True
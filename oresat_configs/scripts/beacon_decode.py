@@ -0,0 +1,299 @@
+"""Decode a capture of beacon frames to CSV or JSONL.
+
+The capture is streamed through a pipeline of generators, deframe -> AX.25 header check -> CRC
+check -> field decode, and the rows are written out in batches, so memory use doesn't depend on
+the size of the capture.
+"""
+
+import csv
+import json
+import sys
+import zlib
+from argparse import Namespace, _SubParsersAction
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, TextIO, TypeVar
+
+from .. import Mission, OreSatConfig
+from ..beacon_codec import AX25_HEADER_LEN, CRC_LEN, BeaconCodec
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 1 << 16
+"""Bytes read from the capture at a time."""
+
+FEND = 0xC0
+FESC = 0xDB
+TFEND = 0xDC
+TFESC = 0xDD
+
+
+def build_arguments(subparsers: _SubParsersAction) -> None:
+    """Build command line arguments for this script.
+
+    This function will be invoked by scripts.main to configure command line arguments for this
+    subcommand. Use subparsers.add_parser() to get an ArgumentParser. The parser must have the
+    default argument func which is the entry point for this subcommand: parser.set_defaults(func=?)
+
+    Parameters
+    ----------
+    subparsers
+        The output of ArgumentParser.add_subparsers() from the primary ArgumentParser. This function
+        should call add_parser() on this parameter to get the ArgumentParser that is used to
+        configure arguments for this subcommand.
+        See https://docs.python.org/3/library/argparse.html#sub-commands, especially the end of
+        that section, for more.
+    """
+    desc = "decode a capture of beacon frames to CSV or JSONL"
+    parser = subparsers.add_parser("beacon-decode", description=desc, help=desc)
+    parser.set_defaults(func=beacon_decode)
+
+    parser.add_argument(
+        "--oresat",
+        default=Mission.default().arg,
+        choices=[m.arg for m in Mission],
+        type=lambda x: x.lower().removeprefix("oresat"),
+        help="Oresat Mission. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "capture",
+        nargs="?",
+        default="-",
+        help="capture file to decode, - for stdin. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--framing",
+        choices=["kiss", "raw"],
+        default="kiss",
+        help="kiss for KISS framed frames, raw for frames stored back to back."
+        " (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "jsonl"],
+        default="csv",
+        help="output format. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="output file, - for stdout. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="decoded frames written at a time. (Default: %(default)s)",
+    )
+
+
+@dataclass
+class Stats:
+    """Counts of the frames seen by the pipeline."""
+
+    frames: int = 0
+    bad_length: int = 0
+    bad_header: int = 0
+    bad_crc: int = 0
+
+    @property
+    def decoded(self) -> int:
+        """Frames that passed every check."""
+        return self.frames - self.bad_length - self.bad_header - self.bad_crc
+
+
+def read_chunks(stream: BinaryIO, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a stream in chunks until EOF."""
+    while chunk := stream.read(size):
+        yield chunk
+
+
+def raw_frames(chunks: Iterable[bytes], frame_size: int) -> Iterator[bytes]:
+    """Split frames stored back to back. A trailing partial frame is yielded as is."""
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        end = len(data) - len(data) % frame_size
+        for i in range(0, end, frame_size):
+            yield data[i : i + frame_size]
+        pending = data[end:]
+    if pending:
+        yield pending
+
+
+def kiss_frames(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Extract the data frames from a KISS stream.
+
+    Frames are delimited by FEND, escapes are undone and the leading KISS command byte is removed.
+    Non-data frames (e.g. TX delay settings) are skipped.
+    """
+    pending = b""
+    for chunk in chunks:
+        *frames, pending = (pending + chunk).split(bytes([FEND]))
+        for frame in frames:
+            # Back to back FENDs are allowed and result in empty frames
+            if not frame or frame[0] & 0x0F != 0:
+                continue
+            if FESC in frame:
+                frame = frame.replace(bytes([FESC, TFEND]), bytes([FEND])).replace(
+                    bytes([FESC, TFESC]), bytes([FESC])
+                )
+            yield frame[1:]
+
+
+def check_headers(codec: BeaconCodec, frames: Iterable[bytes], stats: Stats) -> Iterator[bytes]:
+    """Drop frames with the wrong length or an AX.25 header other than the mission's."""
+    size = codec.size
+    header = codec.header
+    for frame in frames:
+        stats.frames += 1
+        if len(frame) != size:
+            stats.bad_length += 1
+        elif frame[:AX25_HEADER_LEN] != header:
+            stats.bad_header += 1
+        else:
+            yield frame
+
+
+def check_crcs(frames: Iterable[bytes], stats: Stats) -> Iterator[bytes]:
+    """Drop frames with a bad CRC-32."""
+    crc32 = zlib.crc32
+    for frame in frames:
+        if crc32(frame[:-CRC_LEN]) != int.from_bytes(frame[-CRC_LEN:], "little"):
+            stats.bad_crc += 1
+        else:
+            yield frame
+
+
+def decode_frames(codec: BeaconCodec, frames: Iterable[bytes]) -> Iterator[list[object]]:
+    """Decode checked frames into lists of values, in the order of codec.names."""
+    unpack = codec.unpack
+    for frame in frames:
+        yield unpack(frame, verify=False)
+
+
+def batched(rows: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Group rows into lists of up to size rows."""
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def write_csv(out: TextIO, codec: BeaconCodec, batches: Iterable[list[list[object]]]) -> None:
+    """Write batches of rows as CSV, with a header row."""
+    writer = csv.writer(out)
+    writer.writerow(codec.names)
+    for batch in batches:
+        writer.writerows(batch)
+
+
+def jsonl_encoder(codec: BeaconCodec) -> Callable[[list[object]], str]:
+    """Build a function that encodes a row as a line of JSON.
+
+    Encoding a dict per row with json is the bottleneck of JSONL output, so the keys are baked
+    into a %-format template instead. Integers are formatted by it directly and only the other
+    values, usually just a few, go through json.
+    """
+    dumps = json.dumps
+    parts = []
+    other = []
+    for i, field in enumerate(codec.fields):
+        key = dumps(field.name).replace("%", "%%")
+        if field.fmt in "bBhHiIqQ":
+            parts.append(f"{key}:%d")
+        else:
+            parts.append(f"{key}:%s")
+            other.append(i)
+    template = "{" + ",".join(parts) + "}\n"
+
+    def encode(row: list[object]) -> str:
+        for i in other:
+            row[i] = dumps(row[i])
+        return template % tuple(row)
+
+    return encode
+
+
+def write_jsonl(out: TextIO, codec: BeaconCodec, batches: Iterable[list[list[object]]]) -> None:
+    """Write batches of rows as JSON lines, one object per frame."""
+    encode = jsonl_encoder(codec)
+    out.writelines("".join(map(encode, batch)) for batch in batches)
+
+
+WRITERS: dict[str, Callable[[TextIO, BeaconCodec, Iterable[list[list[object]]]], None]] = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
+
+
+def decode_capture(  # noqa: PLR0913
+    codec: BeaconCodec,
+    capture: BinaryIO,
+    out: TextIO,
+    *,
+    framing: str = "kiss",
+    output_format: str = "csv",
+    batch_size: int = 1000,
+) -> Stats:
+    """Decode a capture of beacon frames, writing the valid ones to out.
+
+    Parameters
+    ----------
+    codec
+        The codec of the mission the capture is from.
+    capture
+        The capture, read until EOF.
+    out
+        Where the decoded frames are written.
+    framing
+        'kiss' or 'raw', see kiss_frames() and raw_frames().
+    output_format
+        'csv' or 'jsonl'.
+    batch_size
+        Decoded frames written at a time.
+
+    Returns
+    -------
+    Stats
+        Counts of the frames read and dropped.
+    """
+    stats = Stats()
+    chunks = read_chunks(capture)
+    frames = kiss_frames(chunks) if framing == "kiss" else raw_frames(chunks, codec.size)
+    checked = check_crcs(check_headers(codec, frames, stats), stats)
+    rows = decode_frames(codec, checked)
+    WRITERS[output_format](out, codec, batched(rows, batch_size))
+    return stats
+
+
+def beacon_decode(args: Namespace) -> None:
+    """Beacon_decode main."""
+    codec = OreSatConfig(args.oresat).beacon_codec
+
+    with ExitStack() as stack:
+        capture: BinaryIO = sys.stdin.buffer
+        if args.capture != "-":
+            capture = stack.enter_context(Path(args.capture).open("rb"))
+        out: TextIO = sys.stdout
+        if args.output != "-":
+            out = stack.enter_context(Path(args.output).open("w", newline=""))
+        stats = decode_capture(
+            codec,
+            capture,
+            out,
+            framing=args.framing,
+            output_format=args.format,
+            batch_size=args.batch_size,
+        )
+
+    print(
+        f"{stats.decoded} of {stats.frames} frames decoded, dropped {stats.bad_length} with the"
+        f" wrong length, {stats.bad_header} with another AX.25 header and {stats.bad_crc} with a"
+        " bad CRC",
+        file=sys.stderr,
+    )
@@ -0,0 +1,551 @@
+"""Decode a SocketCAN candump log to CSV or JSONL.
+
+Every TPDO, EMCY, heartbeat and SYNC of the mission's cards is decoded, see CanDecoder. The log is
+read in chunks, each parsed, decoded, formatted and sorted by timestamp, and the chunks are merged
+into timestamp order as they come, so memory use doesn't depend on the size of the log. With
+--jobs, the chunks are decoded in parallel and the output is the same.
+
+Two log formats are supported:
+
+- ascii, the log format of `candump -l` (or `candump -L`): `(1712345678.123456) can0 181#0102`.
+- binary, back to back 16 byte Linux `struct can_frame` records, as read from a raw CAN socket.
+  These have no timestamps or interface names.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import struct
+import sys
+from argparse import Namespace, _SubParsersAction
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, fields
+from functools import cache, partial
+from heapq import merge
+from multiprocessing import get_context
+from operator import itemgetter
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from .. import Mission, OreSatConfig
+from ..can_decoder import CanDecoder
+from .beacon_decode import batched
+
+CHUNK_SIZE = 1 << 22
+"""Approximate size of the chunks a log is decoded and sorted in, in bytes."""
+
+CAN_FRAME = struct.Struct("<IB3x8s")
+"""Linux struct can_frame: CAN ID and flags, DLC, padding and data."""
+CAN_ID_FLAGS = 0xE000_0000
+"""EFF, RTR and ERR flags of a struct can_frame's CAN ID."""
+
+Frame = tuple[str, str, int, bytes]
+"""A frame from the log: timestamp (a JSON number, or empty if unknown), interface, CAN ID and
+data."""
+Row = tuple[str, str, int, str, str, dict[str, object]]
+"""A decoded frame: timestamp, interface, COB-ID, card, message name and signals."""
+Line = tuple[float, str]
+"""A formatted decoded frame and the key it's sorted by."""
+
+
+def build_arguments(subparsers: _SubParsersAction) -> None:
+    """Build command line arguments for this script.
+
+    This function will be invoked by scripts.main to configure command line arguments for this
+    subcommand. Use subparsers.add_parser() to get an ArgumentParser. The parser must have the
+    default argument func which is the entry point for this subcommand: parser.set_defaults(func=?)
+
+    Parameters
+    ----------
+    subparsers
+        The output of ArgumentParser.add_subparsers() from the primary ArgumentParser. This function
+        should call add_parser() on this parameter to get the ArgumentParser that is used to
+        configure arguments for this subcommand.
+        See https://docs.python.org/3/library/argparse.html#sub-commands, especially the end of
+        that section, for more.
+    """
+    desc = "decode the PDOs, EMCYs and heartbeats of a candump log to CSV or JSONL"
+    parser = subparsers.add_parser("candump-decode", description=desc, help=desc)
+    parser.set_defaults(func=candump_decode)
+
+    parser.add_argument(
+        "--oresat",
+        default=Mission.default().arg,
+        choices=[m.arg for m in Mission],
+        type=lambda x: x.lower().removeprefix("oresat"),
+        help="Oresat Mission. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "log",
+        nargs="?",
+        default="-",
+        help="candump log to decode, - for stdin. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["ascii", "binary"],
+        default="ascii",
+        help="ascii for candump -l logs, binary for struct can_frame records."
+        " (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "jsonl"],
+        default="csv",
+        help="output format. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="output file, - for stdout. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="decoded frames written at a time. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, more than 1 decodes chunks of the log in parallel and"
+        " needs a log file. (Default: %(default)s)",
+    )
+
+
+@dataclass
+class Stats:
+    """Counts of the frames seen by the pipeline."""
+
+    frames: int = 0
+    bad_lines: int = 0
+    """Lines of an ascii log that couldn't be parsed."""
+    other: int = 0
+    """Extended, remote and error frames, which OreSat cards don't send."""
+    unknown: int = 0
+    """Frames with a COB-ID that isn't one of the mission's."""
+    bad_length: int = 0
+    bad_data: int = 0
+    """Frames of the right length whose data couldn't be decoded, e.g. non-ASCII strings."""
+
+    @property
+    def decoded(self) -> int:
+        """Frames that were decoded."""
+        return (
+            self.frames
+            - self.bad_lines
+            - self.other
+            - self.unknown
+            - self.bad_length
+            - self.bad_data
+        )
+
+    def add(self, other: "Stats") -> None:
+        """Add the counts of other to these."""
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+def ascii_frames(lines: Iterable[str], stats: Stats) -> Iterator[Frame]:
+    """Parse the lines of a candump -l log.
+
+    CAN FD frames are decoded like classic ones, the FD flags are ignored.
+    """
+    for line in lines:
+        stats.frames += 1
+        try:
+            stamp, interface, frame = line.split()
+            can_id, data = frame.split("#", 1)
+            seconds = float(stamp[1:-1])
+            if stamp[0] != "(" or stamp[-1] != ")" or not 0 <= seconds < math.inf:
+                stats.bad_lines += 1
+                continue
+            # Written to JSONL as is, so normalised to a JSON number: candump zero pads the
+            # seconds, which boards without an RTC count from the epoch
+            timestamp = repr(seconds)
+            # Extended IDs have 8 digits and remote frames R instead of data
+            if len(can_id) != 3 or data[:1] == "R":
+                stats.other += 1
+                continue
+            if data[:1] == "#":
+                data = data[2:]
+            yield timestamp, interface, int(can_id, 16), bytes.fromhex(data)
+        except ValueError:
+            stats.bad_lines += 1
+
+
+def binary_frames(chunks: Iterable[bytes], stats: Stats) -> Iterator[Frame]:
+    """Parse back to back struct can_frame records. A trailing partial record is dropped."""
+    size = CAN_FRAME.size
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        end = len(data) - len(data) % size
+        for can_id, dlc, payload in CAN_FRAME.iter_unpack(memoryview(data)[:end]):
+            stats.frames += 1
+            if can_id & CAN_ID_FLAGS:
+                stats.other += 1
+                continue
+            yield "", "", can_id, payload[: min(dlc, 8)]
+        pending = data[end:]
+    if pending:
+        stats.frames += 1
+        stats.bad_lines += 1
+
+
+def decode_frames(decoder: CanDecoder, frames: Iterable[Frame], stats: Stats) -> Iterator[Row]:
+    """Decode frames, dropping the unknown, too short and undecodable ones."""
+    routes = decoder.routes
+    for stamp, interface, can_id, data in frames:
+        route = routes.get(can_id)
+        if route is None:
+            stats.unknown += 1
+            continue
+        card, message, decode = route
+        try:
+            values = decode(data)
+        except UnicodeDecodeError:
+            # A ValueError too, but the frame was long enough
+            stats.bad_data += 1
+            continue
+        except ValueError:
+            stats.bad_length += 1
+            continue
+        yield stamp, interface, can_id, card, message, values
+
+
+def format_csv(rows: Iterable[Row]) -> Iterator[str]:
+    """Format rows as CSV, one line per signal and a string per row. The header is in HEADERS."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for stamp, interface, cob_id, card, message, values in rows:
+        head = (stamp, interface, f"{cob_id:03X}", card, message)
+        if values:
+            writer.writerows((*head, name, value) for name, value in values.items())
+        else:
+            writer.writerow((*head, "", ""))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def dumps_values(values: dict[str, object]) -> str:
+    """Dump decoded signals as a JSON object, with NaN and infinite floats as null.
+
+    JSON has no NaN or Infinity, and json.dumps() writes them as bare words by default, which other
+    JSON parsers reject.
+    """
+    try:
+        return json.dumps(values, allow_nan=False)
+    except ValueError:
+        return json.dumps(
+            {
+                name: None if isinstance(value, float) and not math.isfinite(value) else value
+                for name, value in values.items()
+            }
+        )
+
+
+def format_jsonl(rows: Iterable[Row]) -> Iterator[str]:
+    """Format rows as JSON lines, one object and a string per row."""
+    # There are only a few interfaces and cards, so only quote each once
+    quote = cache(json.dumps)
+    template = '{"timestamp":%s,"interface":%s,"cob_id":%d,"card":%s,"message":"%s","values":%s}\n'
+    for stamp, interface, cob_id, card, message, values in rows:
+        yield template % (
+            stamp or "null",
+            quote(interface),
+            cob_id,
+            quote(card),
+            message,
+            dumps_values(values),
+        )
+
+
+FORMATTERS: dict[str, Callable[[Iterable[Row]], Iterator[str]]] = {
+    "csv": format_csv,
+    "jsonl": format_jsonl,
+}
+
+HEADERS = {
+    "csv": "timestamp,interface,cob_id,card,message,signal,value\r\n",
+    "jsonl": "",
+}
+"""What's written before the rows, for each output format."""
+
+
+def log_chunks(log: BinaryIO, chunk_size: int, log_format: str = "ascii") -> Iterator[bytes]:
+    """Read a log in the same chunks chunk_ranges() splits a log file into."""
+    if log_format != "ascii":
+        chunk_size = max(chunk_size - chunk_size % CAN_FRAME.size, CAN_FRAME.size)
+        yield from iter(partial(log.read, chunk_size), b"")
+        return
+    while data := log.read(chunk_size):
+        yield data + log.readline()
+
+
+def chunk_ranges(path: Path, chunk_size: int, log_format: str = "ascii") -> list[tuple[int, int]]:
+    """Split a log into (start, end) byte ranges of about chunk_size bytes.
+
+    Ranges of an ascii log end at the end of a line, ranges of a binary log at the end of a
+    struct can_frame record.
+    """
+    size = path.stat().st_size
+    if log_format != "ascii":
+        chunk_size = max(chunk_size - chunk_size % CAN_FRAME.size, CAN_FRAME.size)
+        return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    ranges = []
+    start = 0
+    with path.open("rb") as f:
+        while start < size:
+            f.seek(start + chunk_size)
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def decode_chunk_data(
+    decoder: CanDecoder, data: bytes, start: int, *, log_format: str, output_format: str
+) -> tuple[list[Line], Stats]:
+    """Decode and format a chunk of a log, starting start bytes into it, sorted by timestamp.
+
+    Frames of binary logs have no timestamp and are keyed by their position in the log instead,
+    start plus their index in the chunk, so they keep their order.
+    """
+    stats = Stats()
+    if log_format == "ascii":
+        lines = (line.decode("ascii", "replace") for line in data.splitlines())
+        rows = sorted(
+            decode_frames(decoder, ascii_frames(lines, stats), stats), key=lambda r: float(r[0])
+        )
+        keys: Iterable[float] = (float(row[0]) for row in rows)
+    else:
+        rows = list(decode_frames(decoder, binary_frames([data], stats), stats))
+        keys = range(start, start + len(rows))
+    return list(zip(keys, FORMATTERS[output_format](rows), strict=True)), stats
+
+
+def merge_chunks(chunks: Iterable[list[Line]]) -> Iterator[str]:
+    """Merge the sorted lines of consecutive chunks of a log into timestamp order.
+
+    Once a chunk arrives, the lines held back from earlier chunks that are older than its first
+    frame are written and the rest are merged with it and held back in turn. So only about a chunk
+    of lines is held in memory, and the output is in timestamp order as long as no frame is older
+    than the oldest frame of an earlier chunk.
+    """
+    held: list[Line] = []
+    for lines in chunks:
+        if not lines:
+            continue
+        oldest = lines[0][0]
+        split = bisect_left(held, oldest, key=itemgetter(0))
+        yield from (text for _, text in held[:split])
+        held = list(merge(held[split:], lines, key=itemgetter(0)))
+    yield from (text for _, text in held)
+
+
+def _write_lines(out: TextIO, lines: Iterable[str], batch_size: int) -> None:
+    for batch in batched(lines, batch_size):
+        out.writelines(batch)
+
+
+def decode_log(  # noqa: PLR0913
+    decoder: CanDecoder,
+    log: BinaryIO,
+    out: TextIO,
+    *,
+    log_format: str = "ascii",
+    output_format: str = "csv",
+    batch_size: int = 1000,
+    chunk_size: int = CHUNK_SIZE,
+) -> Stats:
+    """Decode a candump log, writing the decoded frames to out in timestamp order.
+
+    The log is decoded in chunks, each sorted by timestamp and merged with merge_chunks(), exactly
+    like decode_log_parallel() does, so both give the same output.
+
+    Parameters
+    ----------
+    decoder
+        The decoder of the mission the log is from.
+    log
+        The log, read until EOF.
+    out
+        Where the decoded frames are written.
+    log_format
+        'ascii' or 'binary', see ascii_frames() and binary_frames().
+    output_format
+        'csv' or 'jsonl'.
+    batch_size
+        Decoded frames written at a time.
+    chunk_size
+        Approximate size of the chunks, in bytes.
+
+    Returns
+    -------
+    Stats
+        Counts of the frames read and dropped.
+    """
+    stats = Stats()
+
+    def decoded() -> Iterator[list[Line]]:
+        start = 0
+        for data in log_chunks(log, chunk_size, log_format):
+            lines, chunk_stats = decode_chunk_data(
+                decoder, data, start, log_format=log_format, output_format=output_format
+            )
+            stats.add(chunk_stats)
+            start += len(data)
+            yield lines
+
+    out.write(HEADERS[output_format])
+    _write_lines(out, merge_chunks(decoded()), batch_size)
+    return stats
+
+
+def decode_chunk(
+    mission: Mission, path: Path, span: tuple[int, int], *, log_format: str, output_format: str
+) -> tuple[list[Line], Stats]:
+    """Decode and format a (start, end) range of a log file, see decode_chunk_data()."""
+    start, end = span
+    with path.open("rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    decoder = OreSatConfig.get(mission).can_decoder
+    return decode_chunk_data(
+        decoder, data, start, log_format=log_format, output_format=output_format
+    )
+
+
+def decode_log_parallel(  # noqa: PLR0913
+    mission: Mission,
+    path: Path,
+    out: TextIO,
+    *,
+    log_format: str = "ascii",
+    output_format: str = "csv",
+    jobs: int = os.cpu_count() or 1,
+    chunk_size: int = CHUNK_SIZE,
+    batch_size: int = 1000,
+) -> Stats:
+    """Decode a candump log file with a pool of worker processes, writing the frames to out.
+
+    The log is split into chunks, see chunk_ranges(), which are decoded, sorted and formatted by the
+    workers, then merged into timestamp order with merge_chunks(). The output is the same as
+    decode_log()'s.
+
+    The mission is loaded once with OreSatConfig.get() before the workers are forked, so they share
+    it and its decoder instead of loading the configs again.
+
+    Parameters
+    ----------
+    mission
+        The mission the log is from.
+    path
+        The log file.
+    out
+        Where the decoded frames are written.
+    log_format
+        'ascii' or 'binary', see ascii_frames() and binary_frames().
+    output_format
+        'csv' or 'jsonl'.
+    jobs
+        Number of worker processes.
+    chunk_size
+        Approximate size of the chunks, in bytes.
+    batch_size
+        Decoded frames written at a time.
+
+    Returns
+    -------
+    Stats
+        Counts of the frames read and dropped.
+    """
+    _ = OreSatConfig.get(mission).can_decoder
+    ranges = chunk_ranges(path, chunk_size, log_format)
+    stats = Stats()
+
+    def decoded(pool: ProcessPoolExecutor) -> Iterator[list[Line]]:
+        # Bound the chunks in flight so memory use doesn't depend on the size of the log
+        pending: deque[Future[tuple[list[Line], Stats]]] = deque()
+        for span in ranges:
+            pending.append(
+                pool.submit(
+                    decode_chunk,
+                    mission,
+                    path,
+                    span,
+                    log_format=log_format,
+                    output_format=output_format,
+                )
+            )
+            if len(pending) >= 2 * jobs:
+                yield _chunk_lines(pending.popleft(), stats)
+        while pending:
+            yield _chunk_lines(pending.popleft(), stats)
+
+    out.write(HEADERS[output_format])
+    # fork so the workers inherit the loaded configs. Only Linux is supported anyway.
+    with ProcessPoolExecutor(jobs, mp_context=get_context("fork")) as pool:
+        _write_lines(out, merge_chunks(decoded(pool)), batch_size)
+    return stats
+
+
+def _chunk_lines(future: Future[tuple[list[Line], Stats]], stats: Stats) -> list[Line]:
+    lines, chunk_stats = future.result()
+    stats.add(chunk_stats)
+    return lines
+
+
+def candump_decode(args: Namespace) -> None:
+    """Candump_decode main."""
+    if args.jobs > 1 and args.log == "-":
+        raise SystemExit("--jobs needs a log file, stdin can't be split into chunks")
+    mission = Mission.from_string(args.oresat)
+
+    with ExitStack() as stack:
+        out: TextIO = sys.stdout
+        if args.output != "-":
+            out = stack.enter_context(Path(args.output).open("w", newline=""))
+        if args.jobs > 1:
+            stats = decode_log_parallel(
+                mission,
+                Path(args.log),
+                out,
+                log_format=args.log_format,
+                output_format=args.format,
+                jobs=args.jobs,
+                batch_size=args.batch_size,
+            )
+        else:
+            log: BinaryIO = sys.stdin.buffer
+            if args.log != "-":
+                log = stack.enter_context(Path(args.log).open("rb"))
+            stats = decode_log(
+                OreSatConfig.get(mission).can_decoder,
+                log,
+                out,
+                log_format=args.log_format,
+                output_format=args.format,
+                batch_size=args.batch_size,
+            )
+
+    print(
+        f"{stats.decoded} of {stats.frames} frames decoded, dropped {stats.bad_lines} unparsable,"
+        f" {stats.other} extended/remote/error, {stats.unknown} with an unknown COB-ID,"
+        f" {stats.bad_length} too short and {stats.bad_data} with undecodable data",
+        file=sys.stderr,
+    )
@@ -0,0 +1,199 @@
+"""Generate every artifact for every mission in one go."""
+
+import hashlib
+import json
+import os
+from argparse import Namespace, _SubParsersAction
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+from .. import Mission, OreSatConfig, __version__
+from . import gen_dbc, gen_dcf, gen_eds, gen_fw_files, gen_kaitai, gen_xtce
+
+ARTIFACTS = ("dcf", "eds", "fw-files", "dbc", "xtce", "kaitai")
+"""Every kind of artifact gen-all can produce, named after the subcommand that makes it."""
+
+MANIFEST_NAME = "manifest.json"
+
+Job = tuple[Mission, str, str | None]
+"""A (mission, artifact, card) to generate."""
+
+
+def build_arguments(subparsers: _SubParsersAction) -> None:
+    """Build command line arguments for this script.
+
+    This function will be invoked by scripts.main to configure command line arguments for this
+    subcommand. Use subparsers.add_parser() to get an ArgumentParser. The parser must have the
+    default argument func which is the entry point for this subcommand: parser.set_defaults(func=?)
+
+    Parameters
+    ----------
+    subparsers
+        The output of ArgumentParser.add_subparsers() from the primary ArgumentParser. This function
+        should call add_parser() on this parameter to get the ArgumentParser that is used to
+        configure arguments for this subcommand.
+        See https://docs.python.org/3/library/argparse.html#sub-commands, especially the end of
+        that section, for more.
+    """
+    desc = "generate all dcf, eds, fw-files, dbc, xtce and kaitai outputs for OreSat mission(s)"
+    parser = subparsers.add_parser("gen-all", description=desc, help=desc)
+    parser.set_defaults(func=gen_all)
+
+    parser.add_argument(
+        "--oresat",
+        choices=[m.arg for m in Mission],
+        type=lambda x: x.lower().removeprefix("oresat"),
+        help="Oresat Mission. (Default: all missions)",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=ARTIFACTS,
+        help="only generate this kind of artifact, may be given multiple times (Default: all)",
+    )
+    parser.add_argument(
+        "-d",
+        "--dir-path",
+        default=".",
+        type=Path,
+        help="Output directory path, gets a subdirectory per mission. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes, 1 generates everything in this process."
+        " (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate every artifact, even those already up to date with the configs",
+    )
+
+
+def generate(
+    mission: Mission, artifact: str, card: str | None, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Generate a single artifact into dir_path, unless it's already up to date.
+
+    Parameters
+    ----------
+    mission
+        The mission to generate for, loaded with OreSatConfig.get().
+    artifact
+        One of ARTIFACTS.
+    card
+        The card to generate for, or None for the per mission artifacts (dbc, xtce and kaitai).
+        For fw-files 'base' is the firmware base OD.
+    dir_path
+        The mission's output directory.
+    force
+        Generate even if the artifact is up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The artifact's files and whether they were regenerated.
+    """
+    config = OreSatConfig.get(mission)
+
+    if artifact == "dcf":
+        assert card is not None
+        return gen_dcf.write_dcf(config.od_db[card], dir_path, force=force)
+    if artifact == "eds":
+        assert card is not None
+        return gen_eds.write_eds(config.od_db[card], dir_path, force=force)
+    if artifact == "fw-files":
+        assert card is not None
+        od = config.fw_base_od if card == "base" else config.od_db[card]
+        return gen_fw_files.write_canopennode(od, dir_path / card, force=force)
+    if artifact == "dbc":
+        return gen_dbc.write_dbc(config, dir_path, force=force)
+    if artifact == "xtce":
+        return gen_xtce.write_xtce(config, dir_path, force=force)
+    if artifact == "kaitai":
+        return gen_kaitai.write_kaitai(config, dir_path, force=force)
+    raise ValueError(f"unknown artifact {artifact}")
+
+
+def _jobs(config: OreSatConfig, artifacts: list[str]) -> list[tuple[str, str | None]]:
+    """List the (artifact, card) pairs to generate for a mission."""
+    jobs: list[tuple[str, str | None]] = []
+    for artifact in artifacts:
+        if artifact in ("dcf", "eds"):
+            jobs.extend((artifact, card) for card in config.od_db)
+        elif artifact == "fw-files":
+            jobs.extend((artifact, card) for card in ["base", *config.od_db])
+        else:
+            jobs.append((artifact, None))
+    return jobs
+
+
+def _file_entry(path: Path, root: Path, job: Job, *, regenerated: bool) -> dict[str, object]:
+    mission, artifact, card = job
+    return {
+        "path": path.relative_to(root).as_posix(),
+        "mission": mission.filename(),
+        "artifact": artifact,
+        "card": card,
+        "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+        "regenerated": regenerated,
+    }
+
+
+def gen_all(args: Namespace) -> None:
+    """Gen_all main.
+
+    Each mission is loaded once, in this process, before the workers are forked so they all share
+    it instead of loading it again.
+    """
+    missions = list(Mission) if args.oresat is None else [Mission.from_string(args.oresat)]
+    artifacts = [a for a in ARTIFACTS if args.only is None or a in args.only]
+
+    jobs: list[Job] = []
+    for mission in missions:
+        config = OreSatConfig.get(mission)
+        # Build everything lazy now, otherwise each worker would build its own copy
+        dict(config.od_db)
+        _ = config.beacon_def, config.fram_def, config.fw_base_od
+        (args.dir_path / mission.filename()).mkdir(parents=True, exist_ok=True)
+        jobs.extend((mission, artifact, card) for artifact, card in _jobs(config, artifacts))
+
+    entries: list[dict[str, object]] = []
+    if args.jobs <= 1:
+        for job in jobs:
+            paths, regenerated = generate(*job, args.dir_path / job[0].filename(), force=args.force)
+            entries.extend(
+                _file_entry(p, args.dir_path, job, regenerated=regenerated) for p in paths
+            )
+    else:
+        # fork so the workers inherit the loaded configs. Only Linux is supported anyway.
+        with ProcessPoolExecutor(args.jobs, mp_context=get_context("fork")) as pool:
+            futures = {
+                pool.submit(
+                    generate, *job, args.dir_path / job[0].filename(), force=args.force
+                ): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                paths, regenerated = future.result()
+                entries.extend(
+                    _file_entry(p, args.dir_path, futures[future], regenerated=regenerated)
+                    for p in paths
+                )
+
+    entries.sort(key=lambda e: str(e["path"]))
+    manifest = {"version": __version__, "files": entries}
+    with (args.dir_path / MANIFEST_NAME).open("w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    changed = [e["path"] for e in entries if e["regenerated"]]
+    for path in changed:
+        print(f"Generated {path}")
+    print(
+        f"{len(changed)} of {len(entries)} files regenerated, the rest were up to date,"
+        f" see {args.dir_path / MANIFEST_NAME}"
+    )
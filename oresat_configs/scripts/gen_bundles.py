@@ -0,0 +1,44 @@
+"""Precompile mission configs into the bundles shipped with the package."""
+
+from argparse import Namespace, _SubParsersAction
+
+from .. import _bundle
+from ..constants import Mission
+
+
+def build_arguments(subparsers: _SubParsersAction) -> None:
+    """Build command line arguments for this script.
+
+    This function will be invoked by scripts.main to configure command line arguments for this
+    subcommand. Use subparsers.add_parser() to get an ArgumentParser. The parser must have the
+    default argument func which is the entry point for this subcommand: parser.set_defaults(func=?)
+
+    Parameters
+    ----------
+    subparsers
+        The output of ArgumentParser.add_subparsers() from the primary ArgumentParser. This function
+        should call add_parser() on this parameter to get the ArgumentParser that is used to
+        configure arguments for this subcommand.
+        See https://docs.python.org/3/library/argparse.html#sub-commands, especially the end of
+        that section, for more.
+    """
+    desc = (
+        "precompile mission configs into the bundles shipped with the package, run from an"
+        " editable install before building"
+    )
+    parser = subparsers.add_parser("bundles", description=desc, help=desc)
+    parser.set_defaults(func=gen_bundles)
+    parser.add_argument(
+        "--oresat",
+        choices=[m.arg for m in Mission],
+        type=lambda x: x.lower().removeprefix("oresat"),
+        help="Oresat Mission. (Default: all missions)",
+    )
+
+
+def gen_bundles(args: Namespace) -> None:
+    """Build the bundles for the selected missions, in place in the package."""
+    missions = list(Mission) if args.oresat is None else [Mission.from_string(args.oresat)]
+    for mission in missions:
+        path = _bundle.build(mission)
+        print(f"{mission}: {path}")
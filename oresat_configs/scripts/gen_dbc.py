@@ -6,57 +6,14 @@ from pathlib import Path
 from canopen.objectdictionary import REAL32, REAL64, UNSIGNED_TYPES, Record, Variable
 
 from .. import Mission, OreSatConfig, __version__
+from ..can_decoder import EMCY_ERROR_CODES, HB_STATES
+from . import _stamps
 
 INDENT3 = " " * 3
 INDENT4 = " " * 4
 
 VECTOR = "Vector__XXX"  # flag for default, any, all devices
 
-HB_STATES = {
-    0x00: "boot_up",
-    0x04: "stopped",
-    0x05: "operational",
-    0x7F: "pre_operational",
-}
-
-EMCY_ERROR_CODES = {
-    0x0000: "no_error",
-    0x1000: "generic_error",
-    0x2000: "current_error",
-    0x2100: "current_device_input_error",
-    0x2200: "current_inside_device_error",
-    0x2300: "current_device output_error",
-    0x3000: "voltage_error",
-    0x3100: "mains_voltage_error",
-    0x3200: "voltage_inside_device_error",
-    0x3300: "output_voltage_error",
-    0x4000: "temperature_error",
-    0x4100: "ambient_temperature_error",
-    0x4200: "device_temperature_error",
-    0x5000: "device_hardware_error",
-    0x6000: "device_software_error",
-    0x6100: "internal_software_error",
-    0x6200: "user_software_error",
-    0x6300: "data_set_error",
-    0x7000: "additional_modules_error",
-    0x8000: "monitoring_error",
-    0x8100: "communication_error",
-    0x8110: "can_overrun_error",
-    0x8120: "passive_mode_error",
-    0x8130: "heartbeat_error",
-    0x8140: "recovered_bus_error",
-    0x8150: "can_id_collision_error",
-    0x8200: "protocol_error",
-    0x8210: "pdo_not_processed_due_to_length_error",
-    0x8220: "pdo_length_exceeded_error",
-    0x8230: "mpdo_not_processed_error",
-    0x8240: "sync_data_length_error",
-    0x8250: "rpdo_timeout_error",
-    0x9000: "external_error",
-    0xF000: "additional_function_error",
-    0xFF00: "device_specific_error",
-}
-
 SDO_CSS = {
     0: "download_segment_request",
     1: "initiate_download_request",
@@ -147,6 +104,11 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
     parser.add_argument(
         "-d", "--dir-path", default=".", type=Path, help='Directory path. (Default "%(default)s")'
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 def generate_dbc(config: OreSatConfig) -> list[str]:
@@ -404,7 +366,25 @@ def generate_dbc(config: OreSatConfig) -> list[str]:
 def gen_dbc(args: Namespace) -> None:
     """Gen_dbc main."""
     config = OreSatConfig(args.oresat)
-    dbc = generate_dbc(config)
+    (path,), regenerated = write_dbc(config, args.dir_path, force=args.force)
+    print(f"Generated {path}" if regenerated else f"{path} is up to date")
+
+
+def write_dbc(
+    config: OreSatConfig, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write the dbc file for a mission to dir_path, unless it's already up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The file and whether it was regenerated.
+    """
+    path = (dir_path / config.mission.filename()).with_suffix(".dbc")
+
+    def write() -> None:
+        with path.open("w") as f:
+            f.writelines(line + "\n" for line in generate_dbc(config))
 
-    with (args.dir_path / config.mission.filename()).with_suffix(".dbc").open("w") as f:
-        f.writelines(line + "\n" for line in dbc)
+    new_stamp = _stamps.stamp(__file__, _stamps.config_fingerprint(config))
+    return [path], _stamps.generate_if_changed([path], new_stamp, write, force=force)
@@ -9,6 +9,7 @@ import canopen
 from canopen.objectdictionary import Variable
 
 from .. import Mission, OreSatConfig
+from . import _stamps
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -42,6 +43,11 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
     parser.add_argument(
         "-d", "--dir-path", default=".", type=Path, help='Directory path. (Default "%(default)s")'
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 def generate_dcf(od: canopen.ObjectDictionary) -> tuple[str, list[str]]:
@@ -55,8 +61,7 @@ def generate_dcf(od: canopen.ObjectDictionary) -> tuple[str, list[str]]:
     lines = []
     dev_info = od.device_information
     assert dev_info.product_name is not None
-    file_name = dev_info.product_name + ".dcf"
-    file_name = file_name.lower().replace(" ", "_")
+    file_name = dcf_file_name(od)
     now = datetime.now(UTC)
 
     # file info seciton
@@ -237,6 +242,32 @@ def gen_dcf(args: Namespace) -> None:
         ods = [config.od_db[config.name_from_alias(args.card)]]
 
     for od in ods:
-        name, lines = generate_dcf(od)
-        with (args.dir_path / name).open("w") as f:
+        (path,), regenerated = write_dcf(od, args.dir_path, force=args.force)
+        print(f"Generated {path}" if regenerated else f"{path} is up to date")
+
+
+def dcf_file_name(od: canopen.ObjectDictionary) -> str:
+    """Get the name of the DCF file for an OD."""
+    assert od.device_information.product_name is not None
+    return (od.device_information.product_name + ".dcf").lower().replace(" ", "_")
+
+
+def write_dcf(
+    od: canopen.ObjectDictionary, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write the DCF file for an OD to dir_path, unless it's already up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The file and whether it was regenerated.
+    """
+    path = dir_path / dcf_file_name(od)
+
+    def write() -> None:
+        _, lines = generate_dcf(od)
+        with path.open("w") as f:
             f.writelines(line + "\n" for line in lines)
+
+    new_stamp = _stamps.stamp(__file__, _stamps.od_fingerprint(od))
+    return [path], _stamps.generate_if_changed([path], new_stamp, write, force=force)
@@ -1,6 +1,7 @@
 """Generates an EDS of the OreSat OD suitable for consumption by EDSEditor."""
 
 from argparse import Namespace, _SubParsersAction
+from copy import deepcopy
 from pathlib import Path
 
 from canopen import ObjectDictionary, export_od
@@ -9,6 +10,7 @@ from canopen.objectdictionary.datatypes import OCTET_STRING, UNSIGNED8, UNSIGNED
 
 from .. import Mission, OreSatConfig
 from ..card_config import Rpdo
+from . import _stamps
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -42,27 +44,51 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
     parser.add_argument(
         "-d", "--dir-path", default=".", type=Path, help='Directory path. (Default "%(default)s")'
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 def gen_eds(args: Namespace) -> None:
     """Gen_eds main."""
     config = OreSatConfig(args.oresat)
 
-    def write_eds(od: ObjectDictionary) -> None:
-        if od.device_information.product_name is None:
-            raise SystemExit("OD incomplete (missing product name)")
-        fixup_od(od)
-        file = od.device_information.product_name + ".eds"
-        file = file.lower().replace(" ", "_")
-        path = args.dir_path / file
-        print(f"Writing od to {path}")
-        export_od(od, str(path))
-
     if args.card.lower() == "all":
-        for od in config.od_db.values():
-            write_eds(od)
+        ods = list(config.od_db.values())
     else:
-        write_eds(config.od_db[config.name_from_alias(args.card)])
+        ods = [config.od_db[config.name_from_alias(args.card)]]
+
+    for od in ods:
+        (path,), regenerated = write_eds(od, args.dir_path, force=args.force)
+        print(f"Writing od to {path}" if regenerated else f"{path} is up to date")
+
+
+def write_eds(
+    od: ObjectDictionary, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write the EDS file for an OD to dir_path, unless it's already up to date.
+
+    The OD itself isn't modified, fixup_od() is applied to a copy.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The file and whether it was regenerated.
+    """
+    if od.device_information.product_name is None:
+        raise SystemExit("OD incomplete (missing product name)")
+    file = od.device_information.product_name + ".eds"
+    path = dir_path / file.lower().replace(" ", "_")
+
+    def write() -> None:
+        fixed = deepcopy(od)
+        fixup_od(fixed)
+        export_od(fixed, str(path))
+
+    new_stamp = _stamps.stamp(__file__, _stamps.od_fingerprint(od))
+    return [path], _stamps.generate_if_changed([path], new_stamp, write, force=force)
 
 
 def fixup_od(od: ObjectDictionary) -> None:
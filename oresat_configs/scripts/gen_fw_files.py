@@ -2,6 +2,7 @@
 
 from argparse import Namespace, _SubParsersAction
 from collections.abc import Iterable
+from copy import deepcopy
 from itertools import chain, islice
 from pathlib import Path
 from typing import cast
@@ -11,6 +12,7 @@ from canopen.objectdictionary import ODArray, ODRecord, ODVariable
 from canopen.objectdictionary.datatypes import DOMAIN, OCTET_STRING, UNICODE_STRING, VISIBLE_STRING
 
 from .. import Mission, OreSatConfig
+from . import _stamps
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -57,6 +59,11 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
         "--firmware-version",
         help="firmware version string, usually git describe output",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 def indent(*lines: Iterable[str] | Iterable[Iterable[str]]) -> list[str]:
@@ -118,11 +125,16 @@ DATA_TYPE_C_SIZE = {
 def generate_canopennode(od: canopen.ObjectDictionary) -> tuple[list[str], list[str]]:
     """Create the text of CANopenNode OD.[c/h] files from the od.
 
+    The node id is removed from the EMCY and PDO COB-IDs of a copy of the od, the od itself isn't
+    modified.
+
     Parameters
     ----------
     od:
         OD data structure to save as file
     """
+    od = deepcopy(od)
+
     # remove node id from emcy cob id
     if 0x1014 in od:
         emcy = od[0x1014]
@@ -605,10 +617,29 @@ def gen_fw_files(args: Namespace) -> None:
     if args.firmware_version is not None:
         versions["fw_version"].default = args.firmware_version
 
-    odc, odh = generate_canopennode(od)
+    paths, regenerated = write_canopennode(od, args.dir_path, force=args.force)
+    for path in paths:
+        print(f"Generated {path}" if regenerated else f"{path} is up to date")
+
+
+def write_canopennode(
+    od: canopen.ObjectDictionary, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write OD.c and OD.h to dir_path, unless they're already up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The files and whether they were regenerated.
+    """
+    paths = [dir_path / "OD.c", dir_path / "OD.h"]
+
+    def write() -> None:
+        odc, odh = generate_canopennode(od)
+        dir_path.mkdir(parents=True, exist_ok=True)
+        for path, lines in zip(paths, (odc, odh), strict=True):
+            with path.open("w") as f:
+                f.writelines(line + "\n" for line in lines)
 
-    args.dir_path.mkdir(parents=True, exist_ok=True)
-    with (args.dir_path / "OD.c").open("w") as f:
-        f.writelines(line + "\n" for line in odc)
-    with (args.dir_path / "OD.h").open("w") as f:
-        f.writelines(line + "\n" for line in odh)
+    new_stamp = _stamps.stamp(__file__, _stamps.od_fingerprint(od))
+    return paths, _stamps.generate_if_changed(paths, new_stamp, write, force=force)
@@ -9,6 +9,7 @@ from canopen.objectdictionary import Array, Record
 from yaml import dump
 
 from .. import Mission, OreSatConfig
+from . import _stamps
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -45,6 +46,11 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
         type=Path,
         help="Output directory path. (Default: %(default)s)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 CANOPEN_TO_KAITAI_DT = {
@@ -239,8 +245,25 @@ def generate_kaitai(config: OreSatConfig) -> dict[str, Any]:
 def gen_kaitai(args: Namespace) -> None:
     """Gen_kaitai main."""
     config = OreSatConfig(args.oresat)
-    kaitai_data = generate_kaitai(config)
+    (path,), regenerated = write_kaitai(config, args.dir_path, force=args.force)
+    print(f"Generated {path}" if regenerated else f"{path} is up to date")
+
+
+def write_kaitai(
+    config: OreSatConfig, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write the ksy file for a mission to dir_path, unless it's already up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The file and whether it was regenerated.
+    """
+    path = (dir_path / config.mission.filename()).with_suffix(".ksy")
+
+    def write() -> None:
+        with path.open("w") as file:
+            dump(generate_kaitai(config), file)
 
-    # Write kaitai to output file
-    with (args.dir_path / config.mission.filename()).with_suffix(".ksy").open("w") as file:
-        dump(kaitai_data, file)
+    new_stamp = _stamps.stamp(__file__, _stamps.config_fingerprint(config))
+    return [path], _stamps.generate_if_changed([path], new_stamp, write, force=force)
@@ -9,6 +9,7 @@ from typing import cast
 import canopen
 
 from .. import Mission, OreSatConfig
+from . import _stamps
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -45,6 +46,11 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
         type=Path,
         help="Output directory path. (Default: %(default)s)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate even if the output is already up to date with the configs",
+    )
 
 
 CANOPEN_TO_XTCE_DT = {
@@ -404,9 +410,24 @@ def generate_xtce(config: OreSatConfig) -> ET.ElementTree:
 def gen_xtce(args: Namespace) -> None:
     """Gen_dcf main."""
     config = OreSatConfig(args.oresat)
-    tree = generate_xtce(config)
-    tree.write(
-        (args.dir_path / config.mission.filename()).with_suffix(".xtce"),
-        encoding="utf-8",
-        xml_declaration=True,
-    )
+    (path,), regenerated = write_xtce(config, args.dir_path, force=args.force)
+    print(f"Generated {path}" if regenerated else f"{path} is up to date")
+
+
+def write_xtce(
+    config: OreSatConfig, dir_path: Path, *, force: bool = False
+) -> tuple[list[Path], bool]:
+    """Write the xtce file for a mission to dir_path, unless it's already up to date.
+
+    Returns
+    -------
+    tuple[list[Path], bool]
+        The file and whether it was regenerated.
+    """
+    path = (dir_path / config.mission.filename()).with_suffix(".xtce")
+
+    def write() -> None:
+        generate_xtce(config).write(path, encoding="utf-8", xml_declaration=True)
+
+    new_stamp = _stamps.stamp(__file__, _stamps.config_fingerprint(config))
+    return [path], _stamps.generate_if_changed([path], new_stamp, write, force=force)
@@ -13,26 +13,19 @@ Process for adding a new script:
   function build_arguments() which takes the output of
   ArgumentParser.add_subparsers(). See the existing scripts for examples and
   further instructions.
-- Import the module here and add it to the _SCRIPTS list.
+- Add a Script for it to the SCRIPTS list here. Only the module of the
+  selected subcommand is imported, so the subcommand name and help must be
+  repeated here; keep them in sync with the module's build_arguments().
 - Test the new script out with oresat-configs <name> and be sure to add it to
   the github CI workflow.
 """
 
 import argparse
+import sys
+from dataclasses import dataclass
+from importlib import import_module
 
 from ..constants import __version__
-from . import (
-    gen_dbc,
-    gen_dcf,
-    gen_eds,
-    gen_fw_files,
-    gen_kaitai,
-    gen_xtce,
-    list_cards,
-    pdo,
-    print_od,
-    sdo_transfer,
-)
 
 # TODO: Group by three categories in help:
 #   - info (card, od)
@@ -43,32 +36,79 @@ from . import (
 # make subparser groups. Perhaps the packages click or pydantic-settings would
 # be better?
 
-_SCRIPTS = [
-    list_cards,
-    print_od,
-    sdo_transfer,
-    pdo,
-    gen_dcf,
-    gen_eds,
-    gen_kaitai,
-    gen_xtce,
-    gen_fw_files,
-    gen_dbc,
+
+@dataclass(frozen=True)
+class Script:
+    """A subcommand, and the module in scripts/ that implements it."""
+
+    name: str
+    module: str
+    help: str
+
+
+SCRIPTS = [
+    Script("cards", "list_cards", "list oresat cards, suitable as arguments to other commands"),
+    Script("od", "print_od", "print the object dictionary out to stdout"),
+    Script(
+        "sdo", "sdo_transfer", "read or write value to a node's object dictionary via SDO transfers"
+    ),
+    Script("pdo", "pdo", "list or receive PDOs from the specified card, or every card"),
+    Script("beacon-decode", "beacon_decode", "decode a capture of beacon frames to CSV or JSONL"),
+    Script(
+        "candump-decode",
+        "candump_decode",
+        "decode the PDOs, EMCYs and heartbeats of a candump log to CSV or JSONL",
+    ),
+    Script("dcf", "gen_dcf", "generate DCF file for OreSat node(s)"),
+    Script("eds", "gen_eds", "generate EDS file for OreSat node(s)"),
+    Script("kaitai", "gen_kaitai", "generate beacon kaitai configuration"),
+    Script("xtce", "gen_xtce", "generate beacon xtce file"),
+    Script(
+        "fw-files",
+        "gen_fw_files",
+        "generate CANopenNode OD.[c/h] files for an OreSat firmware card",
+    ),
+    Script("dbc", "gen_dbc", "generate dbc file for SavvyCAN"),
+    Script(
+        "gen-all",
+        "gen_all",
+        "generate all dcf, eds, fw-files, dbc, xtce and kaitai outputs for OreSat mission(s)",
+    ),
+    Script(
+        "bundles",
+        "gen_bundles",
+        "precompile mission configs into the bundles shipped with the package, run from an"
+        " editable install before building",
+    ),
 ]
 
 
-def oresat_configs() -> None:
-    """Entry point for the top level script.
+def build_parser(argv: list[str]) -> argparse.ArgumentParser:
+    """Build the parser for a command line.
 
-    Used in pyproject.toml, for generating the oresat-configs installed script
+    The scripts import large libraries (canopen, xml, bitstring, ...) so only the module of the
+    subcommand selected by argv is imported, every other subcommand gets a placeholder parser that
+    just shows up in the top level help.
     """
     parser = argparse.ArgumentParser(prog="oresat_configs")
     parser.add_argument("--version", action="version", version="%(prog)s v" + __version__)
     parser.set_defaults(func=lambda _: parser.print_help())
     subparsers = parser.add_subparsers(title="subcommands")
 
-    for subcommand in _SCRIPTS:
-        subcommand.build_arguments(subparsers)
+    # The top level options take no values so the first non-option is the subcommand
+    selected = next((arg for arg in argv if not arg.startswith("-")), None)
+    for script in SCRIPTS:
+        if script.name == selected:
+            import_module(f"{__package__}.{script.module}").build_arguments(subparsers)
+        else:
+            subparsers.add_parser(script.name, help=script.help)
+    return parser
 
-    args = parser.parse_args()
+
+def oresat_configs() -> None:
+    """Entry point for the top level script.
+
+    Used in pyproject.toml, for generating the oresat-configs installed script
+    """
+    args = build_parser(sys.argv[1:]).parse_args()
     args.func(args)
@@ -1,11 +1,17 @@
 """Tools for working with PDOs."""
 
-import time
+import asyncio
 from argparse import Namespace, _SubParsersAction
+from contextlib import suppress
 
+import can
 import canopen
 
 from .. import Mission, OreSatConfig
+from ..can_decoder import CanDecoder
+from ..can_filters import socketcan_filters
+from ..can_listener import CanListener, DecodedFrame
+from ..pdo_codec import PdoTable
 
 
 def build_arguments(subparsers: _SubParsersAction) -> None:
@@ -24,7 +30,7 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
         See https://docs.python.org/3/library/argparse.html#sub-commands, especially the end of
         that section, for more.
     """
-    desc = "list or receive PDOs from the specified card"
+    desc = "list or receive PDOs from the specified card, or every card"
     parser = subparsers.add_parser("pdo", description=desc, help=desc)
     parser.set_defaults(func=pdo_main)
 
@@ -35,7 +41,12 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
         type=lambda x: x.lower().removeprefix("oresat"),
         help="Oresat Mission. (Default: %(default)s)",
     )
-    parser.add_argument("card", help="card name")
+    parser.add_argument("card", nargs="?", help="card name, omit with --all")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="list or receive the PDOs of every card, attributing each to its card",
+    )
     parser.add_argument(
         "--list",
         action="store_true",
@@ -89,36 +100,38 @@ def transmission_type(t: int) -> str:
     raise ValueError(f"Invalid transmission type 0x{t:X}")
 
 
-def print_map(m: canopen.pdo.base.Map) -> None:
-    """Print out a received PDO.
+def format_frame(frame: DecodedFrame) -> str:
+    """Format a decoded frame as a line of text."""
+    values = " ".join(f"{name}: {value}" for name, value in frame.values.items())
+    return f"{frame.cob_id:03X} {frame.card} {frame.message} {values}"
 
-    Which from this library means a PDO Mapping
-    """
-    data = []
-    for v in m:
-        signed = v.od.data_type in canopen.objectdictionary.SIGNED_TYPES
-        value = int.from_bytes(v.get_data(), byteorder="little", signed=signed)
-        data.append(f"{v.name}: {value}")
-    print(f'{m.cob_id:03X} {m.name} {" ".join(data)}')
 
+async def print_frames(listener: CanListener) -> None:
+    """Print decoded frames to stdout as they arrive."""
+    async for frame in listener.frames():
+        print(format_frame(frame))
 
-def listen(bus: str, od: canopen.ObjectDictionary) -> None:
-    """Listen for PDOs from the given node, formats and prints them to stdout."""
-    network = canopen.Network()
-    network.connect(channel=bus, bustype="socketcan")
 
-    node = network.add_node(0, od)
-    node.tpdo.read(from_od=True)
-    for pdo in node.tpdo.values():
-        pdo.add_callback(print_map)
-    node.tpdo.subscribe()
+async def listen_bus(bus: can.BusABC, decoder: CanDecoder) -> None:
+    """Listen to a bus and print the frames known to decoder until cancelled."""
+    listener = CanListener(bus, decoder)
+    async with asyncio.TaskGroup() as tasks:
+        # Created first so it subscribes before the listener receives anything
+        tasks.create_task(print_frames(listener))
+        tasks.create_task(listener.run())
+
+
+def listen(bus: str, decoder: CanDecoder) -> None:
+    """Listen for the frames known to decoder, formats and prints them to stdout.
 
-    try:
-        while True:
-            time.sleep(1)
-            network.check()
-    finally:
-        network.disconnect()
+    The bus is opened with filters for the decoder's COB-IDs, so the kernel drops everything else.
+    """
+    filters = socketcan_filters(decoder.routes)
+    with (
+        can.Bus(channel=bus, interface="socketcan", can_filters=filters) as can_bus,
+        suppress(KeyboardInterrupt),
+    ):
+        asyncio.run(listen_bus(can_bus, decoder))
 
 
 def listpdos(od: canopen.ObjectDictionary) -> None:
@@ -133,11 +146,22 @@ def listpdos(od: canopen.ObjectDictionary) -> None:
 
 
 def pdo_main(args: Namespace) -> None:
-    """List or Listen for PDOs."""
+    """List or Listen for PDOs.
+
+    With --all, the PDOs of every card are routed by COB-ID through one table, so a single
+    listener covers the whole bus at the same cost per frame as a single card.
+    """
+    if args.all == (args.card is not None):
+        raise SystemExit("give either a card or --all")
     config = OreSatConfig(args.oresat)
-    od = config.od_db[config.name_from_alias(args.card)]
+    cards = list(config.od_db) if args.all else [config.name_from_alias(args.card)]
 
     if args.list:
-        listpdos(od)
+        for card in cards:
+            if args.all:
+                print(f"{card}:")
+            listpdos(config.od_db[card])
     else:
-        listen(args.bus, od)
+        # Only build the ODs of the cards listened to
+        table = config.pdo_table if args.all else PdoTable.from_config(config, cards)
+        listen(args.bus, CanDecoder({}, table, sync=False))
@@ -21,6 +21,7 @@ from canopen.objectdictionary import (
 from canopen.sdo import SdoArray, SdoRecord
 
 from .. import Mission, OreSatConfig
+from ..can_filters import card_cob_ids, socketcan_filters
 
 STRING_TYPES = (VISIBLE_STRING, UNICODE_STRING)
 BINARY_TYPES = (OCTET_STRING, DOMAIN)
@@ -70,7 +71,8 @@ def build_arguments(subparsers: _SubParsersAction) -> None:
 def sdo_transfer(args: Namespace) -> None:
     """Read or write data to a node using a SDO."""
     config = OreSatConfig(args.oresat)
-    od = config.od_db[args.node.lower()]
+    card = args.node.lower()
+    od = config.od_db[card]
     node = canopen.RemoteNode(0, od)
 
     if args.mode in ["r", "read"]:
@@ -113,7 +115,11 @@ def sdo_transfer(args: Namespace) -> None:
     # connect to CAN network
     network = canopen.Network()
     network.add_node(node)
-    with network.connect(bustype="socketcan", channel=args.bus):
+    # Have the kernel drop everything but the node's SDO responses, EMCYs and heartbeats
+    cob_ids = {node.sdo.tx_cobid} | card_cob_ids(config, [card], pdos=False)
+    with network.connect(
+        bustype="socketcan", channel=args.bus, can_filters=socketcan_filters(cob_ids)
+    ):
         # send SDO
         try:
             if mode == "read":
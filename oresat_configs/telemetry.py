@@ -0,0 +1,254 @@
+"""Vectorized processing of decoded telemetry columns.
+
+Telemetry decoded in bulk, e.g. with beacon_array, comes as one column of raw values per object.
+Converter and LimitChecker are built once from the objects' ODVariables and work on whole columns
+at a time with NumPy. A Converter applies the scale factors, enum value descriptions and bit
+definitions to get engineering units, a LimitChecker flags values outside of the objects' limits.
+
+Requires numpy, install with `pip install oresat-configs[numpy]`.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+from canopen.objectdictionary import ODVariable, datatypes
+
+from .beacon_codec import STRUCT_FORMATS, BeaconCodec
+
+Columns = Mapping[str, np.ndarray] | np.ndarray
+"""Raw columns by name, a mapping or a structured array like the one from beacon_array."""
+
+
+@dataclass(frozen=True)
+class EnumLookup:
+    """Lookup arrays mapping the raw values of an enum to their descriptions."""
+
+    values: npt.NDArray[np.int64]
+    """The raw values, sorted."""
+    labels: npt.NDArray[np.str_]
+    """The description of each value, in the same order."""
+
+    @classmethod
+    def from_descriptions(cls, descriptions: Mapping[int, str]) -> "EnumLookup":
+        """Build the lookup arrays from an ODVariable's value_descriptions."""
+        items = sorted(descriptions.items())
+        return cls(
+            np.array([value for value, _ in items], np.int64),
+            np.array([label for _, label in items], np.str_),
+        )
+
+    def lookup(self, raw: np.ndarray, unknown: str = "") -> npt.NDArray[np.str_]:
+        """Map a column of raw values to their descriptions, unknown for undescribed values."""
+        if len(self.values) == 0:
+            return np.full(raw.shape, unknown)
+        i = np.searchsorted(self.values, raw).clip(max=len(self.values) - 1)
+        return np.where(self.values[i] == raw, self.labels[i], unknown)
+
+
+@dataclass(frozen=True)
+class Conversion:
+    """How to convert the raw column of one object."""
+
+    name: str
+    """Name of the raw column, and of the converted column."""
+    factor: float = 1
+    """Scale factor of integer values, 1 if they're left as is."""
+    unit: str = ""
+    """Engineering unit of the converted column."""
+    enum: EnumLookup | None = None
+    """Lookup arrays if the object is an enum."""
+    bits: dict[str, list[int]] = field(default_factory=dict)
+    """Bit definitions, each gets its own column, named name_bitname."""
+
+    @classmethod
+    def from_variable(cls, name: str, obj: ODVariable) -> "Conversion":
+        """Build the conversion of a column of obj's raw values."""
+        factor = obj.factor if obj.data_type in datatypes.INTEGER_TYPES else 1
+        enum = (
+            EnumLookup.from_descriptions(obj.value_descriptions) if obj.value_descriptions else None
+        )
+        return cls(name, factor or 1, obj.unit or "", enum, dict(obj.bit_definitions))
+
+
+def _extract_bits(raw: np.ndarray, bits: list[int]) -> np.ndarray:
+    """Extract a bit field, as booleans if it's a single bit."""
+    values = raw.astype(np.uint64, copy=False)
+    if len(bits) == 1:
+        return (values >> np.uint64(bits[0])) & np.uint64(1) == 1
+    if bits == list(range(bits[0], bits[-1] + 1)):
+        return (values >> np.uint64(bits[0])) & np.uint64((1 << len(bits)) - 1)
+    out = np.zeros(raw.shape, np.uint64)
+    for i, bit in enumerate(bits):
+        out |= ((values >> np.uint64(bit)) & np.uint64(1)) << np.uint64(i)
+    return out
+
+
+class Converter:
+    """Convert columns of raw telemetry to engineering units.
+
+    For each column:
+
+    - Integers with a scale factor other than 1 are multiplied by it, becoming float64.
+    - Enums, objects with value descriptions, become string columns of the descriptions. Raw values
+      without a description become empty strings.
+    - Every bit definition is extracted into its own column, name_bitname, as booleans for single
+      bits and unsigned integers for wider fields. The raw column is kept too.
+    - Anything else is passed through as is.
+    """
+
+    def __init__(self, columns: Mapping[str, ODVariable]) -> None:
+        """Build the conversions.
+
+        Parameters
+        ----------
+        columns
+            The object each raw column holds the values of, by column name.
+        """
+        self.conversions = tuple(Conversion.from_variable(n, obj) for n, obj in columns.items())
+        # Engineering unit of each converted column, including the bit columns
+        self.units = {c.name: c.unit for c in self.conversions}
+        for c in self.conversions:
+            self.units.update((f"{c.name}_{bit}", "") for bit in c.bits)
+
+    @classmethod
+    def for_beacon(cls, codec: BeaconCodec) -> "Converter":
+        """Build the converter for columns decoded from beacons, see beacon_array."""
+        return cls({f.name: f.obj for f in codec.fields})
+
+    def convert(
+        self, columns: Columns, names: Iterable[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """Convert raw columns.
+
+        Parameters
+        ----------
+        columns
+            The raw columns, by name. Columns without a conversion (e.g. the beacon's AX.25 header)
+            are ignored.
+        names
+            (optional) Only convert these columns, by default every column with a conversion.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            The converted columns, in the order of the conversions.
+        """
+        wanted = None if names is None else set(names)
+        out: dict[str, np.ndarray] = {}
+        for c in self.conversions:
+            if wanted is not None and c.name not in wanted:
+                continue
+            raw = np.asarray(columns[c.name])
+            if c.enum is not None:
+                out[c.name] = c.enum.lookup(raw)
+            elif c.factor != 1:
+                out[c.name] = raw * c.factor
+            else:
+                out[c.name] = raw
+            for bit, bits in c.bits.items():
+                out[f"{c.name}_{bit}"] = _extract_bits(raw, bits)
+        return out
+
+
+@dataclass(frozen=True)
+class LimitReport:
+    """Out of range values found by LimitChecker.check().
+
+    The masks are 2D, a row per frame and a column per checked field, in the order of names.
+    """
+
+    names: tuple[str, ...]
+    """The checked fields."""
+    below: npt.NDArray[np.bool_]
+    """Values below their field's low limit."""
+    above: npt.NDArray[np.bool_]
+    """Values above their field's high limit."""
+    nan: npt.NDArray[np.bool_]
+    """NaN values of float fields, which compare False with both limits."""
+
+    @property
+    def out_of_range(self) -> npt.NDArray[np.bool_]:
+        """Values outside of their field's limits, including NaNs."""
+        return self.below | self.above | self.nan
+
+    @property
+    def flags(self) -> npt.NDArray[np.bool_]:
+        """Per frame, True if any of its values are out of range."""
+        return np.asarray(self.out_of_range.any(axis=1))
+
+    @property
+    def counts(self) -> npt.NDArray[np.intp]:
+        """Per frame, the number of its values that are out of range."""
+        return self.out_of_range.sum(axis=1)
+
+    def masks(self) -> dict[str, npt.NDArray[np.bool_]]:
+        """Get the out of range mask of each field, by name."""
+        out_of_range = self.out_of_range
+        return {name: out_of_range[:, i] for i, name in enumerate(self.names)}
+
+
+class LimitChecker:
+    """Check columns of raw telemetry against the low and high limits of their objects.
+
+    The limits are the ODVariables' min and max, which come from the low_limit and high_limit of
+    the card configs, in raw units. Fields whose limits can't be exceeded, because they're the
+    whole range of the field's data type as is the default, aren't checked at all.
+    """
+
+    def __init__(self, columns: Mapping[str, ODVariable]) -> None:
+        """Collect the limits to check.
+
+        Parameters
+        ----------
+        columns
+            The object each raw column holds the values of, by column name.
+        """
+        # Low and high limits of the checked columns, None if that side isn't checked
+        self.limits: dict[str, tuple[int | float | None, int | float | None]] = {}
+        for name, obj in columns.items():
+            if obj.data_type not in STRUCT_FORMATS:
+                continue
+            fmt = STRUCT_FORMATS[obj.data_type]
+            info = np.iinfo(fmt) if np.dtype(fmt).kind in "iu" else None
+            low = None if obj.min is None or (info is not None and obj.min <= info.min) else obj.min
+            high = (
+                None if obj.max is None or (info is not None and obj.max >= info.max) else obj.max
+            )
+            if low is not None or high is not None:
+                self.limits[name] = (low, high)
+
+    @classmethod
+    def for_beacon(cls, codec: BeaconCodec) -> "LimitChecker":
+        """Build the checker for columns decoded from beacons, see beacon_array."""
+        return cls({f.name: f.obj for f in codec.fields})
+
+    def check(self, columns: Columns) -> LimitReport:
+        """Check every limited column at once.
+
+        Parameters
+        ----------
+        columns
+            The raw columns, by name. Every column with limits must be present. The report has a row
+            per row of the columns, even if none of them have limits.
+        """
+        names = tuple(self.limits)
+        if isinstance(columns, np.ndarray):
+            rows = len(columns)
+        else:
+            rows = len(next(iter(columns.values()))) if columns else 0
+        below = np.zeros((rows, len(names)), np.bool_)
+        above = np.zeros((rows, len(names)), np.bool_)
+        nan = np.zeros((rows, len(names)), np.bool_)
+        for i, name in enumerate(names):
+            raw = np.asarray(columns[name])
+            low, high = self.limits[name]
+            if low is not None:
+                np.less(raw, low, out=below[:, i])
+            if high is not None:
+                np.greater(raw, high, out=above[:, i])
+            # Comparisons with NaN are always False, so it'd never be flagged otherwise
+            if raw.dtype.kind == "f":
+                np.isnan(raw, out=nan[:, i])
+        return LimitReport(names, below, above, nan)
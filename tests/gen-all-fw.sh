@@ -5,12 +5,8 @@ base=$(dirname $0)
 OD=${1:-$base/od}
 canopennode=${2:-$base/../CANopenNode}
 
-cards=($(python -m oresat_configs cards --names))
+python -m oresat_configs gen-all --only fw-files -d $OD
 
-for name in "${cards[@]}"; do
-    python -m oresat_configs fw-files $name -d $OD/$name
-done
-
-for name in "${cards[@]}"; do
-    gcc -c -Wall -Wextra -Werror -I$canopennode -I$base $OD/$name/OD.c -o $OD/$name/OD.o
+for odc in $OD/*/*/OD.c; do
+    gcc -c -Wall -Wextra -Werror -I$canopennode -I$base $odc -o ${odc%.c}.o
 done
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from oresat_configs import OreSatConfig
+from oresat_configs.beacon_array import (
+    CRC_FIELD,
+    HEADER_FIELD,
+    beacon_dtype,
+    decode_file,
+    decode_frames,
+)
+
+
+class TestBeaconArray:
+    def test_dtype(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        dtype = beacon_dtype(codec)
+        assert dtype.itemsize == codec.size
+        assert dtype.names == (HEADER_FIELD, *codec.names, CRC_FIELD)
+        for field in codec.fields:
+            assert dtype.fields is not None
+            assert dtype.fields[field.name][1] == field.offset
+
+    def test_decode_frames(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        encoded = [codec.encode({"system_uptime": i, "beacon_revision": i % 7}) for i in range(10)]
+        corrupt = bytearray(encoded[3])
+        corrupt[-1] ^= 1
+        encoded[3] = bytes(corrupt)
+        other_header = bytearray(encoded[5])
+        other_header[0] ^= 1
+        encoded[5] = bytes(other_header)
+
+        frames, valid = decode_frames(codec, b"".join(encoded))
+        assert len(frames) == len(encoded)
+        assert valid.tolist() == [i not in (3, 5) for i in range(10)]
+        assert frames["system_uptime"].tolist() == list(range(10))
+
+        for frame, raw in zip(frames, encoded, strict=True):
+            expected = codec.decode(raw, verify=False)
+            for name, value in expected.items():
+                decoded = frame[name]
+                if isinstance(decoded, bytes):
+                    decoded = decoded.decode("ascii")
+                assert decoded == pytest.approx(value)
+
+    def test_decode_file(self, config: OreSatConfig, tmp_path: Path) -> None:
+        codec = config.beacon_codec
+        path = tmp_path / "beacons.bin"
+        path.write_bytes(codec.encode() * 3)
+        frames, valid = decode_file(codec, path)
+        assert len(frames) == 3
+        assert valid.all()
+
+        path.write_bytes(codec.encode() * 3 + b"\0")
+        with pytest.raises(ValueError, match="whole number"):
+            decode_file(codec, path)
+
+    def test_empty(self, config: OreSatConfig) -> None:
+        frames, valid = decode_frames(config.beacon_codec, np.zeros(0, np.uint8))
+        assert len(frames) == 0
+        assert len(valid) == 0
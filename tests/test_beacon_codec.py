@@ -0,0 +1,104 @@
+import struct
+import zlib
+
+import pytest
+
+from oresat_configs import Mission, OreSatConfig
+from oresat_configs.beacon_codec import (
+    AX25_HEADER_LEN,
+    BeaconCodec,
+    BeaconRegistry,
+    ax25_address,
+)
+from oresat_configs.scripts.gen_kaitai import generate_kaitai
+
+
+class TestBeaconCodec:
+    def test_layout(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        payload_size = generate_kaitai(config)["types"]["ui_frame"]["seq"][1]["size"]
+        assert codec.size == AX25_HEADER_LEN + payload_size + 4
+
+        assert len(codec.fields) == len(config.beacon_def)
+        assert codec.fields[0].offset == AX25_HEADER_LEN
+        for field, following in zip(codec.fields, codec.fields[1:], strict=False):
+            assert field.offset + field.size == following.offset
+
+    def test_round_trip(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        frame = codec.encode()
+        assert frame.startswith(codec.header)
+        assert struct.unpack("<I", frame[-4:])[0] == zlib.crc32(frame[:-4])
+
+        values = codec.decode(frame)
+        assert list(values) == list(codec.names)
+        assert values["beacon_start_chars"] == "{{z"
+        assert values["satellite_id"] == config.mission.id
+
+        values["beacon_revision"] = 7
+        assert codec.decode(codec.encode(values)) == values
+        assert codec.unpack(codec.encode(values)) == list(values.values())
+
+    def test_errors(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        frame = bytearray(codec.encode())
+
+        with pytest.raises(ValueError, match="bytes"):
+            codec.decode(frame[:-1])
+        frame[AX25_HEADER_LEN + 4] ^= 0xFF
+        with pytest.raises(ValueError, match="CRC"):
+            codec.decode(frame)
+        codec.decode(frame, verify=False)
+        frame[0] = 0
+        with pytest.raises(ValueError, match="header"):
+            codec.decode(frame)
+        with pytest.raises(ValueError, match="unknown"):
+            codec.encode({"not_a_field": 1})
+
+    def test_ax25_address(self) -> None:
+        assert ax25_address("SPACE", 0, c_bit=False, last=False) == b"\xa6\xa0\x82\x86\x8a\x40\x60"
+        assert ax25_address("KJ7SAT", 11, c_bit=True, last=True)[-1] == 0b1111_0111
+        with pytest.raises(ValueError, match="callsign"):
+            ax25_address("TOOLONG", 0, c_bit=False, last=False)
+        with pytest.raises(ValueError, match="ssid"):
+            ax25_address("SPACE", 16, c_bit=False, last=False)
+
+    def test_bad_header(self, config: OreSatConfig) -> None:
+        with pytest.raises(ValueError, match="header"):
+            BeaconCodec(config.beacon_def, b"")
+
+
+class TestBeaconRegistry:
+    def test_mixed_traffic(self) -> None:
+        registry = BeaconRegistry.from_missions()
+        assert len(registry) == len(Mission)
+
+        frames = []
+        for i, mission in enumerate(Mission):
+            codec = OreSatConfig.get(mission).beacon_codec
+            assert (mission.id, 0) in registry
+            frames.append((codec, codec.encode({"system_uptime": i})))
+
+        for codec, frame in frames:
+            assert registry.codec(frame) is codec
+            assert registry.decode(frame) == codec.decode(frame)
+
+    def test_errors(self) -> None:
+        codec = OreSatConfig.get(Mission.ORESAT0).beacon_codec
+        registry = BeaconRegistry([codec])
+        with pytest.raises(ValueError, match="already registered"):
+            registry.add(codec)
+
+        frame = bytearray(codec.encode())
+        frame[codec.fields[1].offset] = 0xFF
+        with pytest.raises(ValueError, match="no beacon"):
+            registry.decode(frame)
+        with pytest.raises(ValueError, match="too short"):
+            registry.decode(frame[:10])
+
+        # A beacon whose prefix is laid out differently can't be told apart
+        beacon_def = OreSatConfig.get(Mission.ORESAT1).beacon_def
+        with pytest.raises(ValueError, match="prefix"):
+            registry.add(BeaconCodec(beacon_def[1:], codec.header))
+        with pytest.raises(ValueError, match="missing"):
+            registry.add(BeaconCodec(beacon_def[3:], codec.header))
@@ -0,0 +1,64 @@
+'''Test the precompiled mission bundles'''
+
+import os
+from pathlib import Path
+
+import pytest
+
+from oresat_configs import Mission, OreSatConfig, _bundle, _cache
+from oresat_configs.card_config import CardConfig
+from oresat_configs.scripts import gen_fw_files
+
+
+class TestBundle:
+    def test_bundle_matches_source(self, mission: Mission, tmp_path: Path) -> None:
+        path = _bundle.build(mission, tmp_path / _bundle.BUNDLE_NAME)
+        data = _bundle.load(mission, path)
+        assert data is not None
+
+        fresh = OreSatConfig(mission, bundle=False)
+        assert list(data["od_db"]) == list(fresh.od_db)
+        assert [o.name for o in data["beacon_def"]] == [o.name for o in fresh.beacon_def]
+        for name, od in fresh.od_db.items():
+            assert gen_fw_files.generate_canopennode(od) == gen_fw_files.generate_canopennode(
+                data["od_db"][name]
+            )
+
+    def test_skips_yaml(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        mission = Mission.ORESAT1
+        path = _bundle.build(mission, tmp_path / _bundle.BUNDLE_NAME)
+        monkeypatch.setattr(_bundle, "bundle_path", lambda _: path)
+
+        def fail(*_: object) -> None:
+            raise AssertionError("YAML loaded")
+
+        monkeypatch.setattr(CardConfig, "from_yaml", fail)
+        config = OreSatConfig(mission)
+        assert "c3" in config.od_db
+        assert config.beacon_def
+
+    def test_stale(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        mission = Mission.ORESAT1
+        path = _bundle.build(mission, tmp_path / _bundle.BUNDLE_NAME)
+
+        # Sources that are older than the bundle aren't hashed at all
+        monkeypatch.setattr(_cache, "cache_key", lambda _: "edited")
+        assert _bundle.load(mission, path) is not None
+
+        # Sources newer than the bundle are, and must match
+        os.utime(path, (0, 0))
+        assert _bundle.load(mission, path) is None
+        monkeypatch.undo()
+        assert _bundle.load(mission, path) is not None
+
+    def test_versions(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        mission = Mission.ORESAT1
+        path = _bundle.build(mission, tmp_path / _bundle.BUNDLE_NAME)
+        monkeypatch.setattr(_cache, "__version__", "other")
+        assert _bundle.load(mission, path) is None
+
+    def test_missing_or_corrupt(self, tmp_path: Path) -> None:
+        path = tmp_path / _bundle.BUNDLE_NAME
+        assert _bundle.load(Mission.ORESAT1, path) is None
+        path.write_bytes(b"garbage")
+        assert _bundle.load(Mission.ORESAT1, path) is None
@@ -0,0 +1,51 @@
+'''Test the on-disk cache of compiled configs'''
+
+from pathlib import Path
+
+import pytest
+
+from oresat_configs import Mission, OreSatConfig, _cache
+from oresat_configs.scripts import gen_fw_files
+
+
+class TestCache:
+    def test_hit_matches_miss(self, mission: Mission, tmp_path: Path) -> None:
+        fresh = OreSatConfig(mission, bundle=False)
+        OreSatConfig(mission, cache_dir=tmp_path, bundle=False)  # populate
+        assert len(list(tmp_path.iterdir())) == 1
+        cached = OreSatConfig(mission, cache_dir=tmp_path, bundle=False)
+
+        assert list(cached.od_db) == list(fresh.od_db)
+        assert [o.name for o in cached.beacon_def] == [o.name for o in fresh.beacon_def]
+        assert [o.name for o in cached.fram_def] == [o.name for o in fresh.fram_def]
+        for name, od in fresh.od_db.items():
+            assert gen_fw_files.generate_canopennode(od) == gen_fw_files.generate_canopennode(
+                cached.od_db[name]
+            )
+
+    def test_env_opt_in(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(_cache.CACHE_DIR_ENV, str(tmp_path))
+        OreSatConfig(Mission.ORESAT1, bundle=False)
+        assert len(list(tmp_path.glob("oresat1-*.pickle"))) == 1
+
+    def test_invalidation(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        mission = Mission.ORESAT1
+        OreSatConfig(mission, cache_dir=tmp_path, bundle=False)
+        old = next(tmp_path.iterdir())
+
+        # Simulate an edited input file by changing the key
+        monkeypatch.setattr(_cache, "__version__", "edited")
+        assert _cache.cache_key(mission)[:32] not in old.name
+        OreSatConfig(mission, cache_dir=tmp_path, bundle=False)
+        entries = list(tmp_path.iterdir())
+        assert len(entries) == 1
+        assert entries[0] != old
+
+    def test_corrupt_entry(self, tmp_path: Path) -> None:
+        mission = Mission.ORESAT1
+        OreSatConfig(mission, cache_dir=tmp_path, bundle=False)
+        entry = next(tmp_path.iterdir())
+        entry.write_bytes(b"garbage")
+        config = OreSatConfig(mission, cache_dir=tmp_path, bundle=False)
+        assert "c3" in config.od_db
+        assert entry.read_bytes() != b"garbage"
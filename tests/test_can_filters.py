@@ -0,0 +1,65 @@
+import can
+import pytest
+
+from oresat_configs import Mission, OreSatConfig
+from oresat_configs._yaml_to_od import LazyMapping
+from oresat_configs.can_filters import (
+    MATCH_NOTHING,
+    card_cob_ids,
+    minimal_filters,
+    socketcan_filters,
+)
+
+
+def matched(filters: list[tuple[int, int]]) -> set[int]:
+    return {cob_id for cob_id in range(0x800) if any(cob_id & m == v for v, m in filters)}
+
+
+class TestCanFilters:
+    def test_exact(self, config: OreSatConfig) -> None:
+        for cards in [list(config.od_db), *([card] for card in config.od_db)]:
+            cob_ids = card_cob_ids(config, cards)
+            filters = minimal_filters(cob_ids)
+            assert matched(filters) == cob_ids
+            assert len(filters) <= len(cob_ids)
+
+    def test_minimal(self) -> None:
+        assert minimal_filters([]) == []
+        assert socketcan_filters([]) == [MATCH_NOTHING]
+        assert minimal_filters([0x181]) == [(0x181, 0x7FF)]
+        assert minimal_filters(range(0x180, 0x184)) == [(0x180, 0x7FC)]
+        # Needs the overlapping 0x1_0 and 0x01_ groups, not 4 single IDs
+        assert len(minimal_filters([0x100, 0x110, 0x111, 0x101, 0x103])) == 2
+
+    def test_card_cob_ids(self, config: OreSatConfig) -> None:
+        node_id = config.od_db["c3"].node_id
+        assert node_id is not None
+        assert card_cob_ids(config, ["c3"], pdos=False) == {0x80 + node_id, 0x700 + node_id}
+        assert card_cob_ids(config, ["c3"], nodes=False) == set(
+            config.pdo_table.select(["c3"]).layouts
+        )
+
+    def test_card_cob_ids_lazy(self, mission: Mission) -> None:
+        config = OreSatConfig(mission, bundle=False)
+        gps = config.name_from_alias("gps")
+        assert card_cob_ids(config, [gps])
+        assert isinstance(config.od_db, LazyMapping)
+        assert config.od_db.built() == [gps]
+
+    @pytest.mark.parametrize("card", ["gps", None])
+    def test_bus(self, config: OreSatConfig, card: str | None) -> None:
+        # No cards, no COB-IDs, must still drop everything rather than filter nothing
+        cob_ids = card_cob_ids(config, [card] if card else [])
+        with (
+            can.Bus(interface="virtual", channel="test_filters") as sender,
+            can.Bus(
+                interface="virtual", channel="test_filters", can_filters=socketcan_filters(cob_ids)
+            ) as bus,
+        ):
+            for cob_id in range(0x800):
+                sender.send(can.Message(arbitration_id=cob_id, is_extended_id=False))
+            sender.send(can.Message(arbitration_id=0x800, is_extended_id=True))
+            received = set()
+            while (msg := bus.recv(0.1)) is not None:
+                received.add(msg.arbitration_id)
+        assert received == cob_ids
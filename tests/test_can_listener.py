@@ -0,0 +1,86 @@
+import asyncio
+
+import can
+import pytest
+
+from oresat_configs import Mission, OreSatConfig
+from oresat_configs.can_listener import CanListener, DecodedFrame
+
+
+async def receive(queue: asyncio.Queue[DecodedFrame], count: int) -> list[DecodedFrame]:
+    return [await asyncio.wait_for(queue.get(), 5) for _ in range(count)]
+
+
+class TestCanListener:
+    def test_fan_out(self) -> None:
+        config = OreSatConfig.get(Mission.ORESAT1)
+        layout = next(iter(config.pdo_table.layouts.values()))
+        data = bytes(range(layout.size))
+
+        async def main() -> tuple[list[DecodedFrame], list[DecodedFrame], CanListener]:
+            with (
+                can.Bus(interface="virtual", channel="test_fan_out") as bus,
+                can.Bus(interface="virtual", channel="test_fan_out") as sender,
+            ):
+                listener = CanListener(bus, config.can_decoder)
+                first = listener.subscribe()
+                second = listener.subscribe()
+                task = asyncio.create_task(listener.run())
+                await asyncio.sleep(0)
+                for msg in [
+                    can.Message(arbitration_id=layout.cob_id, data=data, is_extended_id=False),
+                    can.Message(arbitration_id=0x7FF, data=b"", is_extended_id=False),
+                    can.Message(arbitration_id=0x081, data=b"\0", is_extended_id=False),
+                    can.Message(arbitration_id=0x701, data=b"\x05", is_extended_id=False),
+                ]:
+                    sender.send(msg)
+                received = await receive(first, 2), await receive(second, 2)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return *received, listener
+
+        first, second, listener = asyncio.run(main())
+        assert first == second
+        assert [(f.cob_id, f.card, f.message) for f in first] == [
+            (layout.cob_id, layout.card, f"tpdo{layout.num}"),
+            (0x701, "c3", "heartbeat"),
+        ]
+        assert first[0].values == layout.decode(data)
+        assert listener.errors == 1
+        assert listener.dropped == 0
+
+    def test_slow_consumer(self) -> None:
+        config = OreSatConfig.get(Mission.ORESAT1)
+
+        async def main() -> tuple[list[DecodedFrame], CanListener]:
+            with (
+                can.Bus(interface="virtual", channel="test_slow_consumer") as bus,
+                can.Bus(interface="virtual", channel="test_slow_consumer") as sender,
+            ):
+                listener = CanListener(bus, config.can_decoder)
+                frames = listener.frames(maxsize=2)
+
+                async def next_frame() -> DecodedFrame:
+                    return await anext(frames)
+
+                # Subscribes
+                first = asyncio.create_task(next_frame())
+                await asyncio.sleep(0)
+                task = asyncio.create_task(listener.run())
+                for i in range(5):
+                    sender.send(can.Message(arbitration_id=0x080, data=[i], is_extended_id=False))
+                received = [await asyncio.wait_for(first, 5)]
+                while listener.dropped < 2:  # noqa: ASYNC110 - waiting on another thread
+                    await asyncio.sleep(0.01)
+                received.append(await anext(frames))
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                await frames.aclose()
+                return received, listener
+
+        received, listener = asyncio.run(main())
+        assert [f.values for f in received] == [{"counter": 0}, {"counter": 1}]
+        # 2 or 3, depending on whether the consumer got the first frame before the others arrived
+        assert listener.dropped in {2, 3}
@@ -3,10 +3,12 @@
 from importlib import abc, resources
 from typing import TypeAlias
 
-from dacite import Config, from_dict
+import pytest
+from dacite import Config, DaciteError, from_dict
 from yaml import CLoader, load
 
 from oresat_configs import Mission, _yaml_to_od, base
+from oresat_configs._schema import decode
 from oresat_configs.beacon_config import BeaconConfig
 from oresat_configs.card_config import CardConfig, IndexObject
 
@@ -50,3 +52,32 @@ class TestConfigTypes:
         for data in self.load_yaml(path):
             assert isinstance(data, dict)
             from_dict(IndexObject, data, Config(strict=True))
+
+    def test_decode_matches_dacite(self, mission: Mission) -> None:
+        """The compiled decoders build the same dataclasses as dacite"""
+        beacon = self.load_yaml(mission.beacon)
+        assert decode(BeaconConfig, beacon, strict=False) == from_dict(BeaconConfig, beacon)
+
+        card_paths = [f for f in resources.files(base).iterdir() if f.name.endswith(".yaml")]
+        card_paths.extend(mission.overlays.values())
+        for path in card_paths:
+            data = self.load_yaml(path)
+            assert decode(CardConfig, data) == from_dict(CardConfig, data, Config(strict=True))
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"objects": [], "unknown": 1},
+            {"tpdos": [{"fields": [["a"]]}]},
+            {"objects": [{"index": "0x4000", "name": "a", "data_type": "uint8"}]},
+            {"objects": [{"index": 0x4000, "name": "a", "bit_definitions": {"b": 1.5}}]},
+            {"tpdos": [{"num": 1, "fields": [], "transmission": {"bogus": 1}}]},
+        ],
+    )
+    def test_decode_errors_match_dacite(self, data: ParsedYaml) -> None:
+        """Malformed configs raise the same errors as dacite"""
+        with pytest.raises(DaciteError) as expected:
+            from_dict(CardConfig, data, Config(strict=True))
+        with pytest.raises(type(expected.value)) as actual:
+            decode(CardConfig, data)
+        assert str(actual.value) == str(expected.value)
@@ -1,9 +1,14 @@
 '''Test that the yaml to od conversion works as expected'''
 
 from importlib import resources
+from pathlib import Path
 
-from oresat_configs import OreSatConfig
-from oresat_configs.card_config import CardConfig
+import pytest
+
+from oresat_configs import Mission, OreSatConfig, _bundle
+from oresat_configs._yaml_to_od import LazyMapping, _SharedConfigs
+from oresat_configs.card_config import CardConfig, IndexObject, SubindexObject
+from oresat_configs.scripts import gen_fw_files
 
 
 class TestOdGeneration:
@@ -26,3 +31,104 @@ class TestOdGeneration:
                 if cardname.startswith(name):
                     for tpdo in overlay.rpdos:
                         assert tpdo in cfg.rpdos
+
+    def test_lazy_od_db(self, mission: Mission) -> None:
+        config = OreSatConfig(mission, bundle=False)
+        assert isinstance(config.od_db, LazyMapping)
+        assert isinstance(config.configs, LazyMapping)
+        assert len(config.od_db) == len(list(config.od_db)) == len(config.configs)
+        assert config.od_db.built() == []
+
+        name = config.name_from_alias('gps')
+        assert name in config.od_db
+        assert 'not_a_card' not in config.od_db
+        od = config.od_db[name]
+        assert config.od_db[name] is od
+        assert config.od_db.built() == [name]
+        assert config.configs.built() == [name]
+
+        # The C3 maps every other card's TPDOs so it needs all their configs
+        config.od_db['c3']
+        assert sorted(config.configs.built()) == sorted(config.configs)
+        assert sorted(config.od_db.built()) == sorted(['c3', name])
+
+    def test_yaml_parsed_once(self, mission: Mission, monkeypatch: pytest.MonkeyPatch) -> None:
+        parsed: list[str] = []
+        from_yaml = CardConfig.from_yaml.__func__  # type: ignore[attr-defined]
+
+        def counting_from_yaml(cls: type[CardConfig], path: Path) -> CardConfig:
+            parsed.append(path.name)
+            return from_yaml(cls, path)
+
+        monkeypatch.setattr(CardConfig, 'from_yaml', classmethod(counting_from_yaml))
+        config = OreSatConfig(mission, bundle=False)
+        dict(config.od_db)
+        assert len(parsed) == len(set(parsed))
+
+        # Node id dependent values are still unique per card
+        emcy_ids = [
+            obj.default
+            for conf in config.configs.values()
+            for obj in conf.objects
+            if obj.name == 'cob_id_emergency_message'
+        ]
+        assert len(emcy_ids) == len(set(emcy_ids))
+
+    def test_config_lookups(self, config: OreSatConfig) -> None:
+        # Lookup tables stay in sync with the object lists through overlays, templates and RPDO
+        # generation
+        for conf in config.configs.values():
+            for obj in conf.objects:
+                assert conf.get_object(obj.index) is obj
+                if obj.object_type == 'variable':
+                    assert conf.find_object([obj.name]) is obj
+                for sub in obj.subindexes:
+                    assert conf.get_subindex(obj.index, sub.subindex) is sub
+                    assert conf.find_object([obj.name, sub.name]) is sub
+            for tpdo in conf.tpdos:
+                assert conf.get_tpdo(tpdo.num) is tpdo
+            for rpdo in conf.rpdos:
+                assert conf.get_rpdo(rpdo.num) is rpdo
+
+    def test_config_modifying(self) -> None:
+        conf = CardConfig(
+            objects=[
+                IndexObject(
+                    name='rec',
+                    index=0x4000,
+                    object_type='record',
+                    subindexes=[SubindexObject(name='a', subindex=1, data_type='uint8')],
+                )
+            ]
+        )
+        obj = conf.objects[0]
+        assert conf.find_object(['rec', 'a']) is obj.subindexes[0]
+        with conf.modifying(obj):
+            obj.name = 'renamed'
+            obj.subindexes.append(SubindexObject(name='b', subindex=2, data_type='uint8'))
+        with pytest.raises(ValueError, match='not found'):
+            conf.find_object(['rec', 'a'])
+        assert conf.find_object(['renamed', 'b']) is obj.subindexes[1]
+        assert conf.get_subindex(0x4000, 2) is obj.subindexes[1]
+        assert conf.get_object(0x4001) is None
+
+    def test_registry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(OreSatConfig, '_registry', {})
+        monkeypatch.setattr(OreSatConfig, '_shared_configs', _SharedConfigs())
+        monkeypatch.setattr(_bundle, 'load', lambda _: None)
+
+        shared = [OreSatConfig.get(mission) for mission in Mission]
+        assert OreSatConfig.get('1') is OreSatConfig.get(Mission.ORESAT1)
+        assert OreSatConfig.get() is OreSatConfig.get(Mission.default())
+
+        # The same card in different missions shares its config
+        assert shared[1].configs['gps'] is shared[2].configs['gps']
+        assert shared[1].configs['c3'] is not shared[2].configs['c3']
+
+        # Sharing, including the OreSat0 battery overlay, doesn't change any ODs
+        for config in shared:
+            fresh = OreSatConfig(config.mission, bundle=False)
+            for name, od in fresh.od_db.items():
+                assert gen_fw_files.generate_canopennode(od) == gen_fw_files.generate_canopennode(
+                    config.od_db[name]
+                )
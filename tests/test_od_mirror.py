@@ -0,0 +1,89 @@
+import math
+import time
+
+import can
+import pytest
+from canopen.objectdictionary import ODVariable
+
+from oresat_configs import OreSatConfig
+from oresat_configs.od_mirror import OdMirror
+
+
+class TestOdMirror:
+    def test_update(self, config: OreSatConfig) -> None:
+        mirror = OdMirror.from_config(config)
+        layout = next(iter(config.pdo_table.layouts.values()))
+        signal = layout.signals[0]
+        key = (layout.card, signal.obj.index, signal.obj.subindex)
+        assert mirror.get(*key)[0] is None
+        assert math.isnan(mirror.get(*key)[1])
+
+        data = bytes(range(layout.size))
+        assert mirror.update(layout.cob_id, data, 12.5)
+        assert mirror.get(*key) == (layout.decode(data)[signal.name], 12.5)
+        assert mirror[key] == layout.decode(data)[signal.name]
+
+        assert not mirror.update(0x7FF, b"", 13.0)
+        with pytest.raises(ValueError, match="expected"):
+            mirror.update(layout.cob_id, data[:-1], 13.0)
+        assert mirror.get(*key)[1] == 12.5
+
+    def test_objects(self, config: OreSatConfig) -> None:
+        mirror = OdMirror.from_config(config)
+        mappable = {
+            (card, v.index, v.subindex)
+            for card, od in config.od_db.items()
+            for entry in od.values()
+            for v in ([entry] if isinstance(entry, ODVariable) else entry.values())
+            if v.pdo_mappable
+        }
+        mapped = {
+            (layout.card, s.obj.index, s.obj.subindex)
+            for layout in config.pdo_table.layouts.values()
+            for s in layout.signals
+        }
+        assert set(mirror._slots) == mappable | mapped  # noqa: SLF001
+        assert len(mirror) == len(mappable | mapped)
+        # Never updated by a TPDO, so always unknown
+        for key in mappable - mapped:
+            assert mirror.get(*key)[0] is None
+        with pytest.raises(KeyError):
+            mirror.get("not_a_card", 0x1000)
+
+    def test_snapshot(self, config: OreSatConfig) -> None:
+        mirror = OdMirror.from_config(config)
+        layout = next(iter(config.pdo_table.layouts.values()))
+        key = (layout.card, layout.signals[0].obj.index, layout.signals[0].obj.subindex)
+        first, second = bytes(layout.size), bytes([0xFF] * layout.size)
+
+        mirror.update(layout.cob_id, first, 1.0)
+        view = mirror.snapshot()
+        mirror.update(layout.cob_id, second, 2.0)
+        again = mirror.snapshot()
+        assert view.get(*key) == (layout.decode(first)[layout.signals[0].name], 1.0)
+        assert again.get(*key) == mirror.get(*key)
+        assert mirror.get(*key)[1] == 2.0
+
+    def test_notifier(self, config: OreSatConfig) -> None:
+        mirror = OdMirror.from_config(config)
+        layout = next(iter(config.pdo_table.layouts.values()))
+        key = (layout.card, layout.signals[0].obj.index, layout.signals[0].obj.subindex)
+        data = bytes(layout.size)
+        with (
+            can.Bus(interface="virtual", channel="test_od_mirror") as bus,
+            can.Bus(interface="virtual", channel="test_od_mirror") as sender,
+        ):
+            notifier = can.Notifier(bus, [mirror.on_message_received])
+            try:
+                for payload in [b"", data]:
+                    msg = can.Message(
+                        arbitration_id=layout.cob_id, data=payload, is_extended_id=False
+                    )
+                    sender.send(msg)
+                deadline = time.monotonic() + 5
+                while math.isnan(mirror.get(*key)[1]) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                notifier.stop()
+        assert mirror.errors == 1
+        assert mirror[key] == layout.decode(data)[layout.signals[0].name]
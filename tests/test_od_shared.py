@@ -0,0 +1,98 @@
+import math
+import multiprocessing
+import struct
+
+import pytest
+from canopen.objectdictionary import ODVariable, datatypes
+
+from oresat_configs import Mission, OreSatConfig
+from oresat_configs.od_shared import SharedLayout, SharedOdValues
+
+
+def read_in_child(mission: Mission, name: str, key: tuple[str, int, int]) -> tuple[object, float]:
+    layout = SharedLayout.from_config(OreSatConfig.get(mission))
+    with SharedOdValues.attach(layout, name) as values:
+        return values.get(*key)
+
+
+class TestOdShared:
+    def test_layout(self, config: OreSatConfig) -> None:
+        layout = SharedLayout.from_config(config)
+        assert layout.crc == SharedLayout.from_config(config).crc
+        # Regions don't overlap and every value fits in its region
+        regions = sorted({item.region for slot in layout.slots.values() for item in slot})
+        assert regions[0] >= struct.calcsize("<4sI")
+        for slot in layout.slots.values():
+            for item in slot:
+                end = item.offset + item.packer.size
+                following = [r for r in regions if r > item.region]
+                assert end <= (following[0] if following else layout.size)
+        # Every fixed size variable is in the block
+        for card, od in config.od_db.items():
+            for entry in od.values():
+                for obj in [entry] if isinstance(entry, ODVariable) else entry.values():
+                    if obj.data_type != datatypes.DOMAIN and obj.data_type not in (
+                        datatypes.VISIBLE_STRING,
+                        datatypes.OCTET_STRING,
+                    ):
+                        assert (card, obj.index, obj.subindex) in layout.slots
+
+    def test_publish(self, config: OreSatConfig) -> None:
+        layout = SharedLayout.from_config(config)
+        pdo = next(iter(config.pdo_table.layouts.values()))
+        data = bytes(range(pdo.size))
+        keys = [(pdo.card, s.obj.index, s.obj.subindex) for s in pdo.signals]
+        with SharedOdValues.create(layout) as values:
+            assert values.get(*keys[0])[0] is None
+            assert math.isnan(values.get(*keys[0])[1])
+
+            assert values.update(pdo.cob_id, data, 5.0)
+            assert not values.update(0x7FF, b"", 6.0)
+            with pytest.raises(ValueError, match="expected"):
+                values.update(pdo.cob_id, data[:-1], 6.0)
+            assert [values.get(*key) for key in keys] == [(v, 5.0) for v in pdo.unpack(data)]
+
+            # Not in any TPDO, e.g. read over SDO
+            values.set("c3", 0x1018, 1, 0x1234, 7.0)
+            assert values.get("c3", 0x1018, 1) == (0x1234, 7.0)
+
+            # Mapped in the TPDO, the other values of the TPDO keep their value and timestamp
+            values.set(*keys[0], 0, 8.0)
+            assert values.get(*keys[0]) == (0, 8.0)
+            assert [values.get(*key) for key in keys[1:]] == [
+                (v, 5.0) for v in pdo.unpack(data)[1:]
+            ]
+            # Until the next TPDO
+            values.update(pdo.cob_id, data, 9.0)
+            assert values.get(*keys[0]) == (pdo.unpack(data)[0], 9.0)
+            with pytest.raises(KeyError):
+                values.get("not_a_card", 0x1018, 1)
+
+    def test_attach(self) -> None:
+        mission = Mission.ORESAT1
+        config = OreSatConfig.get(mission)
+        layout = SharedLayout.from_config(config)
+        pdo = next(iter(config.pdo_table.layouts.values()))
+        key = (pdo.card, pdo.signals[0].obj.index, pdo.signals[0].obj.subindex)
+        data = bytes(range(1, pdo.size + 1))
+        with SharedOdValues.create(layout) as values:
+            values.update(pdo.cob_id, data, 9.0)
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(1) as pool:
+                received = pool.apply(read_in_child, (mission, values.name, key))
+            assert received == (pdo.unpack(data)[0], 9.0)
+
+            other = SharedLayout.from_config(OreSatConfig.get(Mission.ORESAT0))
+            with pytest.raises(ValueError, match="layout"):
+                SharedOdValues.attach(other, values.name)
+
+    def test_torn_read(self, config: OreSatConfig) -> None:
+        layout = SharedLayout.from_config(config)
+        pdo = next(iter(config.pdo_table.layouts.values()))
+        key = (pdo.card, pdo.signals[0].obj.index, pdo.signals[0].obj.subindex)
+        with SharedOdValues.create(layout) as values:
+            region = layout.tpdos[pdo.cob_id][0]
+            # A publisher that died mid-write leaves the sequence odd
+            struct.pack_into("<Q", values.shm.buf, region, 1)  # type: ignore[arg-type]
+            with pytest.raises(RuntimeError, match="written"):
+                values.get(*key)
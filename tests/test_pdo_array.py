@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from oresat_configs import OreSatConfig
+from oresat_configs.pdo_array import TIMESTAMP_FIELD, decode_batch, pdo_dtype, table_dtype
+
+
+class TestPdoArray:
+    def test_dtype(self, config: OreSatConfig) -> None:
+        for layout in config.pdo_table.layouts.values():
+            dtype = pdo_dtype(layout)
+            assert dtype.itemsize == 8
+            assert dtype.names == layout.names
+            assert table_dtype(layout).names == (TIMESTAMP_FIELD, *layout.names)
+
+    def test_decode_batch(self, config: OreSatConfig) -> None:
+        table = config.pdo_table
+        cob_ids = list(table.layouts)
+        rng = np.random.default_rng(0)
+        n = 20 * len(cob_ids)
+        can_ids = np.array(cob_ids * 20 + [0x7FF])
+        rng.shuffle(can_ids)
+        data = rng.integers(0, 256, (n + 1, 8), dtype=np.uint8)
+        dlcs = np.full(n + 1, 8)
+        dlcs[0] = 0
+        timestamps = np.arange(n + 1) * 0.001
+
+        tables = decode_batch(table, timestamps, can_ids, dlcs, data)
+        assert 0x7FF not in tables
+        assert sum(len(t) for t in tables.values()) == n - (can_ids[0] != 0x7FF)
+
+        for cob_id, decoded in tables.items():
+            rows = [i for i in np.flatnonzero(can_ids == cob_id) if dlcs[i]]
+            assert decoded[TIMESTAMP_FIELD].tolist() == timestamps[rows].tolist()
+            for row, i in zip(decoded, rows, strict=True):
+                expected = table.decode(cob_id, data[i].tobytes())
+                for name, value in expected.items():
+                    assert row[name] == pytest.approx(value, nan_ok=True)
+
+    def test_lengths(self, config: OreSatConfig) -> None:
+        with pytest.raises(ValueError, match="one entry per frame"):
+            decode_batch(config.pdo_table, [0.0], [0x181, 0x182], [8], np.zeros((1, 8), np.uint8))
+        assert decode_batch(config.pdo_table, [], [], [], np.zeros((0, 8), np.uint8)) == {}
@@ -0,0 +1,87 @@
+import struct
+from itertools import count
+
+import canopen
+import pytest
+
+from oresat_configs import OreSatConfig
+from oresat_configs.can_decoder import CanDecoder
+from oresat_configs.pdo_codec import PdoTable, tpdo_layouts
+
+
+class TestPdoCodec:
+    def test_matches_canopen(self, config: OreSatConfig) -> None:
+        table = config.pdo_table
+        byte = count(1)
+        total = 0
+        for card, od in config.od_db.items():
+            node = canopen.Network().add_node(0, od)
+            node.tpdo.read(from_od=True)
+            for pdo in node.tpdo.values():
+                if not pdo.enabled:
+                    continue
+                total += 1
+                layout = table.layouts[pdo.cob_id]
+                assert layout.card == card
+                assert layout.size * 8 == pdo.length
+
+                data = bytes(next(byte) * 37 % 256 for _ in range(layout.size))
+                pdo.data = bytearray(data)
+                values = table.unpack(pdo.cob_id, data)
+                assert [v.od for v in pdo] == [s.obj for s in layout.signals]
+                for variable, value in zip(pdo, values, strict=True):
+                    expected = variable.raw
+                    if isinstance(expected, float):
+                        assert value == pytest.approx(expected, nan_ok=True)
+                    else:
+                        assert value == expected
+        assert len(table) == total
+
+    def test_decode(self, config: OreSatConfig) -> None:
+        layout = next(iter(config.pdo_table.layouts.values()))
+        data = bytes(layout.size)
+        assert list(layout.decode(data)) == list(layout.names)
+        assert layout.decode(data + b"\xff") == layout.decode(data)
+        with pytest.raises(ValueError, match="expected"):
+            layout.unpack(data[:-1])
+        with pytest.raises(KeyError):
+            config.pdo_table.decode(0x7FF, data)
+
+    def test_duplicate_cob_id(self, config: OreSatConfig) -> None:
+        card, od = next(iter(config.od_db.items()))
+        layouts = tpdo_layouts(card, od)
+        with pytest.raises(ValueError, match="used by both"):
+            PdoTable([*layouts, layouts[0]])
+
+    def test_signal_offsets(self, config: OreSatConfig) -> None:
+        for layout in config.pdo_table.layouts.values():
+            assert layout.size <= 8
+            offset = 0
+            for signal in layout.signals:
+                assert signal.offset == offset
+                assert struct.calcsize("<" + signal.fmt) == signal.size
+                offset += signal.size
+
+    def test_select(self, config: OreSatConfig) -> None:
+        table = config.pdo_table
+        selected = table.select(["c3", "gps"])
+        assert {layout.card for layout in selected.layouts.values()} == {"c3", "gps"}
+        assert len(selected) == sum(
+            layout.card in ("c3", "gps") for layout in table.layouts.values()
+        )
+
+
+class TestCanDecoder:
+    def test_routes(self, config: OreSatConfig) -> None:
+        decoder = config.can_decoder
+        assert len(decoder) == 1 + 2 * len(config.od_db) + len(config.pdo_table)
+        assert decoder.decode(0x080, b"") == ("", "sync", {})
+        assert decoder.decode(0x701, b"\x85") == ("c3", "heartbeat", {"state": "operational"})
+        assert decoder.decode(0x7FF, b"") is None
+        with pytest.raises(ValueError, match="EMCY"):
+            decoder.decode(0x081, b"\x00")
+
+    def test_tpdos_only(self, config: OreSatConfig) -> None:
+        decoder = CanDecoder({}, config.pdo_table, sync=False)
+        assert set(decoder.routes) == set(config.pdo_table.layouts)
+        assert decoder.decode(0x080, b"") is None
@@ -1,8 +1,29 @@
-from argparse import Namespace
+import asyncio
+import hashlib
+import io
+import json
+import math
+import struct
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+from importlib import import_module
+from itertools import pairwise
 from pathlib import Path
 
+import can
+import pytest
+from canopen.objectdictionary import ODVariable, datatypes
+
 from oresat_configs import Mission, OreSatConfig
+from oresat_configs._yaml_to_od import LazyMapping
+from oresat_configs.can_decoder import CanDecoder
+from oresat_configs.pdo_codec import PdoLayout, PdoSignal, PdoTable
 from oresat_configs.scripts import (
+    _stamps,
+    beacon_decode,
+    candump_decode,
+    gen_all,
     gen_dbc,
     gen_dcf,
     gen_eds,
@@ -10,10 +31,14 @@ from oresat_configs.scripts import (
     gen_kaitai,
     gen_xtce,
     list_cards,
+    main,
     pdo,
     print_od,
 )
 
+IMPORT_BUDGET = 0.6
+"""Import time budget for trivial subcommands, as a fraction of importing every subcommand."""
+
 
 class TestScripts:
     def test_dbc(self, config: OreSatConfig) -> None:
@@ -55,6 +80,66 @@ class TestScripts:
         for od in config.od_db.values():
             pdo.listpdos(od)
 
+    def test_pdo_all(self, capsys: pytest.CaptureFixture[str]) -> None:
+        args = main.build_parser(["pdo"]).parse_args(["pdo", "--oresat", "1", "--all", "--list"])
+        args.func(args)
+        out = capsys.readouterr().out
+        assert all(f"{card}:" in out for card in OreSatConfig.get(Mission.ORESAT1).od_db)
+
+        for argv in (["pdo", "--oresat", "1"], ["pdo", "--oresat", "1", "c3", "--all"]):
+            args = main.build_parser(["pdo"]).parse_args(argv)
+            with pytest.raises(SystemExit):
+                args.func(args)
+
+    def test_pdo_listen_card(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        config = OreSatConfig(Mission.ORESAT1, bundle=False)
+        decoders: list[CanDecoder] = []
+        monkeypatch.setattr(pdo, "OreSatConfig", lambda _: config)
+        monkeypatch.setattr(pdo, "listen", lambda _, decoder: decoders.append(decoder))
+        args = main.build_parser(["pdo"]).parse_args(["pdo", "--oresat", "1", "gps"])
+        args.func(args)
+        # Only the card listened to is built, not the C3 and with it every card
+        assert isinstance(config.od_db, LazyMapping)
+        assert config.od_db.built() == ["gps"]
+        gps = {
+            p.cob_id
+            for p in OreSatConfig.get(Mission.ORESAT1).pdo_table.layouts.values()
+            if p.card == "gps"
+        }
+        # Only the card's TPDOs, not SYNC, are decoded and so let through the filters
+        assert set(decoders[0].routes) == gps
+
+    def test_pdo_listen_all(self, capsys: pytest.CaptureFixture[str]) -> None:
+        config = OreSatConfig.get(Mission.ORESAT1)
+        layouts = {p.card: p for p in config.pdo_table.layouts.values()}
+        decoder = CanDecoder({}, config.pdo_table, sync=False)
+
+        async def run() -> None:
+            with (
+                can.Bus(interface="virtual", channel="test_pdo_listen_all") as bus,
+                can.Bus(interface="virtual", channel="test_pdo_listen_all") as sender,
+            ):
+                task = asyncio.create_task(pdo.listen_bus(bus, decoder))
+                await asyncio.sleep(0.1)
+                for layout in layouts.values():
+                    data = bytes(layout.size)
+                    sender.send(
+                        can.Message(arbitration_id=layout.cob_id, data=data, is_extended_id=False)
+                    )
+                # A heartbeat and a SYNC, not PDOs, so not printed
+                sender.send(can.Message(arbitration_id=0x701, data=b"\x05", is_extended_id=False))
+                sender.send(can.Message(arbitration_id=0x080, data=b"\x01", is_extended_id=False))
+                await asyncio.sleep(0.5)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(run())
+        lines = capsys.readouterr().out.splitlines()
+        assert [line.split()[:3] for line in lines] == [
+            [f"{p.cob_id:03X}", p.card, f"tpdo{p.num}"] for p in layouts.values()
+        ]
+
     def test_print_od(self, config: OreSatConfig) -> None:
         args = Namespace()
         args.oresat = config.mission.arg
@@ -68,4 +153,342 @@ class TestScripts:
         args.oresat = config.mission.arg
         args.card = "all"
         args.dir_path = tmp_path
+        args.force = False
         gen_eds.gen_eds(args)
+
+    def test_script_metadata(self) -> None:
+        # main only imports the selected script, so its copy of the names and help must match
+        for script in main.SCRIPTS:
+            subparsers = ArgumentParser().add_subparsers()
+            import_module(f"oresat_configs.scripts.{script.module}").build_arguments(subparsers)
+            assert list(subparsers.choices) == [script.name]
+            (action,) = subparsers._choices_actions  # noqa: SLF001
+            assert action.help == script.help
+
+    def test_lazy_subcommands(self) -> None:
+        argv = ["cards", "--names"]
+        args = main.build_parser(argv).parse_args(argv)
+        assert args.func is list_cards.list_cards
+
+    @staticmethod
+    def import_time(code: str) -> tuple[set[str], int]:
+        """Run code in a fresh interpreter, returning the imported modules and total import time"""
+        result = subprocess.run(  # noqa: S603 - trusted input
+            [sys.executable, "-X", "importtime", "-c", f"{code}\nimport sys; print(*sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Lines are "import time: self | cumulative | name", nested imports have indented names
+        total = 0
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                total += int(cumulative)
+        return set(result.stdout.split()), total
+
+    def test_import_budget(self) -> None:
+        # Trivial subcommands, like `cards --names` which tests/gen-all-fw.sh runs every time,
+        # must not pay for importing the large libraries only the other subcommands need
+        modules, light = self.import_time(
+            "from oresat_configs.scripts import main\n"
+            "main.build_parser(['cards', '--names']).parse_args(['cards', '--names'])"
+        )
+        for heavy in ("canopen", "can", "bitstring", "xml.etree", "yaml", "dacite"):
+            assert heavy not in modules
+
+        # Absolute times vary too much between machines, so compare against importing everything
+        # like main used to
+        _, everything = self.import_time(
+            "from oresat_configs.scripts import main\n"
+            "for script in main.SCRIPTS: main.import_module(f'{main.__package__}.{script.module}')"
+        )
+        assert light < everything * IMPORT_BUDGET
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_gen_all(self, jobs: int, tmp_path: Path) -> None:
+        args = Namespace()
+        args.oresat = Mission.ORESAT1.arg
+        args.only = ["fw-files", "dbc", "eds"]
+        args.dir_path = tmp_path
+        args.jobs = jobs
+        args.force = False
+        gen_all.gen_all(args)
+
+        manifest = json.loads((tmp_path / gen_all.MANIFEST_NAME).read_text())
+        files = {entry["path"]: entry for entry in manifest["files"]}
+        for path, entry in files.items():
+            assert entry["sha256"] == hashlib.sha256((tmp_path / path).read_bytes()).hexdigest()
+        assert {entry["artifact"] for entry in files.values()} == set(args.only)
+
+        config = OreSatConfig(Mission.ORESAT1)
+        assert "oresat1/oresat1.dbc" in files
+        assert len([p for p in files if p.endswith(".eds")]) == len(config.od_db)
+        for name, od in [("base", config.fw_base_od), *config.od_db.items()]:
+            odc, odh = gen_fw_files.generate_canopennode(od)
+            assert (tmp_path / "oresat1" / name / "OD.c").read_text() == "\n".join(odc) + "\n"
+            assert (tmp_path / "oresat1" / name / "OD.h").read_text() == "\n".join(odh) + "\n"
+
+    def test_gen_all_incremental(self, tmp_path: Path) -> None:
+        args = Namespace()
+        args.oresat = Mission.ORESAT0.arg
+        args.only = ["fw-files", "dcf", "kaitai"]
+        args.dir_path = tmp_path
+        args.jobs = 1
+        args.force = False
+        gen_all.gen_all(args)
+
+        def mtimes() -> dict[str, int]:
+            manifest = json.loads((tmp_path / gen_all.MANIFEST_NAME).read_text())
+            return {e["path"]: (tmp_path / e["path"]).stat().st_mtime_ns for e in manifest["files"]}
+
+        first = mtimes()
+        gen_all.gen_all(args)
+        assert mtimes() == first
+        manifest = json.loads((tmp_path / gen_all.MANIFEST_NAME).read_text())
+        assert not any(e["regenerated"] for e in manifest["files"])
+
+        # A missing output regenerates only that artifact
+        (tmp_path / "oresat0" / "base" / "OD.h").unlink()
+        gen_all.gen_all(args)
+        manifest = json.loads((tmp_path / gen_all.MANIFEST_NAME).read_text())
+        changed = {e["path"] for e in manifest["files"] if e["regenerated"]}
+        assert changed == {"oresat0/base/OD.c", "oresat0/base/OD.h"}
+
+        args.force = True
+        gen_all.gen_all(args)
+        manifest = json.loads((tmp_path / gen_all.MANIFEST_NAME).read_text())
+        assert all(e["regenerated"] for e in manifest["files"])
+
+    def test_stamps(self, tmp_path: Path) -> None:
+        od = OreSatConfig(Mission.ORESAT0).od_db["c3"]
+        (path,), regenerated = gen_dcf.write_dcf(od, tmp_path)
+        assert regenerated
+        mtime = path.stat().st_mtime_ns
+
+        _, regenerated = gen_dcf.write_dcf(od, tmp_path)
+        assert not regenerated
+        assert path.stat().st_mtime_ns == mtime
+
+        # Any change to the OD regenerates
+        heartbeat = od[0x1017]
+        assert isinstance(heartbeat, ODVariable)
+        heartbeat.default = 1234
+        _, regenerated = gen_dcf.write_dcf(od, tmp_path)
+        assert regenerated
+        assert "1234" in path.read_text()
+
+        _, regenerated = gen_dcf.write_dcf(od, tmp_path, force=True)
+        assert regenerated
+
+        # The EDS is written from a fixed up copy, leaving the OD as is
+        fingerprint = _stamps.od_fingerprint(od)
+        gen_eds.write_eds(od, tmp_path)
+        assert _stamps.od_fingerprint(od) == fingerprint
+
+    @pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+    def test_beacon_decode(self, output_format: str, tmp_path: Path) -> None:
+        codec = OreSatConfig(Mission.ORESAT1).beacon_codec
+        # 0xC0 and 0xDB in the values exercise KISS escaping
+        frames = [codec.encode({"system_uptime": 0xDBC0 + i}) for i in range(5)]
+        bad_crc = bytearray(frames[1])
+        bad_crc[-1] ^= 1
+        other_header = bytearray(frames[2])
+        other_header[0] ^= 2
+
+        def kiss(frame: bytes) -> bytes:
+            escaped = frame.replace(b"\xdb", b"\xdb\xdd").replace(b"\xc0", b"\xdb\xdc")
+            return b"\xc0\x00" + escaped + b"\xc0"
+
+        capture = tmp_path / "capture.kiss"
+        capture.write_bytes(
+            kiss(frames[0])
+            + b"\xc0\x01\x10\xc0"  # KISS TX delay command, not a frame
+            + kiss(bytes(bad_crc))
+            + kiss(bytes(other_header))
+            + kiss(frames[3][:-1])
+            + kiss(frames[4])
+        )
+        output = tmp_path / f"beacons.{output_format}"
+        args = main.build_parser(["beacon-decode"]).parse_args(
+            ["beacon-decode", "--oresat", "1", str(capture), "-f", output_format, "-o", str(output)]
+        )
+        args.func(args)
+
+        if output_format == "csv":
+            rows = output.read_text().splitlines()
+            assert rows[0].split(",") == list(codec.names)
+            assert len(rows) == 3
+        else:
+            decoded = [json.loads(line) for line in output.read_text().splitlines()]
+            assert decoded == [codec.decode(frames[0]), codec.decode(frames[4])]
+
+    def test_beacon_decode_raw(self) -> None:
+        codec = OreSatConfig(Mission.ORESAT0).beacon_codec
+        frames = [codec.encode({"system_uptime": i}) for i in range(100)]
+        out = io.StringIO()
+        stats = beacon_decode.decode_capture(
+            codec,
+            io.BytesIO(b"".join(frames) + frames[0][:10]),
+            out,
+            framing="raw",
+            output_format="jsonl",
+            batch_size=7,
+        )
+        assert stats == beacon_decode.Stats(frames=101, bad_length=1)
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["system_uptime"] for line in lines] == list(range(100))
+
+    @pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+    def test_candump_decode(self, output_format: str, tmp_path: Path) -> None:
+        config = OreSatConfig(Mission.ORESAT1)
+        layout = next(p for p in config.pdo_table.layouts.values() if p.card == "battery_1")
+        data = bytes(range(layout.size)).hex().upper()
+        log = tmp_path / "candump.log"
+        log.write_text(
+            f"(1700000000.000001) can0 {layout.cob_id:03X}#{data}\n"
+            "(1700000000.000002) can0 080#\n"
+            "(1700000000.000003) can0 701#05\n"
+            "(1700000000.000004) can0 084#3081010000000000\n"
+            "(1700000000.000005) can0 7FF#00\n"  # unknown COB-ID
+            "(1700000000.000006) can0 12345678#00\n"  # extended
+            "(1700000000.000007) can0 701#R\n"  # remote
+            "(1700000000.000008) can0 084#10\n"  # too short
+            "not a frame\n"
+        )
+        output = tmp_path / f"candump.{output_format}"
+        args = main.build_parser(["candump-decode"]).parse_args(
+            ["candump-decode", "--oresat", "1", str(log), "-f", output_format, "-o", str(output)]
+        )
+        args.func(args)
+
+        if output_format == "csv":
+            rows = output.read_text().splitlines()
+            assert rows[0] == "timestamp,interface,cob_id,card,message,signal,value"
+            assert len(rows) == 1 + len(layout.signals) + 1 + 1 + 4
+            assert rows[-4:-3] == ["1700000000.000004,can0,084,battery_1,emcy,error_code,33072"]
+        else:
+            decoded = [json.loads(line) for line in output.read_text().splitlines()]
+            assert [(d["card"], d["message"]) for d in decoded] == [
+                ("battery_1", f"tpdo{layout.num}"),
+                ("", "sync"),
+                ("c3", "heartbeat"),
+                ("battery_1", "emcy"),
+            ]
+            assert decoded[0]["timestamp"] == 1700000000.000001
+            assert decoded[0]["values"] == pytest.approx(layout.decode(bytes(range(layout.size))))
+            assert decoded[2]["values"] == {"state": "operational"}
+            assert decoded[3]["values"]["error"] == "heartbeat_error"
+
+    def test_candump_decode_timestamps(self) -> None:
+        decoder = OreSatConfig.get(Mission.ORESAT1).can_decoder
+        log = (
+            b"(0000012345.123456) can0 701#05\n"  # No RTC, counting from the epoch
+            b"(0000000000.000000) can0 701#05\n"
+            b"(inf) can0 701#05\n"
+            b"(nan) can0 701#05\n"
+            b"(-1.0) can0 701#05\n"
+        )
+        out = io.StringIO()
+        stats = candump_decode.decode_log(decoder, io.BytesIO(log), out, output_format="jsonl")
+        assert stats.bad_lines == 3
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["timestamp"] for line in lines] == [0.0, 12345.123456]
+
+    def test_candump_decode_nan(self) -> None:
+        config = OreSatConfig.get(Mission.ORESAT1)
+        layout, signal = next(
+            (p, s) for p in config.pdo_table.layouts.values() for s in p.signals if s.fmt == "f"
+        )
+        data = bytearray(layout.size)
+        struct.pack_into("<f", data, signal.offset, math.nan)
+        log = f"(1700000000.000001) can0 {layout.cob_id:03X}#{data.hex()}\n".encode()
+        out = io.StringIO()
+        candump_decode.decode_log(config.can_decoder, io.BytesIO(log), out, output_format="jsonl")
+        decoded = json.loads(out.getvalue(), parse_constant=pytest.fail)
+        assert decoded["values"][signal.name] is None
+
+    def test_candump_decode_bad_string(self) -> None:
+        obj = ODVariable("name", 0x4000)
+        obj.data_type = datatypes.VISIBLE_STRING
+        layout = PdoLayout(0x181, "card", 1, (PdoSignal("name", obj, 0, 4, "4s"),))
+        decoder = CanDecoder({}, PdoTable([layout]), sync=False)
+        log = b"(1.0) can0 181#41424344\n(2.0) can0 181#41FF4344\n(3.0) can0 181#4142\n"
+        out = io.StringIO()
+        stats = candump_decode.decode_log(decoder, io.BytesIO(log), out, output_format="jsonl")
+        assert stats == candump_decode.Stats(frames=3, bad_length=1, bad_data=1)
+        assert json.loads(out.getvalue())["values"] == {"name": "ABCD"}
+
+    def test_candump_decode_binary(self) -> None:
+        decoder = OreSatConfig(Mission.ORESAT0).can_decoder
+        frames = [
+            candump_decode.CAN_FRAME.pack(0x701, 1, b"\x7f"),
+            candump_decode.CAN_FRAME.pack(0x4000_0701, 0, b""),  # remote
+            candump_decode.CAN_FRAME.pack(0x7FF, 0, b""),
+        ]
+        out = io.StringIO()
+        stats = candump_decode.decode_log(
+            decoder, io.BytesIO(b"".join(frames) + b"\0"), out, log_format="binary"
+        )
+        assert stats == candump_decode.Stats(frames=4, bad_lines=1, other=1, unknown=1)
+        assert out.getvalue().splitlines()[1] == ",,701,c3,heartbeat,state,pre_operational"
+
+    @pytest.mark.parametrize("log_format", ["ascii", "binary"])
+    def test_candump_decode_parallel(self, log_format: str, tmp_path: Path) -> None:
+        config = OreSatConfig.get(Mission.ORESAT1)
+        layouts = list(config.pdo_table.layouts.values())
+        log = tmp_path / "candump.log"
+        if log_format == "ascii":
+            lines = [
+                f"(1700000000.{i:06d}) can0 {p.cob_id:03X}#{bytes([i % 256] * p.size).hex()}\n"
+                for i, p in enumerate(layouts * 5)
+            ]
+            # Out of order within what will be a chunk, and across the first two chunks
+            lines[1], lines[2] = lines[2], lines[1]
+            lines[5], lines[15] = lines[15], lines[5]
+            log.write_text("".join(lines))
+        else:
+            log.write_bytes(
+                b"".join(
+                    candump_decode.CAN_FRAME.pack(p.cob_id, p.size, bytes([i % 256] * p.size))
+                    for i, p in enumerate(layouts * 5)
+                )
+            )
+
+        ranges = candump_decode.chunk_ranges(log, 500, log_format)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == log.stat().st_size
+        assert all(a[1] == b[0] for a, b in pairwise(ranges))
+        data = log.read_bytes()
+        if log_format == "ascii":
+            assert all(data[end - 1 : end] == b"\n" for _, end in ranges)
+            first_end = ranges[0][1]
+            assert len("".join(lines[:5])) < first_end < len("".join(lines[:15]))
+
+        sequential = io.StringIO()
+        with log.open("rb") as f:
+            expected = candump_decode.decode_log(
+                config.can_decoder,
+                f,
+                sequential,
+                log_format=log_format,
+                output_format="jsonl",
+                chunk_size=500,
+            )
+        parallel = io.StringIO()
+        stats = candump_decode.decode_log_parallel(
+            Mission.ORESAT1,
+            log,
+            parallel,
+            log_format=log_format,
+            output_format="jsonl",
+            jobs=2,
+            chunk_size=500,
+        )
+        assert stats == expected
+        assert stats.decoded == len(layouts) * 5
+        assert parallel.getvalue() == sequential.getvalue()
+        if log_format == "ascii":
+            decoded = [json.loads(line) for line in parallel.getvalue().splitlines()]
+            timestamps = [d["timestamp"] for d in decoded]
+            assert timestamps == sorted(timestamps)
@@ -0,0 +1,118 @@
+import numpy as np
+from canopen.objectdictionary import ODVariable, datatypes
+
+from oresat_configs import OreSatConfig
+from oresat_configs.beacon_array import decode_frames
+from oresat_configs.telemetry import Converter, EnumLookup, LimitChecker
+
+
+def variable(data_type: int, **attrs: object) -> ODVariable:
+    var = ODVariable("var", 0x4000)
+    var.data_type = data_type
+    for name, value in attrs.items():
+        setattr(var, name, value)
+    return var
+
+
+class TestTelemetry:
+    def test_beacon(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        converter = Converter.for_beacon(codec)
+        values = [{"status": 67, "system_uptime": i} for i in range(20)]
+        frames, _ = decode_frames(codec, b"".join(codec.encode(v) for v in values))
+        converted = converter.convert(frames)
+
+        assert (converted["satellite_id"] == config.mission.name.lower()).all()
+        assert (converted["status"] == "deploy").all()
+        assert converted["system_uptime"].tolist() == list(range(20))
+        assert converter.units["system_uptime"] == "s"
+
+        # Matches canopen's per value conversions
+        for field in codec.fields:
+            obj = field.obj
+            raw = frames[field.name][0].item()
+            if obj.value_descriptions:
+                assert converted[field.name][0] == obj.value_descriptions.get(raw, "")
+            for bit, bits in obj.bit_definitions.items():
+                expected = obj.decode_bits(raw, bits)
+                assert converted[f"{field.name}_{bit}"][0] == expected
+
+    def test_conversions(self) -> None:
+        columns = {
+            "scaled": variable(datatypes.INTEGER16, factor=0.01, unit="C"),
+            "float": variable(datatypes.REAL32, factor=0.01),
+            "bits": variable(
+                datatypes.UNSIGNED16,
+                bit_definitions={"flag": [3], "field": [4, 5, 6], "split": [0, 8]},
+            ),
+        }
+        converter = Converter(columns)
+        raw: dict[str, np.ndarray] = {
+            "scaled": np.array([-100, 0, 2500], np.int16),
+            "float": np.array([1.5, 2.5, 3.5], np.float32),
+            "bits": np.array([0b1_0000_1000, 0b0111_0001, 0xFFFF], np.uint16),
+        }
+        out = converter.convert(raw)
+        np.testing.assert_allclose(out["scaled"], [-1, 0, 25])
+        assert out["float"].tolist() == [1.5, 2.5, 3.5]
+        assert out["bits"] is raw["bits"]
+        assert out["bits_flag"].tolist() == [True, False, True]
+        assert out["bits_field"].tolist() == [0, 7, 7]
+        assert out["bits_split"].tolist() == [2, 1, 3]
+        assert converter.units == {
+            "scaled": "C",
+            "float": "",
+            "bits": "",
+            "bits_flag": "",
+            "bits_field": "",
+            "bits_split": "",
+        }
+
+        assert list(converter.convert(raw, ["float"])) == ["float"]
+
+    def test_enum_lookup(self) -> None:
+        lookup = EnumLookup.from_descriptions({5: "five", 1: "one", 300: "big"})
+        raw = np.array([1, 2, 5, 300, 301, 0])
+        assert lookup.lookup(raw).tolist() == ["one", "", "five", "big", "", ""]
+        assert lookup.lookup(raw, "?").tolist()[1] == "?"
+        assert EnumLookup.from_descriptions({}).lookup(raw).tolist() == [""] * 6
+
+    def test_limits(self, config: OreSatConfig) -> None:
+        codec = config.beacon_codec
+        checker = LimitChecker.for_beacon(codec)
+        assert checker.limits["status"] == (66, 70)
+        # Limits that are the whole range of the type can't be exceeded so aren't checked
+        assert "system_uptime" not in checker.limits
+
+        values = [{}, {"status": 65}, {"status": 71, "system_storage_percent": 101}, {}]
+        frames, _ = decode_frames(codec, b"".join(codec.encode(v) for v in values))
+        report = checker.check(frames)
+
+        assert report.names == tuple(checker.limits)
+        assert report.flags.tolist() == [False, True, True, False]
+        assert report.counts.tolist() == [0, 1, 2, 0]
+        masks = report.masks()
+        assert masks["status"].tolist() == [False, True, True, False]
+        assert masks["system_storage_percent"].tolist() == [False, False, True, False]
+        status = report.names.index("status")
+        assert report.below[:, status].tolist() == [False, True, False, False]
+        assert report.above[:, status].tolist() == [False, False, True, False]
+
+        # A beacon without limited fields still gets a row per frame
+        unlimited = LimitChecker(
+            {f.name: f.obj for f in codec.fields if f.name not in report.names}
+        )
+        assert unlimited.limits == {}
+        none = unlimited.check(frames)
+        assert none.below.shape == (4, 0)
+        assert none.flags.tolist() == [False] * 4
+        assert none.counts.tolist() == [0] * 4
+
+    def test_limits_float(self) -> None:
+        checker = LimitChecker({"f": variable(datatypes.REAL32, min=-1.5, max=2.5)})
+        report = checker.check({"f": np.array([-2, -1.5, 0, 2.5, 3, np.nan], np.float32)})
+        assert report.flags.tolist() == [True, False, False, False, True, True]
+        assert report.nan[:, 0].tolist() == [False] * 5 + [True]
+
+        empty = LimitChecker({}).check({})
+        assert empty.flags.shape == (0,)